@@ -1,28 +1,29 @@
-/********************************************************************************
-* Copyright (c) 2024 Contributors to the Eclipse Foundation
-* Copyright (c) 2024 German Aerospace Center (DLR e.V.)
-*
-* See the NOTICE file(s) distributed with this work for additional
-* information regarding copyright ownership.
-*
-* This program and the accompanying materials are made available under the
-* terms of the Apache License, Version 2.0 which is available at
-* https://www.apache.org/licenses/LICENSE-2.0.
-*
-* Unless required by applicable law or agreed to in writing, software
-* distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
-* WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
-* License for the specific language governing permissions and limitations
-* under the License.
-*
-* SPDX-License-Identifier: Apache-2.0
-********************************************************************************/
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
 
 
 from .modules import(
     block,
     blockheader,
     chain,
+    chainview,
     genesisblock,
     transaction
 )
@@ -30,53 +31,94 @@ from .modules import(
 from .modules.block import Block
 from .modules.blockheader import BlockHeader
 from .modules.chain import Chain
+from .modules.chainview import ChainView
 from .modules.genesisblock import GenesisBlock
 from .modules.transaction import Transaction
 
 
 from .persistence import(
-    persistence
+    persistence,
+    blockstore,
+    persistencewriter,
+    transactionindex,
+    storedblocks,
+    snapshot
 )
 
 from .persistence.persistence import *
+from .persistence.blockstore import *
+from .persistence.persistencewriter import *
+from .persistence.transactionindex import *
+from .persistence.storedblocks import StoredBlocks
+from .persistence.snapshot import Snapshot, SnapshotManager
 
 
 from .utils import(
     sha3helper,
     complexencoder,
-    transactioncomparatorbyfee
+    transactioncomparatorbyfee,
+    miningkernel,
+    binarycodec,
+    merkletree,
+    merkleproof,
+    lrucache,
+    compacttarget
 )
 
 from .utils.sha3helper import *
 from .utils.complexencoder import *
 from .utils.transactioncomparatorbyfee import *
+from .utils.miningkernel import *
+from .utils.binarycodec import BinaryWriter, BinaryReader
+from .utils.merkletree import MerkleTree
+from .utils.merkleproof import MerkleProof
+from .utils.lrucache import LRUCache
+from .utils.compacttarget import CompactTarget
 
 
 from .logic import(
     blockchain,
     dependencymanager,
-    pendingtransactions
+    pendingtransactions,
+    mempool,
+    chainvalidator,
+    difficultyadjuster,
+    chainregistry
 )
 
 from .logic.blockchain import *
 from .logic.pendingtransactions import *
+from .logic.mempool import *
+from .logic.chainvalidator import ChainValidator, ChainValidationError
+from .logic.difficultyadjuster import DifficultyAdjuster
 from .logic.dependencymanager import *
+from .logic.chainregistry import ChainContext, ChainRegistry
 
 
 from .logger import(
-    processlogger
+    processlogger,
+    metrics,
+    metricsserver
 )
 
 from .logger.processlogger import *
+from .logger.metrics import Counter, Gauge, Histogram, MetricsRegistry
+from .logger.metricsserver import MetricsServer
 
 
 from .threads import(
     miner,
-    minerlistener
+    minerlistener,
+    miningpool,
+    miningpolicy,
+    miningscheduler
 )
 
 from .threads.miner import Miner
 from .threads.minerlistener import MinerListener
+from .threads.miningpool import MiningPool
+from .threads.miningpolicy import MiningPolicy
+from .threads.miningscheduler import MiningScheduler
 
 
 from .provchainmodules import(
@@ -85,7 +127,8 @@ from .provchainmodules import(
     blockchainlistener,
     eventmanager,
     filehandler,
-    user
+    user,
+    ingestionpipeline
 )
 
 from .provchainmodules.provcollector import *
@@ -94,3 +137,15 @@ from .provchainmodules.blockchainlistener import *
 from .provchainmodules.eventmanager import *
 from .provchainmodules.filehandler import *
 from .provchainmodules.user import *
+from .provchainmodules.ingestionpipeline import IngestionPipeline
+
+
+from .network import(
+    message,
+    peer,
+    networknode
+)
+
+from .network.message import Message
+from .network.peer import Peer
+from .network.networknode import NetworkNode
@@ -0,0 +1,250 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+
+import bisect
+import threading
+import weakref
+
+
+class Counter:
+    """
+    A value that only increases, e.g. the number of hashes computed.
+    """
+    TYPE = "counter"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.__value = 0
+        self.__lock = threading.Lock()
+
+    def inc(self, amount=1) -> None:
+        if amount < 0:
+            raise ValueError("A counter can only be increased!")
+        with self.__lock:
+            self.__value += amount
+
+    def get_value(self):
+        return self.__value
+
+    def get_samples(self) -> list:
+        return [(self.name, None, self.__value)]
+
+
+class Gauge:
+    """
+    A value that goes up and down, e.g. the mempool depth. With a function the value is
+    read from it whenever the gauge is collected.
+    """
+    TYPE = "gauge"
+
+    def __init__(self, name: str, help_text: str, function=None) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.function = function
+        self.__value = 0
+
+    def set(self, value) -> None:
+        self.__value = value
+
+    def get_value(self):
+        return self.function() if self.function is not None else self.__value
+
+    def get_samples(self) -> list:
+        return [(self.name, None, self.get_value())]
+
+
+class Histogram:
+    """
+    The distribution of observed values in cumulative buckets, together with their sum
+    and count, e.g. the latency of adding a block.
+
+    Attributes:
+        buckets (tuple): The sorted upper bounds of the buckets, +Inf is implicit.
+    """
+    TYPE = "histogram"
+    BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+    def __init__(self, name: str, help_text: str, buckets: tuple = BUCKETS) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.__lock = threading.Lock()
+        self.reset()
+
+    def observe(self, value) -> None:
+        with self.__lock:
+            self.__counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.__sum += value
+            self.__count += 1
+
+    def reset(self) -> None:
+        """
+        Drop all observations, for histograms that are rebuilt on every collection.
+        """
+        with self.__lock:
+            self.__counts = [0] * (len(self.buckets) + 1)
+            self.__sum = 0
+            self.__count = 0
+
+    def get_value(self) -> dict:
+        """
+        Get count, sum and the cumulative bucket counts keyed by their upper bound.
+        """
+        with self.__lock:
+            cumulative, total = dict(), 0
+            for bound, count in zip(self.buckets + (float("inf"),), self.__counts):
+                total += count
+                cumulative[bound] = total
+            return dict(count=self.__count, sum=self.__sum, buckets=cumulative)
+
+    def get_samples(self) -> list:
+        value = self.get_value()
+        samples = [(f"{self.name}_bucket", ("le", _format_number(bound)), count) for bound, count in value["buckets"].items()]
+        samples.append((f"{self.name}_sum", None, value["sum"]))
+        samples.append((f"{self.name}_count", None, value["count"]))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    MetricsRegistry holds the metrics of a node. Metrics are created on first request and
+    shared afterwards, so every component asks the registry for its metrics by name. The
+    values can be read in-process with get_values() or exported in the Prometheus text
+    format. Collectors are called before each collection to refresh derived metrics; they
+    are held weakly, so they do not keep their owners alive.
+
+    Components of different chains in one process use their own registries, labeled e.g.
+    with the network_id, so their values do not overwrite each other. Several registries
+    are exported together with export_prometheus().
+
+    Attributes:
+        labels (dict): Constant labels added to every exported sample.
+    """
+    __default = None
+
+    def __init__(self, labels: dict = None) -> None:
+        self.labels = dict(labels) if labels is not None else dict()
+        self.__metrics = dict()
+        self.__collectors = list()
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def get_default() -> "MetricsRegistry":
+        """
+        Get the registry shared by all components of the process.
+        """
+        if MetricsRegistry.__default is None:
+            MetricsRegistry.__default = MetricsRegistry()
+        return MetricsRegistry.__default
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self.__get_or_create(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str, function=None) -> Gauge:
+        gauge = self.__get_or_create(Gauge, name, help_text)
+        if function is not None:
+            gauge.function = function
+        return gauge
+
+    def histogram(self, name: str, help_text: str, buckets: tuple = Histogram.BUCKETS) -> Histogram:
+        return self.__get_or_create(Histogram, name, help_text, buckets)
+
+    def get(self, name: str):
+        return self.__metrics.get(name)
+
+    def register_collector(self, collector) -> None:
+        """
+        Register a bound method that refreshes metrics before each collection.
+        """
+        with self.__lock:
+            self.__collectors.append(weakref.WeakMethod(collector))
+
+    def collect(self) -> list:
+        """
+        Run the collectors and get all metrics.
+        """
+        with self.__lock:
+            self.__collectors = [reference for reference in self.__collectors if reference() is not None]
+            collectors = [reference() for reference in self.__collectors]
+
+        for collector in collectors:
+            if collector is not None:
+                collector()
+
+        with self.__lock:
+            return list(self.__metrics.values())
+
+    def get_values(self) -> dict:
+        """
+        Get the current values of all metrics keyed by their names.
+        """
+        return {metric.name: metric.get_value() for metric in self.collect()}
+
+    def to_prometheus(self) -> str:
+        """
+        Export all metrics in the Prometheus text exposition format.
+        """
+        return MetricsRegistry.export_prometheus([self])
+
+    @staticmethod
+    def export_prometheus(registries) -> str:
+        """
+        Export the metrics of several registries in the Prometheus text exposition format.
+        Metrics with the same name are written as one family, their samples are told apart
+        by the constant labels of their registries.
+        """
+        families = dict()
+        for registry in registries:
+            for metric in registry.collect():
+                families.setdefault(metric.name, list()).append((registry.labels, metric))
+
+        lines = list()
+        for name, metrics in families.items():
+            lines.append(f"# HELP {name} {metrics[0][1].help_text}")
+            lines.append(f"# TYPE {name} {metrics[0][1].TYPE}")
+            for constant_labels, metric in metrics:
+                for sample_name, label, value in metric.get_samples():
+                    labels = [f'{key}="{label_value}"' for key, label_value in constant_labels.items()]
+                    if label is not None:
+                        labels.append(f'{label[0]}="{label[1]}"')
+                    labels = f"{{{','.join(labels)}}}" if labels else ""
+                    lines.append(f"{sample_name}{labels} {_format_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def __get_or_create(self, metric_type, name: str, help_text: str, *args):
+        with self.__lock:
+            metric = self.__metrics.get(name)
+            if metric is None:
+                metric = metric_type(name, help_text, *args)
+                self.__metrics[name] = metric
+            elif not isinstance(metric, metric_type):
+                raise ValueError(f"The metric {name} is already registered as {metric.TYPE}!")
+            return metric
+
+
+def _format_number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return str(value)
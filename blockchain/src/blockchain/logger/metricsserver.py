@@ -0,0 +1,82 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from blockchain.logger.metrics import MetricsRegistry
+
+
+class MetricsServer:
+    """
+    MetricsServer serves the metrics of a registry in the Prometheus text format at
+    /metrics from a background thread. By default it only listens on localhost.
+
+    Attributes:
+        registry (MetricsRegistry): The exported registry, or any object with a to_prometheus()
+            method, e.g. a ChainRegistry exporting the metrics of all its chains.
+        server_address (tuple): Host and port the server listens on, port 0 picks a free port.
+    """
+    HOST = "127.0.0.1"
+    PORT = 9464
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, registry: MetricsRegistry = None, host: str = HOST, port: int = PORT) -> None:
+        self.registry = registry if registry is not None else MetricsRegistry.get_default()
+        self.__server = ThreadingHTTPServer((host, port), self.__create_handler())
+        self.__server.daemon_threads = True
+        self.__thread = None
+
+    @property
+    def server_address(self) -> tuple:
+        return self.__server.server_address
+
+    def start(self) -> None:
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        self.__server.shutdown()
+        self.__server.server_close()
+        if self.__thread is not None:
+            self.__thread.join()
+
+    def __create_handler(self):
+        registry = self.registry
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+
+                body = registry.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", MetricsServer.CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass    #* scrapes are not logged
+
+        return MetricsRequestHandler
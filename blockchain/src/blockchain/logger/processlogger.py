@@ -1,25 +1,30 @@
-/********************************************************************************
-* Copyright (c) 2024 Contributors to the Eclipse Foundation
-* Copyright (c) 2024 German Aerospace Center (DLR e.V.)
-*
-* See the NOTICE file(s) distributed with this work for additional
-* information regarding copyright ownership.
-*
-* This program and the accompanying materials are made available under the
-* terms of the Apache License, Version 2.0 which is available at
-* https://www.apache.org/licenses/LICENSE-2.0.
-*
-* Unless required by applicable law or agreed to in writing, software
-* distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
-* WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
-* License for the specific language governing permissions and limitations
-* under the License.
-*
-* SPDX-License-Identifier: Apache-2.0
-********************************************************************************/
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
 
 
+import atexit
+import itertools
 import logging
+import logging.handlers
+import queue
+import threading
 
 
 class ProcessLogger:
@@ -27,31 +32,121 @@ class ProcessLogger:
     ProcessLogger is a custom logging utility class designed to facilitate structured
     and standardized logging for various processes within an application.
 
+    All process loggers share one handler on their common parent logger, which is attached
+    only once, no matter how many ProcessLogger objects are created. Messages can be passed
+    with %-style arguments, they are only formatted if the record is emitted. In async mode
+    the records are put into a queue and written by a listener thread, so the mining and
+    ingestion threads do not wait for the stream. Frequent per-transaction events can be
+    sampled with log_sampled().
+
     Attributes:
         name (str): The name of the logger, typically indicating the context or
                     component using this logger.
         logger (logging.Logger): The underlying logger instance from the logging module.
-        stream_handler (logging.StreamHandler): The handler responsible for outputting
-                                                log messages to the console or stream.
-        formatter (logging.Formatter): The formatter that defines the log message format.
+        sample_every (int): Only every n-th call of log_sampled() is logged.
     """
-    
-    def __init__(self, name) -> None:
+    PARENT_NAME = "ProcessLogger"
+    FORMAT = '%(asctime)s:%(levelname)s:%(name)s:%(message)s'
+
+    __lock = threading.Lock()
+    __stream_handler = None
+    __queue_handler = None
+    __queue_listener = None
+
+    def __init__(self, name, sample_every: int = 1) -> None:
         self.name = name
-        self.logger = logging.getLogger(f"ProcessLogger.{self.name}")
-        self.stream_handler = logging.StreamHandler() 
-        self.formatter = logging.Formatter('%(asctime)s:%(levelname)s:%(name)s:%(message)s')
-        
-        self.logger.setLevel(logging.DEBUG)
-        
-        # set adjustment for process info handler
-        #self.stream_handler.setLevel(logging.INFO)
-        self.stream_handler.setFormatter(self.formatter)
-        self.logger.addHandler(self.stream_handler)
-        
-    def  log_info(self, message):
-        self.logger.info(f"{message}")
+        self.logger = logging.getLogger(f"{ProcessLogger.PARENT_NAME}.{self.name}")
+        self.sample_every = sample_every
+        self.__sample_counter = itertools.count()
+
+        ProcessLogger.__configure()
+
+    @staticmethod
+    def __configure() -> None:
+        """
+        Attach the shared stream handler to the parent logger, only on first use.
+        """
+        with ProcessLogger.__lock:
+            if ProcessLogger.__stream_handler is not None:
+                return
+
+            stream_handler = logging.StreamHandler()
+            stream_handler.setFormatter(logging.Formatter(ProcessLogger.FORMAT))
+
+            parent = logging.getLogger(ProcessLogger.PARENT_NAME)
+            parent.setLevel(logging.DEBUG)
+            parent.addHandler(stream_handler)
+            ProcessLogger.__stream_handler = stream_handler
+
+    @staticmethod
+    def set_level(level) -> None:
+        """
+        Set the level of all process loggers, e.g. logging.INFO to drop debug records early.
+        """
+        logging.getLogger(ProcessLogger.PARENT_NAME).setLevel(level)
+
+    @staticmethod
+    def enable_async_logging(max_queue_size: int = -1) -> None:
+        """
+        Write the records of all process loggers from a listener thread. The logging
+        threads only put the records into a queue.
+        """
+        ProcessLogger.__configure()
+
+        with ProcessLogger.__lock:
+            if ProcessLogger.__queue_listener is not None:
+                return
+
+            record_queue = queue.Queue(max_queue_size)
+            queue_handler = logging.handlers.QueueHandler(record_queue)
+            queue_listener = logging.handlers.QueueListener(record_queue, ProcessLogger.__stream_handler,
+                                                            respect_handler_level=True)
+
+            parent = logging.getLogger(ProcessLogger.PARENT_NAME)
+            parent.addHandler(queue_handler)
+            parent.removeHandler(ProcessLogger.__stream_handler)
+            queue_listener.start()
+
+            ProcessLogger.__queue_handler = queue_handler
+            ProcessLogger.__queue_listener = queue_listener
+
+        atexit.register(ProcessLogger.disable_async_logging)
+
+    @staticmethod
+    def disable_async_logging() -> None:
+        """
+        Write the queued records and return to writing records on the logging threads.
+        """
+        with ProcessLogger.__lock:
+            if ProcessLogger.__queue_listener is None:
+                return
+
+            parent = logging.getLogger(ProcessLogger.PARENT_NAME)
+            parent.addHandler(ProcessLogger.__stream_handler)
+            parent.removeHandler(ProcessLogger.__queue_handler)
+            ProcessLogger.__queue_listener.stop()
+
+            ProcessLogger.__queue_handler = None
+            ProcessLogger.__queue_listener = None
+
+    def is_debug_enabled(self) -> bool:
+        """
+        Check if debug records are emitted, to skip building expensive debug arguments.
+        """
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+    def  log_info(self, message, *args):
+        self.logger.info(message, *args)
     
-    def log_debug(self, message):
-        self.logger.debug(f"{message}")
-        
\ No newline at end of file
+    def log_debug(self, message, *args):
+        self.logger.debug(message, *args)
+
+    def log_error(self, message, *args, exc_info=None):
+        self.logger.error(message, *args, exc_info=exc_info)
+
+    def log_sampled(self, message, *args, level: int = logging.INFO):
+        """
+        Log only every sample_every-th call, for events that occur per transaction.
+        """
+        if next(self.__sample_counter) % self.sample_every == 0:
+            self.logger.log(level, message, *args)
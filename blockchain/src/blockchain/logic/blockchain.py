@@ -1,29 +1,36 @@
-/********************************************************************************
-* Copyright (c) 2024 Contributors to the Eclipse Foundation
-* Copyright (c) 2024 German Aerospace Center (DLR e.V.)
-*
-* See the NOTICE file(s) distributed with this work for additional
-* information regarding copyright ownership.
-*
-* This program and the accompanying materials are made available under the
-* terms of the Apache License, Version 2.0 which is available at
-* https://www.apache.org/licenses/LICENSE-2.0.
-*
-* Unless required by applicable law or agreed to in writing, software
-* distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
-* WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
-* License for the specific language governing permissions and limitations
-* under the License.
-*
-* SPDX-License-Identifier: Apache-2.0
-********************************************************************************/
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
 
 
+import time
 import threading
 
 from blockchain.modules.chain import Chain
 from blockchain.modules.block import Block
-from blockchain.utils.sha3helper import SHA3Helper
+from blockchain.modules.blockheader import BlockHeader
+from blockchain.modules.transaction import Transaction
+from blockchain.logic.difficultyadjuster import DifficultyAdjuster
+from blockchain.persistence.transactionindex import TransactionIndex
+from blockchain.utils.lrucache import LRUCache
+from blockchain.utils.compacttarget import CompactTarget
+from blockchain.logger.metrics import MetricsRegistry
 
 
 class Blockchain:
@@ -32,49 +39,280 @@ class Blockchain:
     and ensuring that the blocks fulfill a specified difficulty requirement.
 
     Attributes:
-        NETWORK_ID (int): An identifier for the network this blockchain belongs to.
+        NETWORK_ID (int): The identifier of the default network.
+        network_id (int): The identifier of the network this blockchain belongs to.
         __chain (Chain): The underlying chain of blocks.
-        __difficulty (int): The difficulty level that blocks need to fulfill.
-        __block_cache (dict): A cache storing blocks with their hashes as keys.
-        __transaction_cache (dict): A cache storing transactions with their IDs as keys.
+        __difficulty (int): The difficulty level that blocks need to fulfill without difficulty adjuster.
+        __difficulty_adjuster (DifficultyAdjuster): Optional, retargets the difficulty of every
+            block towards a configured block interval.
+        __block_cache (LRUCache): A bounded cache storing blocks with their hashes as keys.
+        __transaction_cache (LRUCache): A bounded cache storing transactions with their IDs as keys.
+        __transaction_index (TransactionIndex): Optional on-disk index of the blocks and
+            transactions, used for lookups that miss the caches. It catches up with the chain
+            when the chain is attached, or on first use if the chain was not passed in.
+        __transaction_count (int): Number of transactions on the chain, None if it has to be counted.
+        __block_heights (dict): Heights of the blocks by their hashes, used for block lookups
+            without transaction index. Built on the first lookup that misses the cache.
+        __listeners (list): Notified of every block added to the chain, whether it was mined
+            locally or received from a peer.
     """
     NETWORK_ID = int(1)
+    DIFFICULTY = 57896000000000000000000000000000000000000000000000000000000000000000000
+    BLOCK_CACHE_SIZE = 1024
+    TRANSACTION_CACHE_SIZE = 64 * 1024
 
-    def __init__(self) -> None:
-        self.__chain = Chain(self.NETWORK_ID)
+    def __init__(self, transaction_index: TransactionIndex = None, block_cache_size: int = BLOCK_CACHE_SIZE,
+                 transaction_cache_size: int = TRANSACTION_CACHE_SIZE, difficulty_adjuster: DifficultyAdjuster = None,
+                 network_id: int = NETWORK_ID, chain: Chain = None, metrics: MetricsRegistry = None) -> None:
+        self.__chain = chain if chain is not None else Chain(network_id)
+        self.__lock = threading.RLock()
+        self.__transaction_count = 0 if chain is None else None
+        self.__block_heights = None
+        self.__listeners = list()
+        self.__transaction_index = transaction_index
+        #* a fresh chain holds only the genesis block, catching up with it would drop the index
+        self.__index_caught_up = False
+        if transaction_index is not None and chain is not None:
+            self.__catch_up_index()
         #self.__difficulty = int(16000)
-        self.__difficulty = 57896000000000000000000000000000000000000000000000000000000000000000000
-        self.__block_cache = dict()
-        self.__transaction_cache = dict()
-        #TODO: Check how exactly to regulate the difficulty!
+        self.__difficulty = Blockchain.DIFFICULTY
+        self.__difficulty_adjuster = difficulty_adjuster
+        #* misses fall back to the transaction index, or to a scan of the chain without index
+        self.__block_cache = LRUCache(block_cache_size, self.__load_block)
+        self.__transaction_cache = LRUCache(transaction_cache_size, self.__load_transaction)
+
+        metrics = metrics if metrics is not None else MetricsRegistry.get_default()
+        self.__add_block_histogram = metrics.histogram("blockchain_add_block_seconds", "Latency of adding a block to the chain.")
+        self.__height_gauge = metrics.gauge("blockchain_height", "Height of the latest block.")
         
     def __len__(self):
-        return len(self.__chain.chain)
+        return self.__chain.get_size()
     
-    def __getitem__(self, index: int):
+    def __getitem__(self, index):
         #TODO: Optimize to get for example JSON of the block metadata instead of an object
         block = self.__chain.chain[index]
         
         return block
 
-    def add_block(self, block: Block):
+    def __iter__(self):
+        return iter(self.__chain.chain)
+
+    def iter_blocks(self, start: int = 0, stop: int = None):
+        """
+        Iterate lazily over the blocks from height start up to, but not including, stop.
+        """
+        return self.__chain.iter_blocks(start, stop)
+
+    def add_block(self, block: Block) -> bool:
+        """
+        Adds a block on top of the latest block and updates the block and transaction caches.
+        Returns False without adding the block if its previous hash is not the hash of the
+        latest block, e.g. because another block extended the chain in the meantime.
+        """
+        start = time.perf_counter()
+
+        with self.__lock:
+            if bytes(block.block_header.previous_hash) != self.get_previous_hash():
+                return False
+
+            transaction_index = self.__get_transaction_index()
+            self.__chain.add(block)
+            height = self.__chain.get_size() - 1
+            self.register_block(height, block)
+
+            if transaction_index is not None:
+                transaction_index.add_block(height, block)
+
+        self.__add_block_histogram.observe(time.perf_counter() - start)
+        self.__height_gauge.set(height)
+
+        for listener in self.__listeners:
+            listener.notify_new_block(block)
+        return True
+
+    def register_listener(self, listener) -> None:
+        """
+        Register a MinerListener that is notified of every block added to the chain.
+        """
+        self.__listeners.append(listener)
+
+    def register_block(self, height: int, block: Block) -> None:
+        """
+        Update the caches and counters for a block that is already on the chain, e.g. a
+        block that is replayed after loading a snapshot.
+        """
+        with self.__lock:
+            block_hash = block.get_block_hash()
+            self.__block_cache.put(block_hash, block)
+            if self.__block_heights is not None:
+                self.__block_heights[block_hash] = height
+
+            for transaction in block.transactions:
+                self.__transaction_cache.put(transaction.tx_id, transaction)
+
+            if self.__transaction_count is not None:
+                self.__transaction_count += len(block.transactions)
+
+    def get_state(self) -> tuple:
+        """
+        Get a consistent tuple (height, tip block, transaction count) of the chain.
+        """
+        with self.__lock:
+            return self.__chain.get_size() - 1, self.__chain.get_last_block(), self.get_transaction_count()
+
+    def get_transaction_count(self) -> int:
+        """
+        Get the number of transactions on the chain.
+        """
+        with self.__lock:
+            if self.__transaction_count is None:
+                self.__transaction_count = sum(len(block.transactions) for block in self.__chain.chain)
+            return self.__transaction_count
+
+    def get_warm_sets(self) -> tuple:
+        """
+        Get the keys of the block and transaction caches, least recently used first.
+        """
+        return self.__block_cache.keys(), self.__transaction_cache.keys()
+
+    def warm_caches(self, block_hashes, tx_ids) -> None:
         """
-        Adds a block to the chain and updates the block and transaction caches.
+        Load the given blocks and transactions into the caches.
         """
-        self.__chain.add(block)
-        self.__block_cache.update({SHA3Helper.digest_to_hex(block.get_block_hash()): block})
+        for block_hash in block_hashes:
+            self.__block_cache.get(block_hash)
+        for tx_id in tx_ids:
+            self.__transaction_cache.get(tx_id)
 
-        for transaction in block.transactions:
-            self.__transaction_cache.update({transaction[1].get_tx_id_as_string(): transaction[1]})
+    def get_block(self, block_hash: bytes) -> Block:
+        """
+        Get a block of the chain by its hash. Returns None if the block is unknown.
+        """
+        return self.__block_cache.get(bytes(block_hash))
+
+    def get_transaction(self, tx_id: bytes) -> Transaction:
+        """
+        Get a transaction of the chain by its tx_id. Returns None if the transaction is unknown.
+        """
+        return self.__transaction_cache.get(bytes(tx_id))
 
-    def fulfills_difficulty(self, digest: bytes) -> bool:
+    def get_transactions_by_prov_hash(self, prov_hash: str) -> list:
         """
-        Checks if a given digest fulfills the current difficulty requirement.
+        Get all transactions of the chain that carry the given prov_hash. Needs a transaction index.
+        """
+        transaction_index = self.__get_transaction_index()
+        if transaction_index is None:
+            raise AttributeError("Lookups by prov_hash need a transaction index!")
+
+        return [self.get_transaction(tx_id) for tx_id in transaction_index.get_tx_ids_by_prov_hash(prov_hash)]
+
+    def get_inclusion_proof(self, tx_id: bytes):
+        """
+        Get the merkle proof for a transaction of the chain, together with the header
+        of its block. Returns None if the transaction is unknown.
+        """
+        transaction_index = self.__get_transaction_index()
+        if transaction_index is not None:
+            location = transaction_index.get_transaction_location(tx_id)
+            if location is None:
+                return None
+
+            height, position = location
+            block = self.__chain.chain[height]
+            proof = block.get_inclusion_proof(tx_id, position)
+            return (proof, block.block_header) if proof is not None else None
+
+        transaction = self.get_transaction(tx_id)
+        if transaction is None or not isinstance(transaction.block_id, bytes):
+            return None
+
+        block = self.get_block(transaction.block_id)
+        if block is None:
+            return None
+
+        return block.get_inclusion_proof(tx_id), block.block_header
+
+    def get_cache_stats(self) -> dict:
+        """
+        Get the size, hit, miss and eviction counters of the block and transaction caches.
+        """
+        return dict(blocks=self.__block_cache.get_stats(), transactions=self.__transaction_cache.get_stats())
+
+    def __get_transaction_index(self) -> TransactionIndex:
+        if self.__transaction_index is not None and not self.__index_caught_up:
+            self.__catch_up_index()
+        return self.__transaction_index
+
+    def __catch_up_index(self) -> None:
+        with self.__lock:
+            if self.__transaction_index is not None:
+                self.__transaction_index.catch_up(self)
+            self.__index_caught_up = True
+
+    def __load_block(self, block_hash: bytes) -> Block:
+        transaction_index = self.__get_transaction_index()
+        if transaction_index is not None:
+            height = transaction_index.get_block_height(block_hash)
+            return self.__chain.get_block(height) if height is not None else None
+
+        with self.__lock:
+            if self.__block_heights is None:
+                #* one scan of the chain, afterwards register_block() keeps the heights up to date
+                self.__block_heights = {block.get_block_hash(): height
+                                        for height, block in enumerate(self.__chain.iter_blocks())}
+            height = self.__block_heights.get(block_hash)
+            return self.__chain.get_block(height) if height is not None else None
+
+    def __load_transaction(self, tx_id: bytes) -> Transaction:
+        transaction_index = self.__get_transaction_index()
+        if transaction_index is not None:
+            location = transaction_index.get_transaction_location(tx_id)
+            if location is None:
+                return None
+            height, position = location
+            return self.__chain.get_block(height).transactions[position]
+
+        for block in reversed(self.__chain.chain):
+            for transaction in block.transactions:
+                if transaction.tx_id == tx_id:
+                    return transaction
+        return None
+
+    def get_next_bits(self) -> int:
+        """
+        Returns the compact target of the next block. With a difficulty adjuster it is
+        retargeted from the timestamps of the latest blocks, otherwise the fixed difficulty is used.
+        """
+        if self.__difficulty_adjuster is None:
+            return CompactTarget.encode(self.__difficulty)
+
+        return self.__difficulty_adjuster.get_next_bits(self.__get_latest_headers())
+
+    def is_valid_timestamp(self, block_header: BlockHeader) -> bool:
+        """
+        Checks the timestamp of the header of the next block. Only the retargeting depends on
+        the timestamps, without a difficulty adjuster every timestamp is accepted.
+        """
+        if self.__difficulty_adjuster is None:
+            return True
+
+        return self.__difficulty_adjuster.is_valid_timestamp(self.__get_latest_headers(), block_header)
+
+    def __get_latest_headers(self) -> list:
+        with self.__lock:
+            #* the genesis block is not part of the retargeting window
+            start = max(self.__chain.get_size() - self.__difficulty_adjuster.get_history_size(), 1)
+            return [block.block_header for block in self.__chain.iter_blocks(start)]
+
+    def fulfills_difficulty(self, digest: bytes, bits: int = None) -> bool:
+        """
+        Checks if a given digest fulfills the target of the given compact form, by default
+        the target of the next block.
         """
         temp = int.from_bytes(digest, byteorder='big')
         #print(f"blockchain.fullfills_difficulty() Temp: {temp} Difficulty: {self.__difficulty}") # debug line
         
-        return temp <= self.__difficulty
+        return temp <= CompactTarget.decode(bits if bits is not None else self.get_next_bits())
 
     def get_previous_hash(self) -> bytes:
         """
@@ -89,23 +327,67 @@ class Blockchain:
         return self.__chain.get_last_block()
 
 
+    @property
+    def network_id(self) -> int:
+        return self.__chain.network_id
+
     @property
     def chain(self) -> Chain:
         return self.__chain
     
     @chain.setter
     def chain(self, value: Chain):
-        self.__chain = value
-        if value != Chain:
+        if not isinstance(value, Chain):
             raise AttributeError("The chain has to be a chain object!")
+        with self.__lock:
+            self.__chain = value
+            self.__transaction_count = None     #* counted on first use or set from a snapshot
+            self.__block_heights = None
+        self.__block_cache.clear()
+        self.__transaction_cache.clear()
+        self.__catch_up_index()
+
+    @property
+    def transaction_count(self) -> int:
+        return self.get_transaction_count()
+
+    @transaction_count.setter
+    def transaction_count(self, value: int):
+        if not isinstance(value, int):
+            raise AttributeError("The transaction count has to be an integer!")
+        self.__transaction_count = value
+
+    @property
+    def transaction_index(self) -> TransactionIndex:
+        return self.__transaction_index
+
+    @transaction_index.setter
+    def transaction_index(self, value: TransactionIndex):
+        if value is not None and not isinstance(value, TransactionIndex):
+            raise AttributeError("The transaction index has to be a transaction index object!")
+        self.__transaction_index = value
+        self.__catch_up_index()
         
     @property
     def difficulty(self) -> int:
-        return self.__difficulty
+        """
+        The target of the next block.
+        """
+        return CompactTarget.decode(self.get_next_bits())
     
     @difficulty.setter
     def difficulty(self, value: int):
-        self.__difficulty = value
-        if value != int:
+        if not isinstance(value, int):
             raise AttributeError("The difficulty has to be an integer!")
+        self.__difficulty = value
+
+    @property
+    def difficulty_adjuster(self) -> DifficultyAdjuster:
+        return self.__difficulty_adjuster
+
+    @difficulty_adjuster.setter
+    def difficulty_adjuster(self, value: DifficultyAdjuster):
+        if value is not None and not isinstance(value, DifficultyAdjuster):
+            raise AttributeError("The difficulty adjuster has to be a difficulty adjuster object!")
+        self.__difficulty_adjuster = value
         
\ No newline at end of file
@@ -0,0 +1,210 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import threading
+
+from blockchain.logic.blockchain import Blockchain
+from blockchain.logic.difficultyadjuster import DifficultyAdjuster
+from blockchain.logic.pendingtransactions import PendingTransaction
+from blockchain.threads.miner import Miner
+from blockchain.threads.miningpolicy import MiningPolicy
+from blockchain.threads.miningscheduler import MiningScheduler
+from blockchain.logger.processlogger import ProcessLogger
+from blockchain.logger.metrics import MetricsRegistry
+
+
+class ChainContext:
+    """
+    ChainContext holds the components of one chain hosted by a ChainRegistry.
+
+    Attributes:
+        network_id (int): The identifier of the network of the chain.
+        blockchain (Blockchain): The blockchain of the network.
+        pending_transactions (PendingTransaction): The mempool of the network.
+        miner (Miner): The miner of the network, None for a chain that is not mined here.
+        priority (float): Share of the cores the miner gets relative to the other chains.
+        metrics (MetricsRegistry): The registry the components of the chain report to.
+    """
+    def __init__(self, network_id: int, blockchain: Blockchain, pending_transactions: PendingTransaction,
+                 miner: Miner = None, priority: float = 1, metrics: MetricsRegistry = None) -> None:
+        self.network_id = network_id
+        self.blockchain = blockchain
+        self.pending_transactions = pending_transactions
+        self.miner = miner
+        self.priority = priority
+        self.metrics = metrics if metrics is not None else MetricsRegistry.get_default()
+
+
+class ChainRegistry:
+    """
+    ChainRegistry hosts several independent chains in one process, keyed by their network_id.
+    Every chain has its own blockchain, mempool and miner; the components are passed to the
+    miner instead of being looked up at the DependencyManager, which keeps serving the
+    single default chain. The mining scheduler shares the cores among the miners by their
+    priorities and is run again whenever a chain or a priority changes.
+
+    Created chains report to their own metrics registry labeled with their network_id;
+    to_prometheus() exports them together with the default registry, so a MetricsServer
+    for the chain registry serves the metrics of all chains.
+
+    Attributes:
+        scheduler (MiningScheduler): Assigns the nonce search workers to the miners.
+    """
+    def __init__(self, scheduler: MiningScheduler = None) -> None:
+        self.logger = ProcessLogger("ChainRegistry")
+        self.scheduler = scheduler if scheduler is not None else MiningScheduler()
+        self.__chains = dict()
+        self.__lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.__chains)
+
+    def __contains__(self, network_id: int) -> bool:
+        return network_id in self.__chains
+
+    def get_network_ids(self) -> list:
+        with self.__lock:
+            return sorted(self.__chains)
+
+    def create_chain(self, network_id: int, priority: float = 1, difficulty_adjuster: DifficultyAdjuster = None,
+                     policy: MiningPolicy = None) -> ChainContext:
+        """
+        Create and register a new chain with an empty blockchain, mempool and a miner.
+        The miner is not started.
+        """
+        metrics = MetricsRegistry(labels=dict(network_id=network_id))
+        blockchain = Blockchain(network_id=network_id, difficulty_adjuster=difficulty_adjuster, metrics=metrics)
+        pending_transactions = PendingTransaction(metrics=metrics)
+        miner = Miner(policy=policy, blockchain=blockchain, pending_transactions=pending_transactions, metrics=metrics)
+
+        return self.register(blockchain, pending_transactions, miner, priority, metrics)
+
+    def register(self, blockchain: Blockchain, pending_transactions: PendingTransaction, miner: Miner = None,
+                 priority: float = 1, metrics: MetricsRegistry = None) -> ChainContext:
+        """
+        Register the components of an existing chain under the network_id of its blockchain.
+        The components should report to the given metrics registry, by default the default one.
+        """
+        if priority <= 0:
+            raise ValueError("The mining priority has to be positive!")
+        if miner is not None and (miner.blockchain is not blockchain or miner.pending_transactions is not pending_transactions):
+            raise ValueError("The miner has to mine the registered blockchain and mempool!")
+
+        network_id = blockchain.network_id
+        context = ChainContext(network_id, blockchain, pending_transactions, miner, priority, metrics)
+
+        with self.__lock:
+            if network_id in self.__chains:
+                raise ValueError(f"A chain with the network id {network_id} is already registered!")
+            self.__chains[network_id] = context
+            self.scheduler.rebalance(self)
+
+        self.logger.log_info("Registered chain %d with priority %s.", network_id, priority)
+        return context
+
+    def remove(self, network_id: int) -> ChainContext:
+        """
+        Remove a chain from the registry and stop its miner.
+        """
+        with self.__lock:
+            context = self.get(network_id)
+            del self.__chains[network_id]
+            self.scheduler.rebalance(self)
+
+        self.__stop_miner(context)
+        self.logger.log_info("Removed chain %d.", network_id)
+        return context
+
+    def get(self, network_id: int) -> ChainContext:
+        """
+        Get the components of a chain, raises a KeyError for an unknown network_id.
+        """
+        with self.__lock:
+            context = self.__chains.get(network_id)
+
+        if context is None:
+            raise KeyError(f"No chain with the network id {network_id} is registered!")
+        return context
+
+    def get_blockchain(self, network_id: int) -> Blockchain:
+        return self.get(network_id).blockchain
+
+    def get_pending_transactions(self, network_id: int) -> PendingTransaction:
+        return self.get(network_id).pending_transactions
+
+    def get_miner(self, network_id: int) -> Miner:
+        return self.get(network_id).miner
+
+    def get_priorities(self) -> dict:
+        """
+        Get the mining priority of every chain with a miner.
+        """
+        with self.__lock:
+            return {network_id: context.priority for network_id, context in self.__chains.items() if context.miner is not None}
+
+    def set_priority(self, network_id: int, priority: float) -> None:
+        if priority <= 0:
+            raise ValueError("The mining priority has to be positive!")
+
+        with self.__lock:
+            self.get(network_id).priority = priority
+            self.scheduler.rebalance(self)
+
+    def to_prometheus(self) -> str:
+        """
+        Export the default registry and the registries of all chains in the Prometheus text format.
+        """
+        registries = [MetricsRegistry.get_default()]
+        with self.__lock:
+            for context in self.__chains.values():
+                if all(context.metrics is not registry for registry in registries):
+                    registries.append(context.metrics)
+
+        return MetricsRegistry.export_prometheus(registries)
+
+    def start_mining(self) -> None:
+        """
+        Start the miners of all chains that are not running yet.
+        """
+        with self.__lock:
+            contexts = list(self.__chains.values())
+
+        for context in contexts:
+            if context.miner is not None and not context.miner.is_alive():
+                context.miner.start()
+
+    def stop_mining(self) -> None:
+        """
+        Stop the miners of all chains and wait for them.
+        """
+        with self.__lock:
+            contexts = list(self.__chains.values())
+
+        for context in contexts:
+            self.__stop_miner(context)
+
+    def __stop_miner(self, context: ChainContext) -> None:
+        if context.miner is None:
+            return
+
+        context.miner.stop_mining()
+        if context.miner.is_alive():
+            context.miner.join()
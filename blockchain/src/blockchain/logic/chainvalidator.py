@@ -0,0 +1,214 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+
+import multiprocessing
+from collections import deque
+
+from blockchain.logic.blockchain import Blockchain
+from blockchain.logic.difficultyadjuster import DifficultyAdjuster
+from blockchain.modules.block import Block
+from blockchain.modules.blockheader import BlockHeader
+from blockchain.modules.genesisblock import GenesisBlock
+from blockchain.utils.merkletree import MerkleTree
+from blockchain.logger.processlogger import ProcessLogger
+
+
+class ChainValidationError(ValueError):
+    """
+    Raised for a chain with an invalid block.
+
+    Attributes:
+        height (int): Height of the first invalid block.
+        reason (str): Why the block is invalid.
+    """
+    def __init__(self, height: int, reason: str) -> None:
+        super().__init__(f"Invalid block at height {height}: {reason}")
+        self.height = height
+        self.reason = reason
+
+
+def _verify_bodies(start: int, payloads: list):
+    """
+    Verify the bodies of the serialized blocks at the heights start, start + 1, ...: the
+    block has to decode, the merkle root over the recomputed tx_ids has to match the header
+    and the block hash has to fulfill the target in the header. The genesis block is not
+    mined, so it is exempt from the target. Returns (height, reason) of the first invalid
+    block or None. Runs inside a worker process.
+    """
+    for height, payload in enumerate(payloads, start=start):
+        try:
+            block = Block.from_bytes(payload)
+        except (ValueError, IndexError) as e:
+            return height, f"the block can not be decoded ({e})"
+
+        #* the tx_ids are recomputed from the transaction bytes while decoding
+        root = MerkleTree(transaction.tx_id for transaction in block.transactions).get_root()
+        if root != block.block_header.transaction_list_hash:
+            return height, "the merkle root does not match the transactions"
+
+        if height > 0 and not block.block_header.fulfills_target():
+            return height, "the block hash does not fulfill the target"
+
+    return None
+
+
+class ChainValidator:
+    """
+    ChainValidator verifies a serialized chain, e.g. when it is read from persistence. The
+    links between the headers are cheap and are checked sequentially, the expensive checks
+    of the block bodies are sent in height-ordered batches to a pool of worker processes.
+    Only a bounded number of batches is in flight, so the chain is never held in memory
+    twice. The result is the first invalid height.
+
+    The target in a header is checked together with the links: with a difficulty adjuster
+    it has to be the target retargeted from the previous headers and the timestamp it is
+    derived from has to pass the sanity check of the adjuster, otherwise the target must
+    not be above the fixed difficulty.
+
+    Attributes:
+        difficulty (int): The highest target a block may carry without difficulty adjuster.
+        difficulty_adjuster (DifficultyAdjuster): Optional, computes the expected target of every block.
+        workers (int): Number of worker processes, with 1 the bodies are verified in-process.
+        batch_size (int): Number of blocks per batch.
+    """
+    BATCH_SIZE = 512
+
+    def __init__(self, difficulty: int = Blockchain.DIFFICULTY, workers: int = None, batch_size: int = BATCH_SIZE,
+                 difficulty_adjuster: DifficultyAdjuster = None) -> None:
+        self.logger = ProcessLogger("ChainValidator")
+        self.difficulty = difficulty
+        self.difficulty_adjuster = difficulty_adjuster
+        self.workers = workers if workers is not None else multiprocessing.cpu_count()
+        self.batch_size = batch_size
+
+        if self.workers < 1:
+            raise ValueError("The chain validator needs at least one worker!")
+
+    def find_first_invalid(self, payloads):
+        """
+        Verify the serialized blocks in height order. Returns (height, reason) of the first
+        invalid block or None if the chain is valid.
+        """
+        if self.workers == 1:
+            return self.__verify(payloads, None)
+
+        with multiprocessing.Pool(self.workers) as pool:
+            return self.__verify(payloads, pool)
+
+    def validate(self, payloads) -> None:
+        """
+        Verify the serialized blocks in height order and raise a ChainValidationError for
+        the first invalid block.
+        """
+        result = self.find_first_invalid(payloads)
+        if result is not None:
+            raise ChainValidationError(*result)
+
+    def __verify(self, payloads, pool):
+        pending = deque()
+        link_error = None
+        batch_start, batch = 0, list()
+        previous_hash = bytes(GenesisBlock.ZERO_HASH_IN)
+        headers = deque(maxlen=self.difficulty_adjuster.get_history_size() if self.difficulty_adjuster is not None else 0)
+        height = -1
+
+        for height, payload in enumerate(payloads):
+            block_header, link_error = self.__check_header(height, payload, previous_hash, headers)
+            if link_error is not None:
+                break
+            previous_hash = block_header.as_hash()
+            if height > 0:
+                headers.append(block_header)
+
+            #* memoryviews into a memory-mapped store can not be sent to the workers
+            batch.append(bytes(payload))
+            if len(batch) == self.batch_size:
+                body_error = self.__submit(pending, pool, batch_start, batch)
+                if body_error is not None:
+                    return body_error
+                batch_start, batch = height + 1, list()
+
+        if batch:
+            pending.append(self.__dispatch(pool, batch_start, batch))
+
+        while pending:
+            body_error = pending.popleft().get()
+            if body_error is not None:
+                return body_error
+
+        if link_error is None:
+            self.logger.log_debug("Verified %d block(s).", height + 1)
+        return link_error
+
+    def __check_header(self, height: int, payload, previous_hash: bytes, headers: deque):
+        """
+        Check the link and the target of a header against the previous mined headers.
+        Returns the tuple (header, error), the error is (height, reason) or None.
+        """
+        if len(payload) < 1 + BlockHeader.SIZE or payload[0] != Block.FORMAT_VERSION:
+            return None, (height, "the block header can not be decoded")
+
+        try:
+            block_header = BlockHeader.from_bytes(payload[1:1 + BlockHeader.SIZE])
+        except ValueError as e:
+            return None, (height, f"the block header can not be decoded ({e})")
+
+        if bytes(block_header.previous_hash) != previous_hash:
+            return block_header, (height, "the previous hash does not match the previous block")
+
+        if height > 0:
+            if self.difficulty_adjuster is not None:
+                if not self.difficulty_adjuster.is_valid_timestamp(list(headers), block_header):
+                    return block_header, (height, "the timestamp is before the recent blocks or in the future")
+                if not self.difficulty_adjuster.is_valid_bits(list(headers), block_header):
+                    return block_header, (height, "the target does not match the retargeted difficulty")
+            elif block_header.get_target() > self.difficulty:
+                return block_header, (height, "the target is above the difficulty")
+
+        return block_header, None
+
+    def __submit(self, pending: deque, pool, start: int, batch: list):
+        """
+        Queue a batch and, once the window of batches in flight is full, wait for the
+        oldest one. Returns the first body error of the waited batch or None.
+        """
+        pending.append(self.__dispatch(pool, start, batch))
+
+        if len(pending) > 2 * self.workers or pool is None:
+            return pending.popleft().get()
+        return None
+
+    def __dispatch(self, pool, start: int, batch: list):
+        if pool is None:
+            return _CompletedBatch(_verify_bodies(start, batch))
+        return pool.apply_async(_verify_bodies, (start, batch))
+
+
+class _CompletedBatch:
+    """
+    Result of a batch that was verified in-process, with the interface of an AsyncResult.
+    """
+    def __init__(self, result) -> None:
+        self.__result = result
+
+    def get(self):
+        return self.__result
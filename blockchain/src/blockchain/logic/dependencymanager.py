@@ -1,26 +1,27 @@
-/********************************************************************************
-* Copyright (c) 2024 Contributors to the Eclipse Foundation
-* Copyright (c) 2024 German Aerospace Center (DLR e.V.)
-*
-* See the NOTICE file(s) distributed with this work for additional
-* information regarding copyright ownership.
-*
-* This program and the accompanying materials are made available under the
-* terms of the Apache License, Version 2.0 which is available at
-* https://www.apache.org/licenses/LICENSE-2.0.
-*
-* Unless required by applicable law or agreed to in writing, software
-* distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
-* WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
-* License for the specific language governing permissions and limitations
-* under the License.
-*
-* SPDX-License-Identifier: Apache-2.0
-********************************************************************************/
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
 
 
 from blockchain.logic.pendingtransactions import PendingTransaction
 from blockchain.logic.blockchain import Blockchain
+from blockchain.logic.difficultyadjuster import DifficultyAdjuster
 from blockchain.logger.processlogger import ProcessLogger
 
 
@@ -34,12 +35,15 @@ class DependencyManager:
         pending_transactions (PendingTransaction): The instance managing pending transactions.
         blockchain (Blockchain): The blockchain instance.
         miner (Miner): The miner instance.
+        difficulty_adjuster (DifficultyAdjuster): Optional, retargets the difficulty of the created
+            blockchain. Without it the blockchain keeps its fixed difficulty.
         instance (DependencyManager): The singleton instance of this class.
         logger (ProcessLogger): Logger instance for logging dependency manager activities.
     """
     pending_transactions = None
     blockchain = None
     miner = None
+    difficulty_adjuster = None
     instance = None #* attribute for singleton function
     
     logger = ProcessLogger("DependencyManager")
@@ -57,7 +61,7 @@ class DependencyManager:
         """
         if DependencyManager.pending_transactions is None:
             DependencyManager.pending_transactions = PendingTransaction()
-            DependencyManager.logger.log_info(f"{DependencyManager.pending_transactions} created PendingTransaction.")
+            DependencyManager.logger.log_info("%s created PendingTransaction.", DependencyManager.pending_transactions)
         
         return DependencyManager.pending_transactions
 
@@ -71,13 +75,21 @@ class DependencyManager:
     @staticmethod
     def get_blockchain() -> Blockchain:
         """
-        Retrieves the blockchain instance, creating it if it doesn't exist.
+        Retrieves the blockchain instance, creating it if it doesn't exist. The created
+        blockchain only retargets its difficulty if a difficulty adjuster was injected before.
         """
         if DependencyManager.blockchain is None:
-            DependencyManager.blockchain = Blockchain()
+            DependencyManager.blockchain = Blockchain(difficulty_adjuster=DependencyManager.difficulty_adjuster)
         
         return DependencyManager.blockchain
 
+    @staticmethod
+    def inject_difficulty_adjuster(difficulty_adjuster: DifficultyAdjuster):
+        """
+        Injects the difficulty adjuster of the blockchain that is created on first use.
+        """
+        DependencyManager.difficulty_adjuster = difficulty_adjuster
+
     def inject_blockchain(blockchain: Blockchain):
         """
         Injects an external blockchain instance.
@@ -0,0 +1,132 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import time
+
+from blockchain.modules.blockheader import BlockHeader
+from blockchain.utils.compacttarget import CompactTarget
+
+
+class DifficultyAdjuster:
+    """
+    DifficultyAdjuster computes the target of the next block from a rolling window of the
+    latest block timestamps, so the chain converges to the configured block interval on any
+    hardware. The mean interval over the window is compared with the configured one and the
+    target of the previous block is scaled by the ratio. The genesis block is not mined and
+    its timestamp is arbitrary, so it is not part of the window; the first mined block
+    carries the initial target. The ratio is clamped to max_adjustment and damped, so a
+    single fast or slow block or a wrong clock can not move the target by much.
+
+    As the target follows the timestamps, a header is only valid with a timestamp that is
+    not before the median of the latest MEDIAN_WINDOW headers and not more than
+    MAX_FUTURE_DRIFT seconds ahead of the local clock.
+
+    The computation only uses integer arithmetic on the header fields, so every node derives
+    the same compact target for a block and validators can check the bits of a header.
+
+    Attributes:
+        target_block_interval (float): Seconds between two blocks the target is adjusted to.
+            Shorter intervals give a lower latency, longer ones larger blocks.
+        window (int): Number of block intervals the mean interval is taken over.
+        damping (int): Only 1/damping of the deviation from the block interval is corrected per block.
+        max_adjustment (int): Upper bound for the ratio between the measured and the configured
+            interval, in both directions.
+        max_target (int): Highest target, i.e. lowest difficulty, the adjustment may reach.
+        initial_target (int): Target of the first block after the genesis block.
+    """
+    TARGET_BLOCK_INTERVAL = 10.0
+    WINDOW = 20
+    DAMPING = 4
+    MAX_ADJUSTMENT = 4
+    MAX_TARGET = CompactTarget.decode(CompactTarget.encode(2 ** 256 - 1))
+    INITIAL_TARGET = CompactTarget.decode(BlockHeader.DEFAULT_BITS)
+    MEDIAN_WINDOW = 11
+    MAX_FUTURE_DRIFT = 120.0
+
+    def __init__(self, target_block_interval: float = TARGET_BLOCK_INTERVAL, window: int = WINDOW, damping: int = DAMPING,
+                 max_adjustment: int = MAX_ADJUSTMENT, max_target: int = MAX_TARGET, initial_target: int = INITIAL_TARGET) -> None:
+        if target_block_interval < 0.001:
+            raise ValueError("The target block interval has to be at least one millisecond!")
+        if window < 1 or damping < 1 or max_adjustment < 1:
+            raise ValueError("The window, damping and maximum adjustment have to be at least 1!")
+
+        self.target_block_interval = target_block_interval
+        self.window = window
+        self.damping = damping
+        self.max_adjustment = max_adjustment
+        self.max_target = max_target
+        self.initial_bits = CompactTarget.encode(min(initial_target, max_target))
+
+    def get_next_bits(self, headers: list) -> int:
+        """
+        Get the compact target of the block following the given headers. The headers are
+        the latest mined blocks of the chain in height order, without the genesis block; at
+        most window + 1 of them are used. Without headers the initial target is used, with
+        only one header its target is kept.
+        """
+        if not headers:
+            return self.initial_bits
+
+        headers = headers[-(self.window + 1):]
+        previous_bits = headers[-1].bits
+        if len(headers) < 2:
+            return previous_bits
+
+        #* timestamps are in milliseconds
+        expected = (len(headers) - 1) * int(self.target_block_interval * 1000)
+        actual = headers[-1].timestamp - headers[0].timestamp
+        actual = min(max(actual, expected // self.max_adjustment), expected * self.max_adjustment)
+
+        target = CompactTarget.decode(previous_bits)
+        target = target * (self.damping * expected + actual - expected) // (self.damping * expected)
+        target = min(max(target, 1), self.max_target)
+
+        return CompactTarget.encode(target)
+
+    def get_next_target(self, headers: list) -> int:
+        """
+        Get the target of the block following the given headers.
+        """
+        return CompactTarget.decode(self.get_next_bits(headers))
+
+    def is_valid_bits(self, headers: list, block_header: BlockHeader) -> bool:
+        """
+        Check if the header carries the compact target that follows the given headers.
+        """
+        return block_header.bits == self.get_next_bits(headers)
+
+    def is_valid_timestamp(self, headers: list, block_header: BlockHeader, now: int = None) -> bool:
+        """
+        Check the timestamp of the header against the given headers, the latest mined
+        blocks in height order, and the current time in milliseconds.
+        """
+        now = now if now is not None else int(time.time() * 1000)
+        if block_header.timestamp > now + int(DifficultyAdjuster.MAX_FUTURE_DRIFT * 1000):
+            return False
+
+        timestamps = sorted(header.timestamp for header in headers[-DifficultyAdjuster.MEDIAN_WINDOW:])
+        return not timestamps or block_header.timestamp >= timestamps[len(timestamps) // 2]
+
+    def get_history_size(self) -> int:
+        """
+        Get the number of latest headers the bits and the timestamp of a block depend on.
+        """
+        return max(self.window + 1, DifficultyAdjuster.MEDIAN_WINDOW)
@@ -0,0 +1,162 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import time
+import heapq
+import itertools
+
+from blockchain.modules.transaction import Transaction
+
+
+class Mempool:
+    """
+    Mempool is an indexed priority queue for pending transactions. The transactions are
+    kept in a binary heap ordered by priority (lowest first) and insertion order, and are
+    indexed by their tx_id. Removed transactions are only marked in the heap and dropped
+    when they reach the top or when more than half of the heap is marked, which keeps
+    insert and removal at O(log n) amortized. The class itself is not thread safe.
+
+    Attributes:
+        __heap (list): Heap entries of the form [priority, sequence, tx_id, arrival, transaction],
+            arrival is the monotonic time the transaction was added.
+        __index (dict): The live heap entries with the tx_id as key.
+        __removed (int): Number of entries in the heap that are marked as removed.
+    """
+    def __init__(self) -> None:
+        self.__heap = list()
+        self.__index = dict()
+        self.__sequence = itertools.count()
+        self.__removed = 0
+
+    def __len__(self) -> int:
+        return len(self.__index)
+
+    def __contains__(self, tx_id: bytes) -> bool:
+        return tx_id in self.__index
+
+    def add(self, priority, transaction: Transaction) -> bool:
+        """
+        Add a transaction with the given priority. Returns False if a transaction with
+        the same tx_id is already pending.
+        """
+        tx_id = transaction.tx_id
+        if tx_id in self.__index:
+            return False
+
+        entry = [priority, next(self.__sequence), tx_id, time.monotonic(), transaction]
+        self.__index[tx_id] = entry
+        heapq.heappush(self.__heap, entry)
+        return True
+
+    def add_many(self, entries) -> int:
+        """
+        Add the (priority, transaction) pairs whose tx_id is not pending yet. A batch at least
+        as large as the heap is appended and heapified in O(n), smaller batches are pushed
+        one by one. Returns the number of added transactions.
+        """
+        new_entries = list()
+        arrival = time.monotonic()
+        for priority, transaction in entries:
+            tx_id = transaction.tx_id
+            if tx_id in self.__index:
+                continue
+
+            entry = [priority, next(self.__sequence), tx_id, arrival, transaction]
+            self.__index[tx_id] = entry
+            new_entries.append(entry)
+
+        if len(new_entries) >= len(self.__heap):
+            self.__heap.extend(new_entries)
+            heapq.heapify(self.__heap)
+        else:
+            for entry in new_entries:
+                heapq.heappush(self.__heap, entry)
+
+        return len(new_entries)
+
+    def remove(self, tx_id: bytes) -> bool:
+        """
+        Remove the transaction with the given tx_id. Returns False if it is not pending.
+        """
+        entry = self.__index.pop(tx_id, None)
+        if entry is None:
+            return False
+
+        entry[-1] = None    #* mark as removed, the entry is dropped lazily
+        self.__removed += 1
+
+        if self.__removed > len(self.__heap) // 2:
+            self.__compact()
+        else:
+            self.__drop_removed_top()
+
+        return True
+
+    def get(self, tx_id: bytes) -> Transaction:
+        """
+        Get the pending transaction with the given tx_id or None.
+        """
+        entry = self.__index.get(tx_id)
+        return entry[-1] if entry is not None else None
+
+    def peek(self, count: int) -> list:
+        """
+        Get the first count transactions in priority order without removing them.
+        """
+        return list(itertools.islice(self.iter_ordered(), count))
+
+    def iter_ordered(self):
+        """
+        Iterate lazily over the pending transactions in priority order. Walks the heap
+        with a second heap of frontier positions, so the first k transactions cost
+        O(k log k) and the mempool itself is not modified.
+        """
+        heap = self.__heap
+        if not heap:
+            return
+
+        frontier = [(heap[0][0], heap[0][1], 0)]
+        while frontier:
+            position = heapq.heappop(frontier)[2]
+            transaction = heap[position][-1]
+
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child][0], heap[child][1], child))
+
+            if transaction is not None:
+                yield transaction
+
+    def get_arrival_times(self) -> list:
+        """
+        Get the monotonic times the pending transactions were added, in no particular order.
+        """
+        return [entry[3] for entry in self.__index.values()]
+
+    def __drop_removed_top(self) -> None:
+        while self.__heap and self.__heap[0][-1] is None:
+            heapq.heappop(self.__heap)
+            self.__removed -= 1
+
+    def __compact(self) -> None:
+        self.__heap = [entry for entry in self.__heap if entry[-1] is not None]
+        heapq.heapify(self.__heap)
+        self.__removed = 0
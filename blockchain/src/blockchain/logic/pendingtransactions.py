@@ -1,63 +1,248 @@
-/********************************************************************************
-* Copyright (c) 2024 Contributors to the Eclipse Foundation
-* Copyright (c) 2024 German Aerospace Center (DLR e.V.)
-*
-* See the NOTICE file(s) distributed with this work for additional
-* information regarding copyright ownership.
-*
-* This program and the accompanying materials are made available under the
-* terms of the Apache License, Version 2.0 which is available at
-* https://www.apache.org/licenses/LICENSE-2.0.
-*
-* Unless required by applicable law or agreed to in writing, software
-* distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
-* WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
-* License for the specific language governing permissions and limitations
-* under the License.
-*
-* SPDX-License-Identifier: Apache-2.0
-********************************************************************************/
-
-
-import queue
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import time
+import threading
 
 from blockchain.modules.transaction import Transaction
 from blockchain.modules.block import Block
+from blockchain.logic.mempool import Mempool
 from blockchain.utils.transactioncomparatorbyfee import TransactionComparatorByFee
 from blockchain.logger.processlogger import ProcessLogger
+from blockchain.logger.metrics import MetricsRegistry
 
 
 class PendingTransaction:
     """
     The class is used to manage outstanding transactions, since not all transactions can be
-    processed immediately by solving the cryptographic puzzle. It uses Priority Queues to sort
-    and save temporarily the transactions.
+    processed immediately by solving the cryptographic puzzle. It uses an indexed mempool to
+    sort and save temporarily the transactions until their block is added to the blockchain.
+    The transactions are ordered by their fee per serialized byte, highest first.
+
+    Attributes:
+        max_block_transactions (int): Maximum number of transactions in a block.
+        max_block_size (int): Maximum serialized size of all transactions in a block in bytes.
+        max_block_fee_limit (float): Maximum sum of the transaction fee limits in a block.
+        max_pending_transactions (int): Maximum number of transactions in the mempool. Further
+            transactions are rejected until mined blocks free space. The default leaves room
+            for a backlog of several hundred thousand transactions, a bound against memory
+            growing without limit rather than a limit for regular load.
     """
-    def __init__(self) -> None:
-        self.__pending_transactions = queue.PriorityQueue()
+    MAX_BLOCK_TRANSACTIONS = 5000
+    MAX_BLOCK_SIZE = 1024 * 1024
+    MAX_BLOCK_FEE_LIMIT = 1000000.0
+    MAX_SKIPPED_CANDIDATES = 1000   #* stop filling a block after this many transactions in a row did not fit
+    MAX_PENDING_TRANSACTIONS = 1000000
+    AGE_BUCKETS = (1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+
+    def __init__(self, max_block_transactions: int = MAX_BLOCK_TRANSACTIONS, max_block_size: int = MAX_BLOCK_SIZE,
+                 max_block_fee_limit: float = MAX_BLOCK_FEE_LIMIT, max_pending_transactions: int = MAX_PENDING_TRANSACTIONS,
+                 metrics: MetricsRegistry = None) -> None:
+        self.__pending_transactions = Mempool()
+        self.__lock = threading.Lock()
+        self.__space_available = threading.Condition(self.__lock)
+        self.__transactions_available = threading.Condition(self.__lock)
+        self.__wake_ups = 0        #* incremented by wake_up() to release waiting threads
+        self.__added_count = 0     #* number of transactions ever added, lets the miner notice new transactions
         #self.__comparator = TransactionComparatorByFee()
         self.logger = ProcessLogger("PendingTransaction")
 
-    def add_pending_transactions(self, transaction: Transaction):
+        self.max_block_transactions = max_block_transactions
+        self.max_block_size = max_block_size
+        self.max_block_fee_limit = max_block_fee_limit
+        self.max_pending_transactions = max_pending_transactions
+
+        metrics = metrics if metrics is not None else MetricsRegistry.get_default()
+        self.__depth_gauge = metrics.gauge("mempool_depth", "Number of pending transactions.")
+        self.__age_histogram = metrics.histogram("mempool_transaction_age_seconds",
+                                                 "Time the pending transactions are waiting in the mempool.",
+                                                 PendingTransaction.AGE_BUCKETS)
+        metrics.register_collector(self.collect_metrics)
+
+    def add_pending_transactions(self, transaction: Transaction) -> bool:
+        """
+        Add transaction to the mempool. Returns False if the transaction is already pending,
+        the mempool is full or the transaction does not fit into any block.
+        """
+        if not self.fits_into_block(transaction):
+            self.logger.log_sampled("Rejecting transaction, it exceeds the block limits: %s", transaction.get_tx_id_as_string())
+            return False
+
+        #* the mempool pops the lowest priority first, so the fee per byte is negated
+        priority = -(transaction.transaction_fee_base_price / transaction.get_size())
+
+        with self.__lock:
+            full = len(self.__pending_transactions) >= self.max_pending_transactions
+            added = not full and self.__pending_transactions.add(priority, transaction)
+            if added:
+                self.__added_count += 1
+                self.__transactions_available.notify_all()
+
+        if added:
+            self.logger.log_sampled("Adding transaction: %s", transaction.get_tx_id_as_string())
+        elif full:
+            self.logger.log_sampled("Rejecting transaction, the mempool is full: %s", transaction.get_tx_id_as_string())
+        else:
+            self.logger.log_sampled("Rejecting duplicate transaction: %s", transaction.get_tx_id_as_string())
+
+        return added
+
+    def add_pending_transactions_bulk(self, transactions) -> int:
+        """
+        Add an iterable of transactions to the mempool under a single lock acquisition.
+        Objects that are no transactions, transactions that do not fit into any block,
+        duplicates within the batch or the mempool and transactions beyond the maximum
+        mempool size are skipped. One summary is logged instead of a line per transaction.
+        Returns the number of added transactions.
+        """
+        entries = dict()
+        invalid = 0
+        total = 0
+
+        for transaction in transactions:
+            total += 1
+            if not isinstance(transaction, Transaction) or not self.fits_into_block(transaction):
+                invalid += 1
+                continue
+            #* the mempool pops the lowest priority first, so the fee per byte is negated
+            entries.setdefault(transaction.tx_id, (-(transaction.transaction_fee_base_price / transaction.get_size()), transaction))
+
+        candidates = list(entries.values())
+        added = 0
+        position = 0
+
+        with self.__lock:
+            #* duplicates of pending transactions leave room for the following candidates
+            while position < len(candidates):
+                free = self.max_pending_transactions - len(self.__pending_transactions)
+                if free <= 0:
+                    break
+                chunk = candidates[position:position + free]
+                added += self.__pending_transactions.add_many(chunk)
+                position += len(chunk)
+            self.__added_count += added
+            if added:
+                self.__transactions_available.notify_all()
+
+        self.logger.log_info("Added %d of %d transaction(s) in bulk, %d invalid, %d duplicate or over capacity.",
+                             added, total, invalid, total - invalid - added)
+        return added
+
+    def fits_into_block(self, transaction: Transaction) -> bool:
+        """
+        Check if the transaction fits into the size and fee limit of an empty block. Larger
+        transactions could never be selected and would stay pending forever.
+        """
+        return transaction.get_size() <= self.max_block_size and transaction.transaction_fee_limit <= self.max_block_fee_limit
+
+    def collect_metrics(self) -> None:
+        """
+        Refresh the mempool depth and rebuild the age distribution of the pending transactions.
+        """
+        with self.__lock:
+            arrival_times = self.__pending_transactions.get_arrival_times()
+
+        now = time.monotonic()
+        self.__depth_gauge.set(len(arrival_times))
+        self.__age_histogram.reset()
+        for arrival in arrival_times:
+            self.__age_histogram.observe(now - arrival)
+
+    def get_added_count(self) -> int:
         """
-        Add transaction to priority queue.
+        Get the number of transactions added to the mempool since it was created. The
+        difference of two counts is the number of transactions that arrived in between.
         """
-        self.logger.log_info(f"Adding transaction: {transaction.get_tx_id_as_string()}")
-        self.__pending_transactions.put((transaction.transaction_fee_base_price, transaction)) #* Entries are typically tuples of the form:  (priority number, data) 
+        return self.__added_count
+
+    def wait_for_transactions(self, count: int = 1, timeout: float = None, wake_ups: int = None) -> bool:
+        """
+        Block until at least count transactions are pending. Returns False if the timeout
+        expired or the waiting thread was woken up by wake_up() before. A caller that checks
+        a stop condition first passes the get_wake_ups() it read before that check, so a
+        wake_up() in between is not lost.
+        """
+        with self.__transactions_available:
+            if wake_ups is None:
+                wake_ups = self.__wake_ups
+            return self.__transactions_available.wait_for(
+                lambda: len(self.__pending_transactions) >= count or self.__wake_ups != wake_ups, timeout
+            ) and len(self.__pending_transactions) >= count
+
+    def get_wake_ups(self) -> int:
+        """
+        Get the number of wake_up() calls so far, see wait_for_transactions().
+        """
+        return self.__wake_ups
+
+    def wake_up(self) -> None:
+        """
+        Release all threads waiting for transactions, e.g. a miner that is stopped.
+        """
+        with self.__transactions_available:
+            self.__wake_ups += 1
+            self.__transactions_available.notify_all()
+
+    def is_full(self) -> bool:
+        """
+        Check if the mempool has reached its maximum number of transactions.
+        """
+        return len(self.__pending_transactions) >= self.max_pending_transactions
+
+    def wait_for_space(self, timeout: float = None) -> bool:
+        """
+        Block until the mempool is not full anymore. Returns False if the timeout expired.
+        """
+        with self.__space_available:
+            return self.__space_available.wait_for(
+                lambda: len(self.__pending_transactions) < self.max_pending_transactions, timeout)
    
     def get_transactions_for_the_next_block(self) -> list:
         """
-        Collect the transaction that will be processed in the next block.
+        Collect the transaction that will be processed in the next block. The block is
+        filled greedily with the transactions of the highest fee per byte that still fit
+        into the transaction count, size and fee limit of the block. The transactions
+        stay in the mempool until the block is added to the blockchain.
         """
         next_transactions = list()
-        #TODO: Add transaction capacity. Add maybe a dummy counter for test.
-        transaction_counter = 1     #* set to 1 for Prov demo
-        self.logger.log_debug(f"Length of pending transaction queue: {self.__pending_transactions.qsize()}")
-        
-        while transaction_counter > 0 and not self.__pending_transactions.empty():
-            #TODO: Check for alternative for get(). get() deletes item from queue, shoudn't happen here.
-            next_transactions.append(self.__pending_transactions.get())
-            transaction_counter -= 1
+        remaining_size = self.max_block_size
+        remaining_fee_limit = self.max_block_fee_limit
+        skipped = 0
+
+        with self.__lock:
+            self.logger.log_debug("Length of pending transaction queue: %d", len(self.__pending_transactions))
+
+            for transaction in self.__pending_transactions.iter_ordered():
+                if len(next_transactions) >= self.max_block_transactions or skipped >= self.MAX_SKIPPED_CANDIDATES:
+                    break
+
+                size = transaction.get_size()
+                if size > remaining_size or transaction.transaction_fee_limit > remaining_fee_limit:
+                    skipped += 1
+                    continue
+
+                next_transactions.append(transaction)
+                remaining_size -= size
+                remaining_fee_limit -= transaction.transaction_fee_limit
+                skipped = 0
 
         return next_transactions
 
@@ -69,31 +254,48 @@ class PendingTransaction:
 
 
     def clear_transactions_from_block(self, transactions: list):
-        #TODO: Queue should be deleted here. Not in get_transactions_for_the_next_block() method.
-        for transaction in transactions:
-            self.logger.log_debug(f"Fee: {transaction[1].transaction_fee_base_price} Transaction: {transaction}")
-            self.logger.log_debug(f"Pending Transactions: {self.__pending_transactions} Length: {self.__pending_transactions.qsize()}") 
-            self.__pending_transactions.queue.remove((transaction[1].transaction_fee_base_price, transaction[1]))
+        debug = self.logger.is_debug_enabled()
+
+        with self.__lock:
+            for transaction in transactions:
+                if debug:
+                    self.logger.log_debug("Fee: %s Transaction: %s", transaction.transaction_fee_base_price, transaction)
+                self.__pending_transactions.remove(transaction.tx_id)
+            self.logger.log_debug("Pending Transactions: %s Length: %d", self.__pending_transactions, len(self.__pending_transactions))
+            self.__space_available.notify_all()
         
+    def list_pending_transactions(self) -> list:
+        """
+        Get a copy of the pending transactions in priority order.
+        """
+        with self.__lock:
+            return list(self.__pending_transactions.iter_ordered())
+
+    def get_pending_transaction(self, tx_id: bytes) -> Transaction:
+        """
+        Get the pending transaction with the given tx_id or None.
+        """
+        with self.__lock:
+            return self.__pending_transactions.get(bytes(tx_id))
+
     def pending_transactions_available(self) -> bool:
         """
         Check if pending transaction queue is empty. 
         """
-        return not self.__pending_transactions.empty()
+        return len(self.__pending_transactions) > 0
     
     def get_pending_transaction_len(self) -> int:
         """
         Get the lenght of the pending transaction queue.
         """
-        return self.pending_transactions.qsize()
+        return len(self.pending_transactions)
         
     @property
     def pending_transactions(self):
         return self.__pending_transactions
     
     @pending_transactions.setter
-    def pending_transactions(self, value: queue.PriorityQueue):
+    def pending_transactions(self, value: Mempool):
+        if not isinstance(value, Mempool):
+            raise AttributeError("The attribute pending_transaction has to be a Mempool object!")
         self.__pending_transactions = value
-        if value != queue.PriorityQueue:
-            raise AttributeError("The attribute pending_transaction has to be a queue.PriorityQueue object!")
-        
\ No newline at end of file
@@ -1,29 +1,31 @@
-/********************************************************************************
-* Copyright (c) 2024 Contributors to the Eclipse Foundation
-* Copyright (c) 2024 German Aerospace Center (DLR e.V.)
-*
-* See the NOTICE file(s) distributed with this work for additional
-* information regarding copyright ownership.
-*
-* This program and the accompanying materials are made available under the
-* terms of the Apache License, Version 2.0 which is available at
-* https://www.apache.org/licenses/LICENSE-2.0.
-*
-* Unless required by applicable law or agreed to in writing, software
-* distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
-* WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
-* License for the specific language governing permissions and limitations
-* under the License.
-*
-* SPDX-License-Identifier: Apache-2.0
-********************************************************************************/
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
 
 
 from time import time
 
 from blockchain.modules.blockheader import BlockHeader
 from blockchain.modules.transaction import Transaction
-from blockchain.utils.sha3helper import SHA3Helper
+from blockchain.utils.binarycodec import BinaryWriter, BinaryReader
+from blockchain.utils.merkletree import MerkleTree
+from blockchain.utils.merkleproof import MerkleProof
 
 
 class Block:
@@ -35,32 +37,79 @@ class Block:
     Attributes:
             transactions (list): List of transactions in the block.
             previous_hash (bytes): Hash of the previous block.
+            bits (int): Compact form of the target the block hash has to fulfill.
+
+    Blocks use slots instead of an instance dict, the transactions are kept as plain list.
+    A block added to a chain is frozen: its header becomes read-only, its transactions a
+    tuple and add_transaction() raises an AttributeError, so the committed chain can not be
+    changed through the blocks handed out by its views.
     """
-    def __init__(self, transactions: list, previous_hash: bytes) -> None:
+    __slots__ = ("__transactions", "__transaction_count", "__merkle_tree", "__block_header", "__frozen")
+    FORMAT_VERSION = 2
+
+    def __init__(self, transactions: list, previous_hash: bytes, bits: int = BlockHeader.DEFAULT_BITS) -> None:
         # self.__block_size = None #! See how to solve this in Python
         self.__transactions = transactions
         self.__transaction_count = 0
-        self.__block_header = BlockHeader(int(time()*1000), previous_hash, self.transaction_hash()) 
+        self.__merkle_tree = MerkleTree(transaction.tx_id for transaction in transactions)
+        self.__block_header = BlockHeader(int(time()*1000), previous_hash, self.transaction_hash(), bits)
+        self.__frozen = False
+
+    def freeze(self) -> None:
+        """
+        Make the block and its header read-only, e.g. once it is committed to a chain.
+        """
+        if not self.__frozen:
+            self.__transactions = tuple(self.__transactions)
+            self.__block_header.freeze()
+            self.__frozen = True
+
+    def is_frozen(self) -> bool:
+        return self.__frozen
     
     def transaction_hash(self) -> bytes:
         """
-        Build the merkle root out of all transactions in the list.
+        Get the merkle root out of all transactions in the list.
         """
-        transactions_in_bytes = bytearray()
+        return self.get_merkle_tree().get_root()
 
-        for transaction in self.__transactions:
-            transactions_in_bytes.extend(transaction[1].tx_id)  # 'transaction' are tuple because of priorityQueue
-            
-        return SHA3Helper.hash256(transactions_in_bytes)
+    def get_merkle_tree(self) -> MerkleTree:
+        """
+        Get the merkle tree of the transactions. For a deserialized block it is built on first use.
+        """
+        if self.__merkle_tree is None:
+            self.__merkle_tree = MerkleTree(transaction.tx_id for transaction in self.__transactions)
+
+        return self.__merkle_tree
     
+    def get_inclusion_proof(self, tx_id: bytes, position: int = None) -> MerkleProof:
+        """
+        Get the merkle proof that the transaction with the given tx_id is part of this block.
+        If the position of the transaction is known (e.g. from the transaction index), the
+        transactions are not scanned. Returns None if the block does not contain the transaction.
+        """
+        if position is not None:
+            if 0 <= position < len(self.__transactions) and self.__transactions[position].tx_id == tx_id:
+                return MerkleProof(self.__transactions[position].to_bytes(), self.get_merkle_tree().get_proof(position))
+            return None
+
+        for position, transaction in enumerate(self.__transactions):
+            if transaction.tx_id == tx_id:
+                return MerkleProof(transaction.to_bytes(), self.get_merkle_tree().get_proof(position))
+
+        return None
+
     def add_transaction(self, transaction: Transaction) -> None:
         """
-        Add transaction to the transaction list.
+        Add transaction to the transaction list. Only the path of the new transaction
+        in the merkle tree is rehashed.
         """
+        if self.__frozen:
+            raise AttributeError("Transactions can not be added to a committed block!")
         self.__transactions.append(transaction)
         self.__transaction_count += 1
-        self.__block_header.transaction_list_hash.replace(self.__block_header.transaction_list_hash, self.transaction_hash()) #! Look if this is right transaction_list_hash datatype bytes()
-        print("Transaction list hash", self.__block_header.transaction_list_hash)
+        self.get_merkle_tree().append(transaction.tx_id)
+        self.__block_header.transaction_list_hash = self.transaction_hash()
         #self.block_size = 128 #! How to do this in python?
 
     def to_json(self) -> dict:
@@ -69,6 +118,55 @@ class Block:
                     block_header = self.__block_header
                     )
 
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the block to its versioned binary encoding: the header followed by the
+        length-prefixed transactions.
+        """
+        writer = (BinaryWriter()
+                  .write_u8(Block.FORMAT_VERSION)
+                  .write_raw(self.__block_header.to_bytes())
+                  .write_u32(self.__transaction_count)
+                  .write_u32(len(self.__transactions)))
+
+        for transaction in self.__transactions:
+            writer.write_bytes(transaction.to_bytes())
+
+        return writer.to_bytes()
+
+    @staticmethod
+    def from_bytes(data) -> "Block":
+        """
+        Deserialize a block from its binary encoding. The data can be a memoryview, e.g.
+        of a memory-mapped file, the transactions are decoded from slices of it.
+        """
+        reader = BinaryReader(data)
+
+        version = reader.read_u8()
+        if version != Block.FORMAT_VERSION:
+            raise ValueError(f"Unsupported block format version {version}!")
+
+        block_header = BlockHeader.read_from(reader)
+        transaction_count = reader.read_u32()
+        block_hash = block_header.as_hash()
+
+        transactions = list()
+        for _ in range(reader.read_u32()):
+            transaction = Transaction.from_bytes(reader.read_bytes())
+            transaction.block_id = block_hash
+            transactions.append(transaction)
+
+        if not reader.at_end():
+            raise ValueError("Unexpected data behind the encoded block!")
+
+        block = Block.__new__(Block)
+        block.__transactions = transactions
+        block.__transaction_count = transaction_count
+        block.__block_header = block_header
+        block.__merkle_tree = None
+        block.__frozen = False
+        return block
+
     def get_block_hash(self) -> bytes:
         return self.__block_header.as_hash()
     
@@ -81,6 +179,8 @@ class Block:
     
     @transactions.setter
     def transactions(self, value: list):
+        if self.__frozen:
+            raise AttributeError("The transactions of a committed block can not be changed!")
         self.__transactions = value
         if value != list:
             raise AttributeError("The transactions have to be in a list!")
@@ -91,6 +191,8 @@ class Block:
     
     @transaction_count.setter
     def transaction_count(self, value: int):
+        if self.__frozen:
+            raise AttributeError("The transaction count of a committed block can not be changed!")
         self.__transaction_count = value
         if value != int:
             raise AttributeError("The transaction count has to be an integer!")
@@ -101,6 +203,8 @@ class Block:
     
     @block_header.setter
     def block_header(self, value: BlockHeader):
+        if self.__frozen:
+            raise AttributeError("The block header of a committed block can not be changed!")
         self.__block_header = value
         if value != BlockHeader:
             raise AttributeError("The block_header has to be a block_header object!")
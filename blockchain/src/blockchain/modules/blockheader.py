@@ -1,25 +1,30 @@
-/********************************************************************************
-* Copyright (c) 2024 Contributors to the Eclipse Foundation
-* Copyright (c) 2024 German Aerospace Center (DLR e.V.)
-*
-* See the NOTICE file(s) distributed with this work for additional
-* information regarding copyright ownership.
-*
-* This program and the accompanying materials are made available under the
-* terms of the Apache License, Version 2.0 which is available at
-* https://www.apache.org/licenses/LICENSE-2.0.
-*
-* Unless required by applicable law or agreed to in writing, software
-* distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
-* WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
-* License for the specific language governing permissions and limitations
-* under the License.
-*
-* SPDX-License-Identifier: Apache-2.0
-********************************************************************************/
-
-
-from blockchain.utils.sha3helper import SHA3Helper
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import hashlib
+import struct
+
+from blockchain.utils.binarycodec import BinaryReader
+from blockchain.utils.compacttarget import CompactTarget
+
 
 class BlockHeader:
     """
@@ -31,34 +36,127 @@ class BlockHeader:
             timestamp (int): Timestamp of the block when created.
             previous_hash (bytes): Hash of the previous block.
             transaction_list_hash (bytes): Hash of the hole transaction list. Merkle root.
+            bits (int): Compact form of the target the block hash has to fulfill.
+
+    The hash of the header is calculated over a fixed binary layout, which is also its
+    serialization. All fields except the nonce form a constant prefix, so the miner only
+    has to hash the prefix once. Headers use slots instead of an instance dict.
+
+    The header of a block that is added to a chain is frozen, changing one of its fields
+    afterwards raises an AttributeError.
     """
-    def __init__(self, timestamp: int, previous_hash: bytes, transaction_list_hash: bytes) -> None:
-        self.__version = 1
+    __slots__ = ("__version", "__timestamp", "__previous_hash", "__transaction_list_hash", "__bits", "__nonce", "__frozen")
+    VERSION = 2
+    MAX_NONCE = (2 ** 31) - 1   # calculates the "maximum" value of an integer
+    PREFIX_LAYOUT = struct.Struct(">IQ32s32sI")  #* version, timestamp, previous_hash, transaction_list_hash, bits
+    NONCE_LAYOUT = struct.Struct(">I")
+    SIZE = PREFIX_LAYOUT.size + NONCE_LAYOUT.size
+    DEFAULT_BITS = 0x1e08637b   #* compact form of Blockchain.DIFFICULTY
+
+    def __init__(self, timestamp: int, previous_hash: bytes, transaction_list_hash: bytes, bits: int = DEFAULT_BITS) -> None:
+        self.__version = BlockHeader.VERSION
         self.__timestamp = timestamp
         self.__previous_hash = previous_hash
         self.__transaction_list_hash = transaction_list_hash
+        self.__bits = bits
         self.__nonce = 1
+        self.__frozen = False
+
+    def freeze(self) -> None:
+        """
+        Make the header read-only, e.g. once its block is committed to a chain.
+        """
+        self.__frozen = True
+
+    def is_frozen(self) -> bool:
+        return self.__frozen
+
+    def __check_not_frozen(self) -> None:
+        if self.__frozen:
+            raise AttributeError("The block header of a committed block can not be changed!")
 
     def increment_nonce(self) -> None:
         """
-        Increment root to find fitting nonce for crypto puzzle.
+        Increment root to find fitting nonce for crypto puzzle. When the nonce space is
+        exhausted the timestamp is rolled forward and the nonce starts again.
         """
-        if self.__nonce >= (2 ** 31) - 1:       # calculates the "maximum" value of an integer 
-            raise ArithmeticError("nonce too high")
+        self.__check_not_frozen()
+        if self.__nonce >= BlockHeader.MAX_NONCE:
+            self.roll_timestamp()
+            return
 
         self.__nonce += 1
 
+    def roll_timestamp(self, timestamp: int = None) -> None:
+        """
+        Move the timestamp forward to the given one, at least by one millisecond, and reset
+        the nonce. This changes the header prefix and gives a fresh nonce space.
+        """
+        self.__check_not_frozen()
+        self.__timestamp = max(self.__timestamp + 1, timestamp if timestamp is not None else 0)
+        self.__nonce = 0
+
     def as_hash(self) -> bytes:
         """
         Get hash of the blockheader instance.
         """
-        return SHA3Helper.hash256(self)
+        return hashlib.sha256(self.to_bytes()).digest()
+
+    def get_target(self) -> int:
+        """
+        Get the target the block hash has to fulfill, decoded from the bits.
+        """
+        return CompactTarget.decode(self.__bits)
+
+    def fulfills_target(self) -> bool:
+        """
+        Check if the hash of the header fulfills the target in its bits.
+        """
+        return int.from_bytes(self.as_hash(), byteorder='big') <= self.get_target()
+
+    def get_prefix_bytes(self) -> bytes:
+        """
+        Get the binary layout of all header fields that do not change while mining.
+        """
+        return BlockHeader.PREFIX_LAYOUT.pack(self.__version,
+                                              self.__timestamp,
+                                              self.__previous_hash,
+                                              self.__transaction_list_hash,
+                                              self.__bits)
     
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the header to its fixed binary layout.
+        """
+        return self.get_prefix_bytes() + BlockHeader.NONCE_LAYOUT.pack(self.__nonce)
+
+    @staticmethod
+    def from_bytes(data) -> "BlockHeader":
+        """
+        Deserialize a header from its fixed binary layout.
+        """
+        return BlockHeader.read_from(BinaryReader(data))
+
+    @staticmethod
+    def read_from(reader: BinaryReader) -> "BlockHeader":
+        """
+        Read a header from a reader positioned at its binary layout.
+        """
+        version, timestamp, previous_hash, transaction_list_hash, bits = BlockHeader.PREFIX_LAYOUT.unpack(
+            reader.read_raw(BlockHeader.PREFIX_LAYOUT.size))
+        if version != BlockHeader.VERSION:
+            raise ValueError(f"Unsupported block header version {version}!")
+
+        block_header = BlockHeader(timestamp, previous_hash, transaction_list_hash, bits)
+        block_header.__nonce = reader.read_u32()
+        return block_header
+
     def to_json(self) -> dict:
         return dict(version = self.__version,
                     timestamp = self.__timestamp,
                     previous_hash = self.__previous_hash,
                     #transaction_list_hash = self.__transaction_list_hash.decode(), #! Some bug is here. Says hash hasn't the 'utf-8' format! 
+                    bits = self.__bits,
                     nonce = self.__nonce
                     )
 
@@ -68,6 +166,7 @@ class BlockHeader:
 
     @version.setter
     def version(self, value: int):
+        self.__check_not_frozen()
         self.__version = value
         if value != int:
             raise AttributeError("The version number has to be an integer!")
@@ -78,9 +177,10 @@ class BlockHeader:
 
     @timestamp.setter
     def timestamp(self, value: int):
-        self.__timestamp = value
-        if value != int:
+        self.__check_not_frozen()
+        if not isinstance(value, int):
             raise AttributeError("The timestamp has to be an integer!")
+        self.__timestamp = value
 
     @property
     def previous_hash(self):
@@ -88,6 +188,7 @@ class BlockHeader:
 
     @previous_hash.setter
     def previous_hash(self, value: bytes):
+        self.__check_not_frozen()
         self.__previous_hash = value
         if value != bytes:
             raise AttributeError("The Previous Hash has to be in bytes!")
@@ -98,9 +199,21 @@ class BlockHeader:
 
     @transaction_list_hash.setter
     def transaction_list_hash(self, value: bytes):
-        self.__transaction_list_hash = value
-        if value != bytes:
+        self.__check_not_frozen()
+        if not isinstance(value, bytes):
             raise AttributeError("The transaction list hash has to be in bytes!")
+        self.__transaction_list_hash = value
+
+    @property
+    def bits(self):
+        return self.__bits
+
+    @bits.setter
+    def bits(self, value: int):
+        self.__check_not_frozen()
+        if not isinstance(value, int):
+            raise AttributeError("The bits have to be an integer!")
+        self.__bits = value
 
     @property
     def nonce(self):
@@ -108,6 +221,7 @@ class BlockHeader:
 
     @nonce.setter
     def nonce(self, value: int):
-        self.__nonce = value
-        if value != int:
+        self.__check_not_frozen()
+        if not isinstance(value, int):
             raise AttributeError("The nonce has to be an integer!")
+        self.__nonce = value
@@ -1,50 +1,78 @@
-/********************************************************************************
-* Copyright (c) 2024 Contributors to the Eclipse Foundation
-* Copyright (c) 2024 German Aerospace Center (DLR e.V.)
-*
-* See the NOTICE file(s) distributed with this work for additional
-* information regarding copyright ownership.
-*
-* This program and the accompanying materials are made available under the
-* terms of the Apache License, Version 2.0 which is available at
-* https://www.apache.org/licenses/LICENSE-2.0.
-*
-* Unless required by applicable law or agreed to in writing, software
-* distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
-* WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
-* License for the specific language governing permissions and limitations
-* under the License.
-*
-* SPDX-License-Identifier: Apache-2.0
-********************************************************************************/
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
 
 
 from typing import List
-from copy import deepcopy
 
 from blockchain.modules.block import Block
 from blockchain.modules.genesisblock import GenesisBlock
+from blockchain.modules.chainview import ChainView
 
 
 class Chain:
     """
-    The chain object collects the blocks.
+    The chain object collects the blocks. Blocks are only appended, so read access is
+    given through views on the block list instead of copies. The blocks are frozen when
+    they join the chain, so the views can hand them out without a copy.
     
     Attributes:
             __chain (List[Block]): The list of blocks in the chain, initialized with the genesis block.
             __network_id (int): The identifier for the network.
+
+    Args:
+            blocks (List[Block]): Blocks of an existing chain, including its genesis block. A block
+                sequence that is no list has to support len(), indexing and append().
     """
-    def __init__(self, network_id: int) -> None:
-        self.__chain: List[Block] = [GenesisBlock()]
+    def __init__(self, network_id: int, blocks: List[Block] = None) -> None:
+        #* blocks read from persistence already start with their genesis block. Block sequences
+        #* that are no lists (e.g. StoredBlocks, which load blocks lazily) are not copied.
+        if not blocks:
+            self.__chain: List[Block] = [GenesisBlock()]
+        elif isinstance(blocks, (list, tuple)):
+            self.__chain = list(blocks)
+        else:
+            self.__chain = blocks
+
+        #* lazily loaded block sequences freeze their blocks when they load them
+        if isinstance(self.__chain, list):
+            for block in self.__chain:
+                block.freeze()
         #self.__chain = list()
         self.__network_id = network_id
 
     def add(self, block: Block) -> None:
         """
-        Add a block to the chain.
+        Add a block to the chain. The block is frozen.
         """
+        block.freeze()
         self.__chain.append(block)
     
+    def mark_persisted(self, height: int) -> None:
+        """
+        Tell the block list that the blocks up to the given height are persisted. Block
+        lists that load their blocks from persistence release them from memory, lists keep them.
+        """
+        mark_persisted = getattr(self.__chain, "mark_persisted", None)
+        if mark_persisted is not None:
+            mark_persisted(height)
+
     def get_block(self, index: int) -> Block:
         """
         Get block of the chain by index.
@@ -63,6 +91,12 @@ class Chain:
         """
         return len(self.__chain)
 
+    def iter_blocks(self, start: int = 0, stop: int = None):
+        """
+        Iterate lazily over the blocks from height start up to, but not including, stop.
+        """
+        return iter(self.chain[start:stop])
+
     @property
     def network_id(self):
         return self.__network_id
@@ -74,8 +108,8 @@ class Chain:
             raise AttributeError("The network id has to be an integer!")
     
     @property
-    def chain(self) -> List[Block]:
-        return deepcopy(self.__chain)
+    def chain(self) -> ChainView:
+        return ChainView(self.__chain, range(len(self.__chain)))
 
 
     @chain.setter
@@ -0,0 +1,58 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+from collections.abc import Sequence
+from typing import List
+
+from blockchain.modules.block import Block
+
+
+class ChainView(Sequence):
+    """
+    Read-only view on the blocks of a chain. The view shares the block list of the chain
+    instead of copying it and is limited to the heights that existed when it was created.
+    Since a chain only grows at its end, the view stays a consistent snapshot while new
+    blocks are added. Slicing returns another view.
+
+    Attributes:
+        __blocks (List[Block]): The block list of the chain.
+        __heights (range): The heights of the blocks visible in this view.
+    """
+    def __init__(self, blocks: List[Block], heights: range) -> None:
+        self.__blocks = blocks
+        self.__heights = heights
+
+    def __len__(self) -> int:
+        return len(self.__heights)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ChainView(self.__blocks, self.__heights[index])
+
+        return self.__blocks[self.__heights[index]]
+
+    def __iter__(self):
+        blocks = self.__blocks
+        for height in self.__heights:
+            yield blocks[height]
+
+    def __repr__(self) -> str:
+        return f"ChainView(heights={self.__heights.start}..{self.__heights.stop})"
@@ -1,30 +1,37 @@
-/********************************************************************************
-* Copyright (c) 2024 Contributors to the Eclipse Foundation
-* Copyright (c) 2024 German Aerospace Center (DLR e.V.)
-*
-* See the NOTICE file(s) distributed with this work for additional
-* information regarding copyright ownership.
-*
-* This program and the accompanying materials are made available under the
-* terms of the Apache License, Version 2.0 which is available at
-* https://www.apache.org/licenses/LICENSE-2.0.
-*
-* Unless required by applicable law or agreed to in writing, software
-* distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
-* WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
-* License for the specific language governing permissions and limitations
-* under the License.
-*
-* SPDX-License-Identifier: Apache-2.0
-********************************************************************************/
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
 
 
 from blockchain.utils.sha3helper import SHA3Helper
+from blockchain.utils.binarycodec import BinaryWriter, BinaryReader
 
 class Transaction:
     """
     A transaction object takes all information about the transaction. The transaction
-    information that are also the arguments get serilized to hash them.
+    information that are also the arguments get serilized to hash them. The serialization
+    is the binary encoding of to_bytes(), the block_id is not part of it.
+
+    A transaction is immutable after construction, so its tx_id, hex id and size are
+    computed once and cached. Only the block_id is set later, when the transaction is
+    mined; it does not change the tx_id. Transactions use slots instead of an instance
+    dict, which keeps the memory per cached transaction small.
     
     Args:
     sender  : Add hash of the sender.
@@ -34,6 +41,10 @@ class Transaction:
     transaction_fee_base_price: Fee base price for the transaction
     transaction_fee_limit: Fee limit for the transaction.
     """  
+    FORMAT_VERSION = 1
+    __slots__ = ("__sender", "__receiver", "__amount", "__nonce", "__transaction_fee_base_price",
+                 "__transaction_fee_limit", "__prov_hash", "__block_id", "__tx_id", "__tx_id_hex", "__size")
+
     def __init__(self, sender: bytes, receiver: bytes, amount: float, nonce: int, 
     transaction_fee_base_price: float, transaction_fee_limit: float, prov_hash) -> None:
         self.__sender = sender
@@ -42,19 +53,72 @@ class Transaction:
         self.__nonce = nonce
         self.__transaction_fee_base_price = transaction_fee_base_price
         self.__transaction_fee_limit = transaction_fee_limit
-        self.prov_hash = prov_hash #* new attribute for ProvChain demo
+        self.__prov_hash = prov_hash #* new attribute for ProvChain demo
 
         self.__block_id = 0
         
-        self.__tx_id = SHA3Helper.hash256(self)
+        self.__memoize()
         #TODO: Add attribute for data example to transfer with transaction
+
+    def __memoize(self) -> None:
+        encoded = self.to_bytes()
+        self.__size = len(encoded)
+        self.__tx_id = SHA3Helper.hash_bytes(encoded)
+        self.__tx_id_hex = None
     
     def get_tx_id_as_string(self) -> str:
         """
         Convert tx_id from hash to string.
         """
-        return SHA3Helper.hash256_as_hex(self)
+        if self.__tx_id_hex is None:
+            self.__tx_id_hex = SHA3Helper.digest_to_hex(self.__tx_id)
+        return self.__tx_id_hex
     
+    def get_size(self) -> int:
+        """
+        Get the size of the serialized transaction in bytes.
+        """
+        return self.__size
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the transaction to its versioned binary encoding.
+        """
+        return (BinaryWriter()
+                .write_u8(Transaction.FORMAT_VERSION)
+                .write_value(self.__sender)
+                .write_value(self.__receiver)
+                .write_f64(self.__amount)
+                .write_i64(self.__nonce)
+                .write_f64(self.__transaction_fee_base_price)
+                .write_f64(self.__transaction_fee_limit)
+                .write_value(self.__prov_hash)
+                .to_bytes())
+
+    @staticmethod
+    def from_bytes(data) -> "Transaction":
+        """
+        Deserialize a transaction from its binary encoding.
+        """
+        return Transaction.read_from(BinaryReader(data))
+
+    @staticmethod
+    def read_from(reader: BinaryReader) -> "Transaction":
+        """
+        Read a transaction from a reader positioned at its binary encoding.
+        """
+        version = reader.read_u8()
+        if version != Transaction.FORMAT_VERSION:
+            raise ValueError(f"Unsupported transaction format version {version}!")
+
+        return Transaction(sender=reader.read_value(),
+                           receiver=reader.read_value(),
+                           amount=reader.read_f64(),
+                           nonce=reader.read_i64(),
+                           transaction_fee_base_price=reader.read_f64(),
+                           transaction_fee_limit=reader.read_f64(),
+                           prov_hash=reader.read_value())
+
     def to_json(self) -> dict:
         """
         Put transaction attributes sender, receiver, amount, nonce,
@@ -69,28 +133,22 @@ class Transaction:
                     transaction_fee_limit = self.__transaction_fee_limit
                     )
 
-    # take out attributes from serialization
-    def __getstate__(self):
-        state = self.__dict__.copy()
-        if '__block_id' in state:   
-            del state['__block_id'] #* exclude 'block_id' from serialization
-        return state
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Transaction):
+            return NotImplemented
+        return self.__tx_id == other.__tx_id
 
-    def __setstate__(self, state):
-        self.__dict__.update(state)
-        self.__block_id = 0  #* set 'block_id' to default value
+    def __hash__(self) -> int:
+        return hash(self.__tx_id)
 
-    
-    def __getstate__(self):
-        state = self.__dict__.copy()
-        if '__tx_id' in state:
-            del state['__tx_id'] 
-        return state
-
-    def __setstate__(self, state):
-        self.__dict__.update(state)
-        self.__tx_id = SHA3Helper.hash256(self) 
-    
+    # take out attributes from serialization
+    def __reduce__(self):
+        #* pickled as binary encoding, the tx_id and size are recomputed from it
+        return _restore_transaction, (self.to_bytes(), self.__block_id)
+
+    @staticmethod
+    def __immutable(name: str):
+        raise AttributeError(f"The {name} of a transaction can not be changed, transactions are immutable!")
 
     @property
     def sender(self):
@@ -98,19 +156,7 @@ class Transaction:
 
     @sender.setter
     def sender(self, value: bytes):
-        self.__sender = value
-        if value != bytes:
-            raise AttributeError("The sender has to be in byte format!")
-
-    @property
-    def receiver(self):
-        return self.__receiver
-
-    @receiver.setter
-    def receiver(self, value: bytes):
-        self.__receiver = value
-        if value != bytes:
-            raise AttributeError("The receiver has to be in byte format!")
+        Transaction.__immutable("sender")
 
     @property
     def receiver(self):
@@ -118,9 +164,7 @@ class Transaction:
 
     @receiver.setter
     def receiver(self, value: bytes):
-        self.__receiver = value
-        if value != bytes:
-            raise AttributeError("The receiver has to be in byte format!")
+        Transaction.__immutable("receiver")
 
     @property
     def amount(self):
@@ -128,9 +172,7 @@ class Transaction:
 
     @amount.setter
     def amount(self, value: float):
-        self.__amount = value
-        if value != float:
-            raise AttributeError("The amount has to be a float value!")
+        Transaction.__immutable("amount")
 
     @property
     def nonce(self):
@@ -138,9 +180,7 @@ class Transaction:
 
     @nonce.setter
     def nonce(self, value: int):
-        self.__nonce = value
-        if value != int:
-            raise AttributeError("The nonce has to be a int value!")
+        Transaction.__immutable("nonce")
 
     @property
     def transaction_fee_base_price(self):
@@ -148,9 +188,7 @@ class Transaction:
 
     @transaction_fee_base_price.setter
     def transaction_fee_base_price(self, value: float):
-        self.__transaction_fee_base_price = value
-        if value != float:
-            raise AttributeError("The transaction_fee_base_price has to be a int value!")
+        Transaction.__immutable("transaction_fee_base_price")
 
     @property
     def transaction_fee_limit(self):
@@ -158,9 +196,15 @@ class Transaction:
 
     @transaction_fee_limit.setter
     def transaction_fee_limit(self, value: float):
-        self.__transaction_fee_limit = value
-        if value != float:
-            raise AttributeError("The transaction_fee_limit has to be a int value!")
+        Transaction.__immutable("transaction_fee_limit")
+
+    @property
+    def prov_hash(self):
+        return self.__prov_hash
+
+    @prov_hash.setter
+    def prov_hash(self, value):
+        Transaction.__immutable("prov_hash")
     
     @property
     def block_id(self):
@@ -168,9 +212,9 @@ class Transaction:
 
     @block_id.setter
     def block_id(self, value: bytes):
-        self.__block_id = value
         if not isinstance(value, bytes):
             raise AttributeError("The block_id has to be in bytes format!")
+        self.__block_id = value
         
     @property
     def tx_id(self):
@@ -178,6 +222,11 @@ class Transaction:
 
     @tx_id.setter
     def tx_id(self, value: bytes):
-        self.__tx_id = value
-        if value != bytes:
-            raise AttributeError("The tx_id has to be in bytes format!")
+        Transaction.__immutable("tx_id")
+
+
+def _restore_transaction(data: bytes, block_id) -> Transaction:
+    transaction = Transaction.from_bytes(data)
+    if isinstance(block_id, bytes):
+        transaction.block_id = block_id
+    return transaction
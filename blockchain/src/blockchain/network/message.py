@@ -0,0 +1,132 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import asyncio
+import struct
+
+from blockchain.modules.block import Block
+from blockchain.modules.transaction import Transaction
+from blockchain.utils.binarycodec import BinaryWriter, BinaryReader
+
+
+#* message types
+HELLO = 0
+INV = 1
+GETDATA = 2
+TX = 3
+BLOCK = 4
+GETBLOCKS = 5
+
+#* inventory types
+INV_TX = 1
+INV_BLOCK = 2
+
+
+class Message:
+    """
+    Message is one frame of the peer-to-peer protocol: the length of the payload, the message
+    type and the payload in the binary encoding of the blockchain.
+
+    HELLO (network_id, height, genesis hash, listen port) is sent first on every connection.
+    INV announces transactions and blocks by their hash, GETDATA requests them and is answered
+    with TX and BLOCK messages. GETBLOCKS asks for an INV of the block hashes from a height on.
+
+    Attributes:
+        message_type (int): The type of the message.
+        payload (bytes): The encoded content of the message.
+    """
+    __slots__ = ("message_type", "payload")
+    HEADER = struct.Struct(">IB")   #* payload length, message type
+    MAX_PAYLOAD_SIZE = 8 * 1024 * 1024
+
+    def __init__(self, message_type: int, payload: bytes = b"") -> None:
+        self.message_type = message_type
+        self.payload = payload
+
+    def to_bytes(self) -> bytes:
+        return Message.HEADER.pack(len(self.payload), self.message_type) + self.payload
+
+    @staticmethod
+    async def read_from(reader: asyncio.StreamReader, max_payload_size: int = MAX_PAYLOAD_SIZE) -> "Message":
+        """
+        Read the next message from a stream. Raises asyncio.IncompleteReadError at the end of
+        the stream and a ValueError for a payload above the maximum size.
+        """
+        length, message_type = Message.HEADER.unpack(await reader.readexactly(Message.HEADER.size))
+        if length > max_payload_size:
+            raise ValueError(f"The message payload of {length} bytes exceeds the maximum size!")
+
+        return Message(message_type, await reader.readexactly(length))
+
+    @staticmethod
+    def hello(network_id: int, height: int, genesis_hash: bytes, listen_port: int) -> "Message":
+        return Message(HELLO, BinaryWriter()
+                       .write_u64(network_id)
+                       .write_u64(height)
+                       .write_bytes(genesis_hash)
+                       .write_u32(listen_port)
+                       .to_bytes())
+
+    def get_hello(self) -> tuple:
+        """
+        Get the tuple (network_id, height, genesis_hash, listen_port) of a HELLO message.
+        """
+        reader = BinaryReader(self.payload)
+        return reader.read_u64(), reader.read_u64(), bytes(reader.read_bytes()), reader.read_u32()
+
+    @staticmethod
+    def inventory(message_type: int, items: list) -> "Message":
+        """
+        Create an INV or GETDATA message for a list of (inventory type, hash) tuples.
+        """
+        writer = BinaryWriter().write_u32(len(items))
+        for inventory_type, item_hash in items:
+            writer.write_u8(inventory_type).write_bytes(item_hash)
+
+        return Message(message_type, writer.to_bytes())
+
+    def get_inventory(self) -> list:
+        """
+        Get the (inventory type, hash) tuples of an INV or GETDATA message.
+        """
+        reader = BinaryReader(self.payload)
+        return [(reader.read_u8(), bytes(reader.read_bytes())) for _ in range(reader.read_u32())]
+
+    @staticmethod
+    def transaction(transaction: Transaction) -> "Message":
+        return Message(TX, transaction.to_bytes())
+
+    def get_transaction(self) -> Transaction:
+        return Transaction.from_bytes(self.payload)
+
+    @staticmethod
+    def block(block: Block) -> "Message":
+        return Message(BLOCK, block.to_bytes())
+
+    def get_block(self) -> Block:
+        return Block.from_bytes(self.payload)
+
+    @staticmethod
+    def get_blocks(start_height: int) -> "Message":
+        return Message(GETBLOCKS, BinaryWriter().write_u64(start_height).to_bytes())
+
+    def get_start_height(self) -> int:
+        return BinaryReader(self.payload).read_u64()
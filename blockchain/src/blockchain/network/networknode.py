@@ -0,0 +1,408 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import asyncio
+
+from blockchain.logic.blockchain import Blockchain
+from blockchain.logic.pendingtransactions import PendingTransaction
+from blockchain.modules.block import Block
+from blockchain.modules.transaction import Transaction
+from blockchain.network.message import Message, HELLO, INV, GETDATA, TX, BLOCK, GETBLOCKS, INV_TX, INV_BLOCK
+from blockchain.network.peer import Peer
+from blockchain.threads.minerlistener import MinerListener
+from blockchain.utils.lrucache import LRUCache
+from blockchain.logger.processlogger import ProcessLogger
+from blockchain.logger.metrics import MetricsRegistry
+
+
+class NetworkNode(MinerListener):
+    """
+    NetworkNode connects the blockchain of this process with the nodes of other processes
+    or machines over asyncio streams. New transactions and blocks are gossiped: they are
+    announced by hash in INV messages, peers that do not know them yet fetch them with
+    GETDATA and announce them to their own peers after accepting them. Announcements are
+    collected for a short interval and sent as one INV per peer.
+
+    The connections to the configured peers are persistent, they are opened again after
+    the reconnect interval when they break. Every peer address has at most one connection
+    in the pool; when two nodes connect to each other at the same time, the connection
+    opened by the node with the lower address is kept.
+
+    A node that connects to a peer with a longer chain requests the missing blocks with
+    GETBLOCKS. A received block is only accepted on top of the current tip, with the
+    expected target, a hash fulfilling it and a matching merkle root; competing tips are
+    not reorganized.
+
+    Attributes:
+        blockchain (Blockchain): The local blockchain.
+        pending_transactions (PendingTransaction): The local mempool.
+        host (str): Host the node listens on.
+        port (int): Port the node listens on, with 0 a free port is chosen on start().
+        peers (list): (host, port) of the nodes this node connects to.
+        miner (Miner): Optional local miner, it refreshes its block template and restarts its
+            block interval when a block of a peer extends the chain. Blocks of peers reach the
+            other listeners, e.g. a PersistenceWriter, through the blockchain.
+        send_queue_size (int): Maximum number of queued messages per peer.
+        reconnect_interval (float): Seconds between two attempts to connect to a peer.
+    """
+    ANNOUNCE_INTERVAL = 0.05
+    MAX_INVENTORY_ITEMS = 500
+    SEEN_CACHE_SIZE = 256 * 1024
+    RECONNECT_INTERVAL = 1.0
+
+    def __init__(self, blockchain: Blockchain, pending_transactions: PendingTransaction, host: str = "127.0.0.1",
+                 port: int = 5000, peers: list = (), miner=None, send_queue_size: int = Peer.SEND_QUEUE_SIZE,
+                 reconnect_interval: float = RECONNECT_INTERVAL, metrics: MetricsRegistry = None) -> None:
+        self.logger = ProcessLogger("NetworkNode")
+        self.blockchain = blockchain
+        self.pending_transactions = pending_transactions
+        self.host = host
+        self.port = port
+        self.peers = list(peers)
+        self.miner = miner
+        self.send_queue_size = send_queue_size
+        self.reconnect_interval = reconnect_interval
+
+        self.__loop = None
+        self.__server = None
+        self.__running = False
+        self.__connections = dict()     #* (host, port) -> Peer
+        self.__tasks = set()
+        self.__announcements = list()
+        self.__announce_handle = None
+        #* hashes of transactions and blocks this node has processed, they are not requested again
+        self.__seen = LRUCache(NetworkNode.SEEN_CACHE_SIZE)
+
+        metrics = metrics if metrics is not None else MetricsRegistry.get_default()
+        self.__peer_gauge = metrics.gauge("network_peers", "Number of connected peers.")
+        self.__received = metrics.counter("network_messages_received_total", "Number of messages received from peers.")
+        self.__dropped = metrics.counter("network_messages_dropped_total", "Number of messages dropped because a send queue was full.")
+
+    @staticmethod
+    def read_hosts(path: str) -> list:
+        """
+        Read the (host, port) tuples of a hosts file with one host:port per line. Empty lines
+        and lines starting with # are skipped.
+        """
+        hosts = list()
+        with open(path) as file:
+            for line in file:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    host, port = line.rsplit(":", 1)
+                    hosts.append((host, int(port)))
+        return hosts
+
+    async def start(self) -> None:
+        """
+        Listen for peers and connect to the configured peers.
+        """
+        self.__loop = asyncio.get_running_loop()
+        self.__running = True
+        self.__server = await asyncio.start_server(self.__accept, self.host, self.port)
+        self.port = self.__server.sockets[0].getsockname()[1]
+
+        for host, port in self.peers:
+            self.connect(host, port)
+
+        self.logger.log_info("Listening on %s:%d with %d configured peer(s).", self.host, self.port, len(self.peers))
+
+    def connect(self, host: str, port: int) -> None:
+        """
+        Keep a connection to the given peer open. Must be called inside the event loop.
+        """
+        self.__start_task(self.__maintain_connection(host, port))
+
+    async def stop(self) -> None:
+        """
+        Close the server and all connections.
+        """
+        self.__running = False
+        if self.__announce_handle is not None:
+            self.__announce_handle.cancel()
+
+        self.__server.close()
+        for peer in list(self.__connections.values()):
+            peer.close()
+        for task in list(self.__tasks):
+            task.cancel()
+        await asyncio.gather(*self.__tasks, return_exceptions=True)
+        await self.__server.wait_closed()
+
+    def get_peer_addresses(self) -> list:
+        return sorted(self.__connections)
+
+    def submit_transaction(self, transaction: Transaction) -> bool:
+        """
+        Add a local transaction to the mempool and announce it to the peers. Can be called
+        from any thread. Returns False if the mempool did not take the transaction.
+        """
+        if not self.pending_transactions.add_pending_transactions(transaction):
+            return False
+
+        self.__call_in_loop(self.announce, INV_TX, transaction.tx_id)
+        return True
+
+    def notify_new_block(self, block: Block):
+        """
+        Announce a block mined by the local miner. Called from the miner thread.
+        """
+        self.__call_in_loop(self.announce, INV_BLOCK, block.get_block_hash())
+
+    def announce(self, inventory_type: int, item_hash: bytes, origin: Peer = None) -> None:
+        """
+        Announce a transaction or block to all peers except its origin. Must be called inside
+        the event loop.
+        """
+        self.__seen.put(item_hash, True)
+        self.__announcements.append((inventory_type, item_hash, origin))
+
+        if self.__announce_handle is None:
+            self.__announce_handle = self.__loop.call_later(NetworkNode.ANNOUNCE_INTERVAL, self.__flush_announcements)
+
+    def __flush_announcements(self) -> None:
+        self.__announce_handle = None
+        announcements, self.__announcements = self.__announcements, list()
+
+        for peer in list(self.__connections.values()):
+            items = list()
+            for inventory_type, item_hash, origin in announcements:
+                if origin is not peer and not peer.knows(item_hash):
+                    peer.mark_known(item_hash)
+                    items.append((inventory_type, item_hash))
+
+            for start in range(0, len(items), NetworkNode.MAX_INVENTORY_ITEMS):
+                self.__send(peer, Message.inventory(INV, items[start:start + NetworkNode.MAX_INVENTORY_ITEMS]))
+
+    def __call_in_loop(self, callback, *args) -> None:
+        if self.__loop is not None and self.__running:
+            self.__loop.call_soon_threadsafe(callback, *args)
+
+    def __start_task(self, coroutine) -> None:
+        task = asyncio.ensure_future(coroutine)
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    def __send(self, peer: Peer, message: Message) -> None:
+        if not peer.send(message):
+            self.__dropped.inc()
+
+    async def __maintain_connection(self, host: str, port: int) -> None:
+        while self.__running:
+            try:
+                reader, writer = await asyncio.open_connection(host, port)
+            except OSError as e:
+                self.logger.log_debug("Connecting to %s:%d failed: %s", host, port, e)
+            else:
+                peer = Peer(reader, writer, True, self.send_queue_size)
+                await self.__serve(peer)
+                #* a connection given up for a duplicate is not opened again while the other one lives
+                while self.__running and peer.address is not None and peer.address in self.__connections:
+                    await asyncio.sleep(self.reconnect_interval)
+
+            await asyncio.sleep(self.reconnect_interval)
+
+    async def __accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if not self.__running:
+            writer.close()
+            return
+
+        task = asyncio.current_task()
+        self.__tasks.add(task)
+        try:
+            await self.__serve(Peer(reader, writer, False, self.send_queue_size))
+        finally:
+            self.__tasks.discard(task)
+
+    async def __serve(self, peer: Peer) -> None:
+        """
+        Say hello and handle the messages of a peer until the connection is closed.
+        """
+        writer_task = asyncio.ensure_future(peer.write_messages())
+        peer.send(Message.hello(self.blockchain.network_id, len(self.blockchain) - 1,
+                                self.blockchain[0].get_block_hash(), self.port))
+
+        try:
+            while self.__running:
+                message = await peer.read_message()
+                self.__received.inc()
+                if not self.__handle(peer, message):
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            self.logger.log_debug("Connection to %s closed: %s", peer.address, e)
+        except (ValueError, IndexError) as e:
+            self.logger.log_info("Closing connection to %s after an invalid message: %s", peer.address, e)
+        finally:
+            writer_task.cancel()
+            peer.close()
+            if peer.address is not None and self.__connections.get(peer.address) is peer:
+                del self.__connections[peer.address]
+                self.__peer_gauge.set(len(self.__connections))
+
+    def __handle(self, peer: Peer, message: Message) -> bool:
+        """
+        Handle a message of a peer. Returns False if the connection has to be closed.
+        """
+        if message.message_type == HELLO:
+            return self.__handle_hello(peer, message)
+        if peer.address is None:
+            return False
+
+        if message.message_type == INV:
+            self.__handle_inventory(peer, message.get_inventory())
+        elif message.message_type == GETDATA:
+            self.__handle_get_data(peer, message.get_inventory())
+        elif message.message_type == TX:
+            self.__handle_transaction(peer, message.get_transaction())
+        elif message.message_type == BLOCK:
+            self.__handle_block(peer, message.get_block())
+        elif message.message_type == GETBLOCKS:
+            self.__handle_get_blocks(peer, message.get_start_height())
+        else:
+            self.logger.log_debug("Ignoring message of unknown type %d.", message.message_type)
+
+        return True
+
+    def __handle_hello(self, peer: Peer, message: Message) -> bool:
+        network_id, height, genesis_hash, listen_port = message.get_hello()
+        if peer.address is not None or network_id != self.blockchain.network_id \
+                or genesis_hash != self.blockchain[0].get_block_hash():
+            self.logger.log_info("Rejecting peer %s of another network.", peer.get_remote_host())
+            return False
+
+        peer.address = (peer.get_remote_host(), listen_port)
+        peer.height = height
+
+        existing = self.__connections.get(peer.address)
+        if existing is not None:
+            #* both sides keep the connection opened by the node with the lower address
+            keep_outbound = (peer.get_local_host(), self.port) < peer.address
+            if peer.outbound != keep_outbound:
+                return False
+            existing.close()
+
+        self.__connections[peer.address] = peer
+        self.__peer_gauge.set(len(self.__connections))
+        self.logger.log_info("Connected to peer %s:%d at height %d.", peer.address[0], peer.address[1], height)
+
+        if height > len(self.blockchain) - 1:
+            self.__send(peer, Message.get_blocks(len(self.blockchain)))
+        return True
+
+    def __handle_inventory(self, peer: Peer, items: list) -> None:
+        wanted = list()
+        for inventory_type, item_hash in items:
+            peer.mark_known(item_hash)
+            if not self.__is_known(inventory_type, item_hash):
+                wanted.append((inventory_type, item_hash))
+
+        if wanted:
+            self.__send(peer, Message.inventory(GETDATA, wanted))
+
+        #* a full inventory of blocks may be followed by more blocks
+        block_items = [item for item in items if item[0] == INV_BLOCK]
+        if len(block_items) == NetworkNode.MAX_INVENTORY_ITEMS and wanted:
+            self.__send(peer, Message.get_blocks(len(self.blockchain) + len(wanted)))
+
+    def __handle_get_data(self, peer: Peer, items: list) -> None:
+        for inventory_type, item_hash in items:
+            if inventory_type == INV_TX:
+                transaction = self.pending_transactions.get_pending_transaction(item_hash)
+                if transaction is None and self.blockchain.transaction_index is not None:
+                    transaction = self.blockchain.get_transaction(item_hash)
+                if transaction is not None:
+                    self.__send(peer, Message.transaction(transaction))
+            elif inventory_type == INV_BLOCK:
+                block = self.blockchain.get_block(item_hash)
+                if block is not None:
+                    self.__send(peer, Message.block(block))
+
+    def __handle_get_blocks(self, peer: Peer, start_height: int) -> None:
+        stop = min(start_height + NetworkNode.MAX_INVENTORY_ITEMS, len(self.blockchain))
+        items = [(INV_BLOCK, block.get_block_hash()) for block in self.blockchain.iter_blocks(start_height, stop)]
+
+        if items:
+            self.__send(peer, Message.inventory(INV, items))
+
+    def __handle_transaction(self, peer: Peer, transaction: Transaction) -> None:
+        tx_id = transaction.tx_id
+        peer.mark_known(tx_id)
+        if self.__is_known(INV_TX, tx_id):
+            return
+
+        if self.pending_transactions.add_pending_transactions(transaction):
+            self.announce(INV_TX, tx_id, peer)
+        else:
+            self.__seen.put(tx_id, True)
+
+    def __handle_block(self, peer: Peer, block: Block) -> None:
+        block_hash = block.get_block_hash()
+        peer.mark_known(block_hash)
+        tip_hash = self.blockchain.get_previous_hash()
+        if block_hash == tip_hash or self.blockchain.get_block(block_hash) is not None:
+            return
+
+        previous_hash = bytes(block.block_header.previous_hash)
+        if previous_hash != tip_hash:
+            if self.blockchain.get_block(previous_hash) is None:
+                #* the parent is missing, the peer is ahead of this node
+                self.__send(peer, Message.get_blocks(len(self.blockchain)))
+            return
+
+        reason = self.__check_block(block)
+        if reason is not None:
+            self.logger.log_info("Rejecting block from %s: %s", peer.address, reason)
+            return
+
+        if not self.blockchain.add_block(block):
+            #* the local miner extended the chain since the tip was checked
+            self.logger.log_info("Dropping block from %s, the chain has a new tip.", peer.address)
+            return
+        self.pending_transactions.clear_pending_transactions(block)
+        for transaction in block.transactions:
+            self.__seen.put(transaction.tx_id, True)
+        if self.miner is not None:
+            self.miner.notify_new_tip()
+
+        self.logger.log_info("Accepted block %d from %s.", len(self.blockchain) - 1, peer.address)
+        self.announce(INV_BLOCK, block_hash, peer)
+
+    def __check_block(self, block: Block):
+        """
+        Check a block that extends the tip. Returns the reason why it is invalid or None.
+        """
+        block_header = block.block_header
+        if not self.blockchain.is_valid_timestamp(block_header):
+            return "the timestamp is before the recent blocks or in the future"
+        if block_header.bits != self.blockchain.get_next_bits():
+            return "the target does not match the expected difficulty"
+        if not block_header.fulfills_target():
+            return "the block hash does not fulfill the target"
+        if block.transaction_hash() != block_header.transaction_list_hash:
+            return "the merkle root does not match the transactions"
+        return None
+
+    def __is_known(self, inventory_type: int, item_hash: bytes) -> bool:
+        if item_hash in self.__seen:
+            return True
+        if inventory_type == INV_TX:
+            return self.pending_transactions.get_pending_transaction(item_hash) is not None
+        return item_hash == self.blockchain.get_previous_hash() or self.blockchain.get_block(item_hash) is not None
@@ -0,0 +1,97 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import asyncio
+
+from blockchain.network.message import Message
+from blockchain.utils.lrucache import LRUCache
+
+
+class Peer:
+    """
+    Peer is a connection to another node. Messages are sent through a bounded queue that is
+    drained by a writer task, so a slow peer never blocks the node; messages that do not fit
+    into the queue are dropped. The peer remembers the hashes of the inventory it is known to
+    have, so transactions and blocks are not announced to it twice.
+
+    Attributes:
+        outbound (bool): True for a connection opened by this node.
+        address (tuple): (host, listen port) of the peer, known after its HELLO.
+        height (int): Height of the chain of the peer when it connected.
+        dropped (int): Number of messages dropped because the send queue was full.
+    """
+    SEND_QUEUE_SIZE = 1000
+    KNOWN_INVENTORY_SIZE = 64 * 1024
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, outbound: bool,
+                 send_queue_size: int = SEND_QUEUE_SIZE, known_inventory_size: int = KNOWN_INVENTORY_SIZE) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.outbound = outbound
+        self.address = None
+        self.height = None
+        self.dropped = 0
+        self.__send_queue = asyncio.Queue(send_queue_size)
+        self.__known_inventory = LRUCache(known_inventory_size)
+
+    def get_remote_host(self) -> str:
+        return self.writer.get_extra_info('peername')[0]
+
+    def get_local_host(self) -> str:
+        return self.writer.get_extra_info('sockname')[0]
+
+    def send(self, message: Message) -> bool:
+        """
+        Queue a message for sending. Returns False if the send queue is full and the
+        message was dropped.
+        """
+        try:
+            self.__send_queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    def get_queue_size(self) -> int:
+        return self.__send_queue.qsize()
+
+    def knows(self, item_hash: bytes) -> bool:
+        return item_hash in self.__known_inventory
+
+    def mark_known(self, item_hash: bytes) -> None:
+        self.__known_inventory.put(item_hash, True)
+
+    async def read_message(self, max_payload_size: int = Message.MAX_PAYLOAD_SIZE) -> Message:
+        return await Message.read_from(self.reader, max_payload_size)
+
+    async def write_messages(self) -> None:
+        """
+        Send the queued messages until the connection is closed. The stream is only drained
+        when the queue is empty, so a burst of messages is written in one go.
+        """
+        while True:
+            message = await self.__send_queue.get()
+            self.writer.write(message.to_bytes())
+            if self.__send_queue.empty():
+                await self.writer.drain()
+
+    def close(self) -> None:
+        self.writer.close()
@@ -0,0 +1,219 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import os
+import mmap
+import struct
+import threading
+from array import array
+
+
+class BlockStore:
+    """
+    BlockStore is an append-only storage for serialized blocks. The blocks are appended as
+    length-prefixed records to segment files, a new segment is started when the current one
+    reaches the segment size. An index file with one fixed-size entry per height maps the
+    height of a block to its segment and offset. Reads go through memory-mapped segments.
+
+    A record that was written completely but is missing in the index (e.g. after a crash) is
+    added to the index again on opening the store, an incomplete record at the end of the
+    last segment is cut off.
+
+    Attributes:
+        path (str): Directory of the segment files and the index file.
+        segment_size (int): Size in bytes after which a new segment is started.
+    """
+    SEGMENT_SIZE = 64 * 1024 * 1024
+    RECORD_HEADER = struct.Struct(">I")     #* length of the record payload
+    INDEX_ENTRY = struct.Struct(">IQI")     #* segment, offset of the record, length of the payload
+    INDEX_FILE = "index.idx"
+
+    def __init__(self, path: str, segment_size: int = SEGMENT_SIZE) -> None:
+        self.path = path
+        self.segment_size = segment_size
+
+        self.__lock = threading.RLock()
+        self.__segments = array('I')
+        self.__offsets = array('Q')
+        self.__lengths = array('I')
+        self.__maps = dict()
+
+        os.makedirs(self.path, exist_ok=True)
+        self.__load_index()
+        self.__recover()
+
+        self.__index_file = open(self.__get_index_path(), 'ab')
+        self.__active_segment = self.__segments[-1] if self.__segments else 0
+        self.__segment_file = open(self.get_segment_path(self.__active_segment), 'ab')
+
+    def __len__(self) -> int:
+        return len(self.__offsets)
+
+    def append(self, payload: bytes) -> int:
+        """
+        Append a serialized block and return its height.
+        """
+        record_size = BlockStore.RECORD_HEADER.size + len(payload)
+
+        with self.__lock:
+            offset = self.__segment_file.tell()
+            if offset > 0 and offset + record_size > self.segment_size:
+                self.__roll_over()
+                offset = 0
+
+            self.__segment_file.write(BlockStore.RECORD_HEADER.pack(len(payload)) + payload)
+            self.__index_file.write(BlockStore.INDEX_ENTRY.pack(self.__active_segment, offset, len(payload)))
+
+            self.__segments.append(self.__active_segment)
+            self.__offsets.append(offset)
+            self.__lengths.append(len(payload))
+
+            return len(self.__offsets) - 1
+
+    def read(self, height: int) -> memoryview:
+        """
+        Read the serialized block at the given height. The returned memoryview points
+        into the memory-mapped segment.
+        """
+        with self.__lock:
+            segment = self.__segments[height]
+            start = self.__offsets[height] + BlockStore.RECORD_HEADER.size
+            end = start + self.__lengths[height]
+
+            return memoryview(self.__get_map(segment, end))[start:end]
+
+    def scan(self, start: int = 0):
+        """
+        Iterate sequentially over the serialized blocks from height start on.
+        """
+        for height in range(start, len(self)):
+            yield self.read(height)
+
+    def flush(self) -> None:
+        """
+        Hand the written records to the operating system.
+        """
+        with self.__lock:
+            self.__segment_file.flush()
+            self.__index_file.flush()
+
+    def sync(self) -> None:
+        """
+        Write the records durably to disk.
+        """
+        with self.__lock:
+            self.flush()
+            os.fsync(self.__segment_file.fileno())
+            os.fsync(self.__index_file.fileno())
+
+    def close(self) -> None:
+        with self.__lock:
+            self.sync()
+            self.__segment_file.close()
+            self.__index_file.close()
+            self.__maps.clear()
+
+    def get_segment_path(self, segment: int) -> str:
+        return os.path.join(self.path, f"{segment:08d}.seg")
+
+    def __get_index_path(self) -> str:
+        return os.path.join(self.path, BlockStore.INDEX_FILE)
+
+    def __get_map(self, segment: int, end: int) -> mmap.mmap:
+        segment_map = self.__maps.get(segment)
+
+        if segment_map is None or len(segment_map) < end:
+            #* the active segment grows, so its map is renewed when a record lies behind its end.
+            #* An old map is not closed, memoryviews returned by read() may still point into it.
+            if segment == self.__active_segment:
+                self.__segment_file.flush()
+
+            with open(self.get_segment_path(segment), 'rb') as file:
+                segment_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.__maps[segment] = segment_map
+
+        return segment_map
+
+    def __roll_over(self) -> None:
+        self.__segment_file.flush()
+        os.fsync(self.__segment_file.fileno())
+        self.__segment_file.close()
+
+        self.__active_segment += 1
+        self.__segment_file = open(self.get_segment_path(self.__active_segment), 'ab')
+
+    def __load_index(self) -> None:
+        index_path = self.__get_index_path()
+        if not os.path.exists(index_path):
+            return
+
+        with open(index_path, 'rb') as file:
+            data = file.read()
+
+        complete = len(data) - len(data) % BlockStore.INDEX_ENTRY.size
+        for segment, offset, length in BlockStore.INDEX_ENTRY.iter_unpack(data[:complete]):
+            self.__segments.append(segment)
+            self.__offsets.append(offset)
+            self.__lengths.append(length)
+
+        if complete != len(data):
+            with open(index_path, 'r+b') as file:
+                file.truncate(complete)
+
+    def __recover(self) -> None:
+        """
+        Add completely written records behind the last indexed record to the index and
+        cut off an incomplete record at the end of the segment.
+        """
+        if self.__segments:
+            segment = self.__segments[-1]
+            offset = self.__offsets[-1] + BlockStore.RECORD_HEADER.size + self.__lengths[-1]
+        else:
+            segment, offset = 0, 0
+
+        recovered = list()
+        while os.path.exists(self.get_segment_path(segment)):
+            segment_path = self.get_segment_path(segment)
+            size = os.path.getsize(segment_path)
+
+            with open(segment_path, 'rb') as file:
+                file.seek(offset)
+                while offset + BlockStore.RECORD_HEADER.size <= size:
+                    (length,) = BlockStore.RECORD_HEADER.unpack(file.read(BlockStore.RECORD_HEADER.size))
+                    if offset + BlockStore.RECORD_HEADER.size + length > size:
+                        break
+                    recovered.append((segment, offset, length))
+                    file.seek(length, os.SEEK_CUR)
+                    offset += BlockStore.RECORD_HEADER.size + length
+
+            if offset < size:
+                with open(segment_path, 'r+b') as file:
+                    file.truncate(offset)
+
+            segment, offset = segment + 1, 0
+
+        if recovered:
+            with open(self.__get_index_path(), 'ab') as file:
+                for entry in recovered:
+                    file.write(BlockStore.INDEX_ENTRY.pack(*entry))
+                    self.__segments.append(entry[0])
+                    self.__offsets.append(entry[1])
+                    self.__lengths.append(entry[2])
@@ -1,37 +1,48 @@
-/********************************************************************************
-* Copyright (c) 2024 Contributors to the Eclipse Foundation
-* Copyright (c) 2024 German Aerospace Center (DLR e.V.)
-*
-* See the NOTICE file(s) distributed with this work for additional
-* information regarding copyright ownership.
-*
-* This program and the accompanying materials are made available under the
-* terms of the Apache License, Version 2.0 which is available at
-* https://www.apache.org/licenses/LICENSE-2.0.
-*
-* Unless required by applicable law or agreed to in writing, software
-* distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
-* WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
-* License for the specific language governing permissions and limitations
-* under the License.
-*
-* SPDX-License-Identifier: Apache-2.0
-********************************************************************************/
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
 
 
 import os
-import codecs
-import json
 
 from blockchain.modules.block import Block
 from blockchain.modules.chain import Chain
-from blockchain.utils.sha3helper import SHA3Helper
-from blockchain.utils.complexencoder import ComplexEncoder
+from blockchain.logic.chainvalidator import ChainValidator
+from blockchain.logic.difficultyadjuster import DifficultyAdjuster
+from blockchain.persistence.blockstore import BlockStore
+from blockchain.persistence.storedblocks import StoredBlocks
 
 class Persistence:
-    def __init__(self) -> None:
-        self.__encoding = "utf-8"
-        self.__path = os.getcwd() + "/chains"
+    """
+    Persistence stores the chains of the different networks on disk. Every chain is kept in
+    its own append-only block store, so writing a block is one sequential append and reading
+    a chain is a sequential scan in the order of the block heights.
+
+    Chains mined with a difficulty adjuster are verified against the targets it retargets,
+    so the same adjuster has to be passed to the persistence or to read_chain().
+    """
+    def __init__(self, path: str = None, segment_size: int = BlockStore.SEGMENT_SIZE,
+                 difficulty_adjuster: DifficultyAdjuster = None) -> None:
+        self.__path = path if path is not None else os.getcwd() + "/chains"
+        self.__segment_size = segment_size
+        self.difficulty_adjuster = difficulty_adjuster
+        self.__block_stores = dict()
 
         self.file = self.create_file()
 
@@ -40,15 +51,21 @@ class Persistence:
             os.mkdir(self.__path)
 
     def write_chain(self, chain: Chain):
-        network_id = chain.network_id
-        if self.does_chain_not_exist(network_id):
-            self.creat_chain(network_id)
+        """
+        Append the blocks of the chain that are not stored yet.
+        """
+        block_store = self.get_block_store(chain.network_id)
+
+        for block in chain.iter_blocks(len(block_store)):
+            block_store.append(self.encode_block(block))
+
+        block_store.flush()
 
-        for block in chain.chain:
-            block_id = str(SHA3Helper.digest_to_hex(block.block_header.as_hash())) #! original code has a getHash method but why?
-            
-            if self.file_does_not_exist(network_id, block_id):
-                self.write_block(block, network_id, block_id)
+    def write_block(self, block: Block, network_id: int) -> int:
+        """
+        Append a single block to the chain of the network and return its height.
+        """
+        return self.get_block_store(network_id).append(self.encode_block(block))
 
     def does_chain_not_exist(self, network_id: int) -> bool:
         chain_path = self.get_path_to_chain(network_id)
@@ -64,52 +81,69 @@ class Persistence:
             print("Error building chain:")
             print(e)
 
-    def file_does_not_exist(self, network_id: int, id: str) -> bool:
-        block_path = self.get_path_to_block(network_id, id)
-        return not os.path.exists(block_path)
-
-    def write_block(self, block: Block, network_id: int, block_id: str) -> None:
-        file_path = self.get_path_to_block(network_id, block_id)
-        json_format = json.dumps(block.to_json(), cls=ComplexEncoder, indent=4) #* indent can be removed
-        print(json_format) #* println for demonstration of json
-
-        try:
-            with open(file_path, 'w', encoding=self.__encoding) as file:
-                json.dump(json_format, file)
-        except IOError as e:
-            print("Error writting block:")
-            print(e)
+    def read_chain(self, network_id, verify: bool = False, validator: ChainValidator = None,
+                   difficulty_adjuster: DifficultyAdjuster = None) -> Chain:
+        """
+        Read the chain of the network. With verify the stored blocks are validated first,
+        a ChainValidationError names the first invalid height. Without validator the blocks
+        are checked against the given difficulty adjuster, by default the one of the persistence.
+        """
+        if self.does_chain_not_exist(network_id):
+            return Chain(network_id)
 
-    def read_chain(self, network_id) -> Chain:
-        chain = Chain(network_id)
+        if verify:
+            if validator is None:
+                difficulty_adjuster = difficulty_adjuster if difficulty_adjuster is not None else self.difficulty_adjuster
+                validator = ChainValidator(difficulty_adjuster=difficulty_adjuster)
+            validator.validate(self.get_block_store(network_id).scan())
 
-        if self.does_chain_exist(network_id):
-            chain_path = self.get_path_to_chain(network_id)
-            files = os.listdir(chain_path)
+        blocks = [self.decode_block(data) for data in self.get_block_store(network_id).scan()]
+        return Chain(network_id, blocks)
 
-            for file in files:
-                block = self.read_block(os.path.join(chain_path, file))
-                chain.add(block)
+    def open_chain(self, network_id) -> Chain:
+        """
+        Open the chain of the network without reading its blocks, they are decoded from
+        the block store on first access.
+        """
+        if self.does_chain_not_exist(network_id) or len(self.get_block_store(network_id)) == 0:
+            return Chain(network_id)
 
-        return chain
+        return Chain(network_id, StoredBlocks(self.get_block_store(network_id)))
 
     def does_chain_exist(self, network_id: int) -> bool:
         chain_path = self.get_path_to_chain(network_id)
         return os.path.exists(chain_path)
 
-    def read_block(self, file) -> Block:
-        with open(file, 'r', encoding=self.__encoding) as file:
-            block_data = json.load(file)
-            block = Block(block_data.transactions) #TODO: Look how to deserialize objects!
+    def read_block(self, network_id: int, height: int) -> Block:
+        return self.decode_block(self.get_block_store(network_id).read(height))
 
-        return block
+    def get_block_store(self, network_id: int) -> BlockStore:
+        """
+        Get the block store of the network, it is opened on first use.
+        """
+        block_store = self.__block_stores.get(network_id)
+
+        if block_store is None:
+            if self.does_chain_not_exist(network_id):
+                self.creat_chain(network_id)
+            block_store = BlockStore(self.get_path_to_chain(network_id), self.__segment_size)
+            self.__block_stores[network_id] = block_store
+
+        return block_store
+
+    def close(self) -> None:
+        for block_store in self.__block_stores.values():
+            block_store.close()
+        self.__block_stores.clear()
+
+    def encode_block(self, block: Block) -> bytes:
+        return block.to_bytes()
+
+    def decode_block(self, data) -> Block:
+        return Block.from_bytes(data)
 
     def get_path_to_chain(self, network_id: int) -> str:
         return os.path.join(self.path, str(network_id))
-
-    def get_path_to_block(self, network_id: int, block_id: str) -> str:
-        fileName = block_id + '.json'
-        return os.path.join(self.path, str(network_id), fileName)
     
     @property
     def path(self):
@@ -117,6 +151,6 @@ class Persistence:
 
     @path.setter
     def path(self, value: str):
-        self.__path = value
-        if value != str:
+        if not isinstance(value, str):
             raise AttributeError("The path has to be a string!")
+        self.__path = value
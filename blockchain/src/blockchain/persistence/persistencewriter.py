@@ -0,0 +1,153 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import time
+import threading
+from threading import Thread
+
+from blockchain.logic.blockchain import Blockchain
+from blockchain.logic.pendingtransactions import PendingTransaction
+from blockchain.modules.block import Block
+from blockchain.persistence.persistence import Persistence
+from blockchain.persistence.snapshot import SnapshotManager
+from blockchain.threads.minerlistener import MinerListener
+from blockchain.logger.processlogger import ProcessLogger
+from blockchain.logger.metrics import MetricsRegistry
+
+
+class PersistenceWriter(MinerListener, Thread):
+    """
+    PersistenceWriter persists the blocks of a blockchain in the background. It registers
+    itself as listener at the blockchain; a new block, mined locally or received from a peer,
+    only wakes the writer thread up, which then appends every block behind the last
+    persisted height to the block store. The appended blocks are synced to disk together once
+    per durability interval (group commit), so the miner never waits for the disk.
+
+    Attributes:
+        persisted_height (int): Height of the last block appended to the block store, -1 if none.
+        synced_height (int): Height of the last block that is durably on disk, -1 if none.
+        durability_interval (float): Seconds between two syncs of the block store. With 0 every
+            batch of blocks is synced right after it is written.
+        snapshot_manager (SnapshotManager): Optional, writes a snapshot of the node state
+            whenever one is due after persisting blocks.
+        pending_transactions (PendingTransaction): The pending transactions stored in the snapshots.
+    """
+    DURABILITY_INTERVAL = 1.0
+
+    def __init__(self, blockchain: Blockchain, persistence: Persistence, durability_interval: float = DURABILITY_INTERVAL,
+                 snapshot_manager: SnapshotManager = None, pending_transactions: PendingTransaction = None,
+                 metrics: MetricsRegistry = None) -> None:
+        Thread.__init__(self, daemon=True)
+        self.logger = ProcessLogger("PersistenceWriter")
+        self.blockchain = blockchain
+        self.persistence = persistence
+        self.durability_interval = durability_interval
+        self.snapshot_manager = snapshot_manager
+        self.pending_transactions = pending_transactions
+
+        self.__block_store = persistence.get_block_store(blockchain.chain.network_id)
+        self.__new_blocks = threading.Event()
+        self.__running = True
+        blockchain.register_listener(self)
+
+        self.persisted_height = len(self.__block_store) - 1
+        self.synced_height = self.persisted_height
+
+        metrics = metrics if metrics is not None else MetricsRegistry.get_default()
+        self.__persistence_lag = metrics.gauge("persistence_lag_blocks", "Number of blocks not yet written to the block store.")
+        self.__sync_lag = metrics.gauge("persistence_sync_lag_blocks", "Number of blocks not yet durably on disk.")
+        metrics.register_collector(self.collect_metrics)
+
+    def notify_new_block(self, block: Block):
+        self.__new_blocks.set()
+
+    def run(self):
+        self.logger.log_info("Persistence writer started!")
+        next_sync = time.monotonic() + self.durability_interval
+
+        while self.__running:
+            #* without unsynced blocks, or with a sync after every batch, only a new block wakes the writer
+            if self.durability_interval > 0 and self.synced_height < self.persisted_height:
+                self.__new_blocks.wait(max(next_sync - time.monotonic(), 0))
+            else:
+                self.__new_blocks.wait()
+            self.__new_blocks.clear()
+            self.write_new_blocks()
+
+            if self.durability_interval <= 0 or time.monotonic() >= next_sync:
+                self.sync()
+                next_sync = time.monotonic() + self.durability_interval
+
+            if self.snapshot_manager is not None and self.snapshot_manager.is_due(self.persisted_height):
+                self.write_snapshot()
+
+        self.write_new_blocks()
+        self.sync()
+
+    def write_new_blocks(self) -> int:
+        """
+        Append all blocks behind the last persisted height. Returns the number of blocks written.
+        """
+        written = 0
+
+        for block in self.blockchain.iter_blocks(self.persisted_height + 1):
+            self.persisted_height = self.__block_store.append(self.persistence.encode_block(block))
+            written += 1
+
+        if written:
+            self.__block_store.flush()
+            self.blockchain.chain.mark_persisted(self.persisted_height)
+            self.logger.log_debug("Persisted %d block(s) up to height %d.", written, self.persisted_height)
+
+        return written
+
+    def sync(self) -> None:
+        """
+        Sync all persisted blocks to disk.
+        """
+        if self.synced_height < self.persisted_height:
+            height = self.persisted_height
+            self.__block_store.sync()
+            self.synced_height = height
+
+    def write_snapshot(self) -> None:
+        """
+        Write a snapshot of the node state. The state is captured first, so all blocks up
+        to the snapshot height are persisted and synced before the snapshot is written.
+        """
+        snapshot = self.snapshot_manager.take_snapshot(self.blockchain, self.pending_transactions)
+        self.write_new_blocks()
+        self.sync()
+        self.snapshot_manager.write_snapshot(snapshot)
+
+    def collect_metrics(self) -> None:
+        height = len(self.blockchain) - 1
+        self.__persistence_lag.set(height - self.persisted_height)
+        self.__sync_lag.set(height - self.synced_height)
+
+    def stop(self) -> None:
+        """
+        Stop the writer after the remaining blocks are written and synced.
+        """
+        self.__running = False
+        self.__new_blocks.set()
+        if self.is_alive():
+            self.join()
@@ -0,0 +1,250 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+
+import os
+import re
+import hashlib
+
+from blockchain.logic.blockchain import Blockchain
+from blockchain.logic.difficultyadjuster import DifficultyAdjuster
+from blockchain.logic.pendingtransactions import PendingTransaction
+from blockchain.modules.transaction import Transaction
+from blockchain.persistence.persistence import Persistence
+from blockchain.persistence.transactionindex import TransactionIndex
+from blockchain.utils.binarycodec import BinaryWriter, BinaryReader
+from blockchain.logger.processlogger import ProcessLogger
+
+
+class Snapshot:
+    """
+    Snapshot is the derived state of a node at a block height: the tip of the chain, the
+    aggregate counters, the keys of the warm caches and the pending transactions.
+
+    Attributes:
+        height (int): Height of the tip block.
+        tip_hash (bytes): Hash of the tip block.
+        transaction_count (int): Number of transactions on the chain up to the tip.
+        block_hashes (list): Keys of the block cache, least recently used first.
+        tx_ids (list): Keys of the transaction cache, least recently used first.
+        pending_transactions (list): The pending transactions in priority order.
+    """
+    MAGIC = b"SNAP"
+    FORMAT_VERSION = 1
+    CHECKSUM_SIZE = 32
+
+    def __init__(self, height: int, tip_hash: bytes, transaction_count: int, block_hashes: list = (),
+                 tx_ids: list = (), pending_transactions: list = ()) -> None:
+        self.height = height
+        self.tip_hash = tip_hash
+        self.transaction_count = transaction_count
+        self.block_hashes = list(block_hashes)
+        self.tx_ids = list(tx_ids)
+        self.pending_transactions = list(pending_transactions)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the snapshot, followed by a checksum over the serialized data.
+        """
+        writer = (BinaryWriter()
+                  .write_raw(Snapshot.MAGIC)
+                  .write_u8(Snapshot.FORMAT_VERSION)
+                  .write_u64(self.height)
+                  .write_bytes(self.tip_hash)
+                  .write_u64(self.transaction_count))
+
+        for keys in (self.block_hashes, self.tx_ids):
+            writer.write_u32(len(keys))
+            for key in keys:
+                writer.write_bytes(key)
+
+        writer.write_u32(len(self.pending_transactions))
+        for transaction in self.pending_transactions:
+            writer.write_bytes(transaction.to_bytes())
+
+        data = writer.to_bytes()
+        return data + hashlib.sha256(data).digest()
+
+    @staticmethod
+    def from_bytes(data) -> "Snapshot":
+        data = memoryview(data)
+        content = data[:-Snapshot.CHECKSUM_SIZE]
+        if len(data) < Snapshot.CHECKSUM_SIZE or hashlib.sha256(content).digest() != data[-Snapshot.CHECKSUM_SIZE:]:
+            raise ValueError("The snapshot checksum does not match!")
+
+        reader = BinaryReader(content)
+        if bytes(reader.read_raw(len(Snapshot.MAGIC))) != Snapshot.MAGIC:
+            raise ValueError("The data is no snapshot!")
+        version = reader.read_u8()
+        if version != Snapshot.FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format version {version}!")
+
+        height = reader.read_u64()
+        tip_hash = bytes(reader.read_bytes())
+        transaction_count = reader.read_u64()
+        block_hashes = [bytes(reader.read_bytes()) for _ in range(reader.read_u32())]
+        tx_ids = [bytes(reader.read_bytes()) for _ in range(reader.read_u32())]
+        pending_transactions = [Transaction.from_bytes(reader.read_bytes()) for _ in range(reader.read_u32())]
+
+        return Snapshot(height, tip_hash, transaction_count, block_hashes, tx_ids, pending_transactions)
+
+
+class SnapshotManager:
+    """
+    SnapshotManager writes snapshots of a node every snapshot interval blocks and restores
+    a node from the latest snapshot. On restore the blocks stay in the block store and are
+    only decoded on access; the blocks behind the snapshot are replayed to update the
+    counters, caches and pending transactions. The restart time therefore depends on the
+    snapshot interval instead of the chain length.
+
+    A snapshot is written to a temporary file that replaces the snapshot file atomically,
+    older snapshots beyond the retained number are deleted.
+
+    Attributes:
+        path (str): Directory of the snapshot files.
+        interval (int): Number of blocks between two snapshots.
+        retained (int): Number of snapshot files that are kept.
+    """
+    INTERVAL = 1000
+    RETAINED = 2
+    FILE_PATTERN = re.compile(r"^(\d{12})\.snap$")
+
+    def __init__(self, path: str, interval: int = INTERVAL, retained: int = RETAINED) -> None:
+        self.logger = ProcessLogger("SnapshotManager")
+        self.path = path
+        self.interval = interval
+        self.retained = retained
+        os.makedirs(self.path, exist_ok=True)
+
+    def take_snapshot(self, blockchain: Blockchain, pending_transactions: PendingTransaction = None) -> Snapshot:
+        """
+        Capture the current state of the node in memory.
+        """
+        height, tip, transaction_count = blockchain.get_state()
+        block_hashes, tx_ids = blockchain.get_warm_sets()
+        pending = pending_transactions.list_pending_transactions() if pending_transactions is not None else ()
+
+        return Snapshot(height, tip.get_block_hash(), transaction_count, block_hashes, tx_ids, pending)
+
+    def is_due(self, height: int) -> bool:
+        """
+        Check if a snapshot is due at the given height.
+        """
+        return height - self.get_latest_height() >= self.interval
+
+    def write_snapshot(self, snapshot: Snapshot) -> str:
+        """
+        Write the snapshot durably and delete the snapshots beyond the retained number.
+        The blocks up to the snapshot height have to be persisted before.
+        """
+        snapshot_path = self.__get_snapshot_path(snapshot.height)
+        temporary_path = snapshot_path + ".tmp"
+
+        with open(temporary_path, 'wb') as file:
+            file.write(snapshot.to_bytes())
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, snapshot_path)
+
+        for height in self.__list_heights()[:-self.retained]:
+            os.remove(self.__get_snapshot_path(height))
+
+        self.logger.log_info("Wrote snapshot at height %d.", snapshot.height)
+        return snapshot_path
+
+    def get_latest_height(self) -> int:
+        heights = self.__list_heights()
+        return heights[-1] if heights else -1
+
+    def load_latest(self, persistence: Persistence = None, network_id: int = None) -> Snapshot:
+        """
+        Load the latest readable snapshot. With persistence, only a snapshot whose tip is
+        the stored block at its height is accepted. Returns None if there is none.
+        """
+        block_store = persistence.get_block_store(network_id) if persistence is not None else None
+
+        for height in reversed(self.__list_heights()):
+            try:
+                with open(self.__get_snapshot_path(height), 'rb') as file:
+                    snapshot = Snapshot.from_bytes(file.read())
+            except (OSError, ValueError) as e:
+                self.logger.log_info("Skipping unreadable snapshot at height %d: %s", height, e)
+                continue
+
+            if block_store is not None and (snapshot.height >= len(block_store)
+                                            or persistence.read_block(network_id, snapshot.height).get_block_hash() != snapshot.tip_hash):
+                self.logger.log_info("Skipping snapshot at height %d, it does not match the stored chain.", height)
+                continue
+
+            return snapshot
+
+        return None
+
+    def restore(self, persistence: Persistence, network_id: int, pending_transactions: PendingTransaction = None,
+                transaction_index: TransactionIndex = None, difficulty_adjuster: DifficultyAdjuster = None) -> Blockchain:
+        """
+        Open the stored chain of the network and restore the node state from the latest
+        snapshot. Only the blocks behind the snapshot are replayed; without a usable
+        snapshot all blocks are.
+        """
+        blockchain = Blockchain(difficulty_adjuster=difficulty_adjuster)
+        blockchain.chain = persistence.open_chain(network_id)
+
+        snapshot = self.load_latest(persistence, network_id)
+        if snapshot is not None:
+            start = snapshot.height + 1
+            blockchain.transaction_count = snapshot.transaction_count
+
+            #* transactions mined behind the snapshot are removed again while replaying
+            if pending_transactions is not None:
+                pending_transactions.add_pending_transactions_bulk(snapshot.pending_transactions)
+        else:
+            start = 0
+            blockchain.transaction_count = 0
+
+        replayed = 0
+        for height, block in enumerate(blockchain.iter_blocks(start), start=start):
+            blockchain.register_block(height, block)
+            if pending_transactions is not None:
+                pending_transactions.clear_pending_transactions(block)
+            replayed += 1
+
+        #* the index is attached after the chain, it catches up only behind its indexed height
+        if transaction_index is not None:
+            blockchain.transaction_index = transaction_index
+
+        #* without an index a cache miss scans the chain, so the caches are only warmed with one
+        if snapshot is not None and transaction_index is not None:
+            blockchain.warm_caches(snapshot.block_hashes, snapshot.tx_ids)
+
+        self.logger.log_info("Restored chain %d at height %d, replayed %d block(s).", network_id, len(blockchain) - 1, replayed)
+        return blockchain
+
+    def __get_snapshot_path(self, height: int) -> str:
+        return os.path.join(self.path, f"{height:012d}.snap")
+
+    def __list_heights(self) -> list:
+        heights = list()
+        for name in os.listdir(self.path):
+            match = SnapshotManager.FILE_PATTERN.match(name)
+            if match:
+                heights.append(int(match.group(1)))
+        return sorted(heights)
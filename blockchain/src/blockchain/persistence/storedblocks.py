@@ -0,0 +1,88 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+
+import threading
+from collections.abc import Sequence
+
+from blockchain.modules.block import Block
+from blockchain.persistence.blockstore import BlockStore
+from blockchain.utils.lrucache import LRUCache
+
+
+class StoredBlocks(Sequence):
+    """
+    StoredBlocks is the block list of a chain whose blocks are in a block store. The stored
+    blocks are decoded only when they are accessed, and only the most recently used ones
+    are kept in memory. Blocks appended afterwards are held in memory until they are
+    persisted and marked with mark_persisted(); from then on they are read from the block
+    store like the other stored blocks. Opening a chain this way does not depend on its length.
+
+    Attributes:
+        __block_store (BlockStore): The store of the blocks below the stored height.
+        __stored_height (int): Number of blocks that are read from the block store.
+        __appended (list): Blocks added behind the stored blocks.
+    """
+    CACHE_SIZE = 256
+
+    def __init__(self, block_store: BlockStore, cache_size: int = CACHE_SIZE) -> None:
+        self.__block_store = block_store
+        self.__stored_height = len(block_store)
+        self.__appended = list()
+        self.__cache = LRUCache(cache_size, self.__load)
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return self.__stored_height + len(self.__appended)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[height] for height in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("The block height is out of range!")
+
+        with self.__lock:
+            if index >= self.__stored_height:
+                return self.__appended[index - self.__stored_height]
+        return self.__cache.get(index)
+
+    def append(self, block: Block) -> None:
+        with self.__lock:
+            self.__appended.append(block)
+
+    def mark_persisted(self, height: int) -> None:
+        """
+        Release the appended blocks up to the given height, they are in the block store.
+        """
+        with self.__lock:
+            stored_height = min(height + 1, len(self.__block_store), self.__stored_height + len(self.__appended))
+            if stored_height > self.__stored_height:
+                del self.__appended[:stored_height - self.__stored_height]
+                self.__stored_height = stored_height
+
+    def __load(self, height: int) -> Block:
+        block = Block.from_bytes(self.__block_store.read(height))
+        block.freeze()
+        return block
@@ -0,0 +1,148 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import sqlite3
+import threading
+
+from blockchain.modules.block import Block
+
+
+class TransactionIndex:
+    """
+    TransactionIndex is an on-disk index of the blocks and transactions of a chain. It maps
+    tx_id -> (height, position), prov_hash -> tx_id and block hash -> height. The index is
+    an embedded SQLite file; its B-trees serve point lookups in O(log n) without scanning
+    the chain and only a bounded page cache is held in memory.
+
+    The height of the last indexed block is stored with the index, so on startup only the
+    blocks behind it have to be indexed again.
+
+    Attributes:
+        path (str): Path of the index file.
+        cache_size (int): Size of the page cache in KiB.
+    """
+    CACHE_SIZE = 8 * 1024
+
+    def __init__(self, path: str, cache_size: int = CACHE_SIZE) -> None:
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+
+        with self.__lock, self.__connection:
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute("PRAGMA synchronous=NORMAL")
+            self.__connection.execute(f"PRAGMA cache_size=-{int(cache_size)}")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS transactions "
+                "(tx_id BLOB PRIMARY KEY, height INTEGER NOT NULL, position INTEGER NOT NULL) WITHOUT ROWID")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS prov_hashes "
+                "(prov_hash TEXT NOT NULL, tx_id BLOB NOT NULL, PRIMARY KEY (prov_hash, tx_id)) WITHOUT ROWID")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS blocks "
+                "(block_hash BLOB PRIMARY KEY, height INTEGER NOT NULL) WITHOUT ROWID")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def add_block(self, height: int, block: Block) -> None:
+        """
+        Index a block and its transactions at the given height.
+        """
+        transactions = block.transactions
+
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO blocks VALUES (?, ?)", (block.get_block_hash(), height))
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO transactions VALUES (?, ?, ?)",
+                [(transaction.tx_id, height, position) for position, transaction in enumerate(transactions)])
+            self.__connection.executemany(
+                "INSERT OR IGNORE INTO prov_hashes VALUES (?, ?)",
+                [(transaction.prov_hash, transaction.tx_id) for transaction in transactions
+                 if transaction.prov_hash is not None])
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('indexed_height', ?)", (height,))
+
+    def catch_up(self, blockchain) -> int:
+        """
+        Index all blocks of the blockchain behind the last indexed height. Returns the
+        number of indexed blocks. An index that was built for another chain, i.e. its last
+        indexed block is not part of the blockchain, is built again from the start.
+        """
+        indexed_height = self.get_indexed_height()
+        if indexed_height >= 0 and (indexed_height >= len(blockchain)
+                                    or self.get_block_height(blockchain[indexed_height].get_block_hash()) != indexed_height):
+            self.clear()
+            indexed_height = -1
+
+        start = indexed_height + 1
+        count = 0
+
+        for height, block in enumerate(blockchain.iter_blocks(start), start=start):
+            self.add_block(height, block)
+            count += 1
+
+        return count
+
+    def get_indexed_height(self) -> int:
+        """
+        Get the height of the last indexed block, -1 for an empty index.
+        """
+        row = self.__fetch_one("SELECT value FROM meta WHERE key = 'indexed_height'")
+        return row[0] if row is not None else -1
+
+    def get_transaction_location(self, tx_id: bytes):
+        """
+        Get the tuple (height, position) of a transaction or None.
+        """
+        return self.__fetch_one("SELECT height, position FROM transactions WHERE tx_id = ?", (bytes(tx_id),))
+
+    def get_tx_ids_by_prov_hash(self, prov_hash: str) -> list:
+        """
+        Get the tx_ids of all transactions that carry the given prov_hash.
+        """
+        with self.__lock:
+            rows = self.__connection.execute(
+                "SELECT tx_id FROM prov_hashes WHERE prov_hash = ?", (prov_hash,)).fetchall()
+        return [row[0] for row in rows]
+
+    def get_block_height(self, block_hash: bytes):
+        """
+        Get the height of the block with the given hash or None.
+        """
+        row = self.__fetch_one("SELECT height FROM blocks WHERE block_hash = ?", (bytes(block_hash),))
+        return row[0] if row is not None else None
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the index.
+        """
+        with self.__lock, self.__connection:
+            for table in ("transactions", "prov_hashes", "blocks", "meta"):
+                self.__connection.execute(f"DELETE FROM {table}")
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__connection.close()
+
+    def __fetch_one(self, query: str, parameters: tuple = ()):
+        with self.__lock:
+            return self.__connection.execute(query, parameters).fetchone()
@@ -1,22 +1,22 @@
-/********************************************************************************
-* Copyright (c) 2024 Contributors to the Eclipse Foundation
-* Copyright (c) 2024 German Aerospace Center (DLR e.V.)
-*
-* See the NOTICE file(s) distributed with this work for additional
-* information regarding copyright ownership.
-*
-* This program and the accompanying materials are made available under the
-* terms of the Apache License, Version 2.0 which is available at
-* https://www.apache.org/licenses/LICENSE-2.0.
-*
-* Unless required by applicable law or agreed to in writing, software
-* distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
-* WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
-* License for the specific language governing permissions and limitations
-* under the License.
-*
-* SPDX-License-Identifier: Apache-2.0
-********************************************************************************/
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
 
 
 import random
@@ -33,13 +33,20 @@ class BlockchainListener(EventListeners):
         self.logger = ProcessLogger("BlockchainListener")
         pass
     
-    def update(self, prov_data):
+    @staticmethod
+    def create_transaction(sender_name, prov_hash: bytes) -> Transaction:
+        """
+        Create the transaction that anchors a PROV entry on the chain.
+        """
         random_fee_price = random.randrange(0, 100, 1)
-        
+        return Transaction(sender_name, "Receiver", 1.1, 1, random_fee_price, 0.1, SHA3Helper.digest_to_hex(prov_hash))
+
+    def update(self, prov_data):
         depend_manager = DependencyManager()
         transactions = depend_manager.get_pending_transactions()
-        transaction = Transaction(prov_data.sender_name, "Receiver", 1.1, 1, random_fee_price, 0.1, SHA3Helper.digest_to_hex(prov_data.prov_hash))
+        transaction = BlockchainListener.create_transaction(prov_data.sender_name, prov_data.prov_hash)
         transactions.add_pending_transactions(transaction)
-        self.logger.log_info(f"Passed transaction {SHA3Helper.digest_to_hex(transaction.tx_id)} to dependeny manager for PROV entrance: {SHA3Helper.digest_to_hex(prov_data.prov_hash)}")
+        self.logger.log_sampled("Passed transaction %s to dependeny manager for PROV entrance: %s",
+                                transaction.get_tx_id_as_string(), transaction.prov_hash)
         return super().update(prov_data)
     
\ No newline at end of file
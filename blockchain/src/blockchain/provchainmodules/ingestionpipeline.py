@@ -0,0 +1,156 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+
+import queue
+from threading import Lock, Thread
+
+from blockchain.logic.pendingtransactions import PendingTransaction
+from blockchain.logic.dependencymanager import DependencyManager
+from blockchain.provchainmodules.blockchainlistener import BlockchainListener
+from blockchain.logger.processlogger import ProcessLogger
+
+
+class IngestionPipeline(Thread):
+    """
+    IngestionPipeline decouples the producers of provenance events from the mempool. An
+    event is only copied into a bounded queue on submit; a worker thread takes the events
+    in batches, turns them into transactions and adds them to the pending transactions.
+    While the mempool is full the worker waits for mined blocks to free space, so the
+    queue fills up and submit applies backpressure instead of memory growing without limit.
+    On stop the queued events are still ingested while the mempool has space; the events
+    that are left while it stays full are dropped.
+
+    Attributes:
+        pending_transactions (PendingTransaction): The mempool the transactions are added to.
+        batch_size (int): Maximum number of events that are processed together.
+        submitted (int): Number of accepted events.
+        ingested (int): Number of events added to the mempool as transactions.
+        rejected (int): Number of events the mempool did not accept, e.g. duplicates.
+        dropped (int): Number of events dropped on stop because the mempool was full.
+    """
+    MAX_QUEUE_SIZE = 10000
+    BATCH_SIZE = 256
+    SPACE_CHECK_INTERVAL = 0.5
+    STOP_TIMEOUT = 10.0
+
+    def __init__(self, pending_transactions: PendingTransaction = None, max_queue_size: int = MAX_QUEUE_SIZE,
+                 batch_size: int = BATCH_SIZE) -> None:
+        Thread.__init__(self, daemon=True)
+        self.logger = ProcessLogger("IngestionPipeline")
+        self.pending_transactions = pending_transactions if pending_transactions is not None else DependencyManager.get_pending_transactions()
+        self.batch_size = batch_size
+
+        self.submitted = 0
+        self.ingested = 0
+        self.rejected = 0
+        self.dropped = 0
+
+        self.__submitted_lock = Lock()   #* submit is called by several producer threads
+        self.__queue = queue.Queue(max_queue_size)
+        self.__running = True
+
+    def submit(self, prov_data, block: bool = True, timeout: float = None) -> bool:
+        """
+        Accept a provenance event. Only blocks while the queue is full; without block or
+        after the timeout the event is not accepted and False is returned.
+        """
+        #* the producer keeps changing its prov_data object, so the fields are copied now
+        event = (prov_data.sender_name, prov_data.prov_hash)
+
+        try:
+            self.__queue.put(event, block, timeout)
+        except queue.Full:
+            return False
+
+        with self.__submitted_lock:
+            self.submitted += 1
+        return True
+
+    def get_queue_size(self) -> int:
+        return self.__queue.qsize()
+
+    def run(self):
+        self.logger.log_info("Ingestion pipeline started!")
+
+        while self.__running or not self.__queue.empty():
+            batch = self.__take_batch()
+            if batch:
+                self.__ingest(batch)
+
+    def stop(self, timeout: float = STOP_TIMEOUT) -> None:
+        """
+        Stop the pipeline after the queued events are ingested, waiting at most timeout
+        seconds for the worker thread.
+        """
+        self.__running = False
+        if self.is_alive():
+            self.join(timeout)
+            if self.is_alive():
+                self.logger.log_error("Ingestion pipeline did not stop within %s seconds!", timeout)
+
+    def __take_batch(self) -> list:
+        try:
+            batch = [self.__queue.get(timeout=IngestionPipeline.SPACE_CHECK_INTERVAL)]
+        except queue.Empty:
+            return list()
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.__queue.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def __ingest(self, batch: list) -> None:
+        transactions = [BlockchainListener.create_transaction(sender_name, prov_hash) for sender_name, prov_hash in batch]
+        position = 0
+
+        while position < len(transactions):
+            while self.pending_transactions.is_full():
+                if not self.__running:
+                    self.__drop(len(transactions) - position)
+                    return
+                self.pending_transactions.wait_for_space(IngestionPipeline.SPACE_CHECK_INTERVAL)
+
+            #* only as many transactions as fit are passed, the rest waits for the next free space
+            free = self.pending_transactions.max_pending_transactions - self.pending_transactions.get_pending_transaction_len()
+            chunk = transactions[position:position + max(free, 1)]
+            added = self.pending_transactions.add_pending_transactions_bulk(chunk)
+
+            self.ingested += added
+            self.rejected += len(chunk) - added
+            position += len(chunk)
+
+        self.logger.log_debug("Ingested a batch of %d event(s), %d queued.", len(batch), self.get_queue_size())
+
+    def __drop(self, count: int) -> None:
+        #* stopping while the mempool stays full, the queued events could never be added
+        while True:
+            try:
+                self.__queue.get_nowait()
+                count += 1
+            except queue.Empty:
+                break
+
+        self.dropped += count
+        self.logger.log_info("Dropped %d event(s) on stop, the mempool is full.", count)
@@ -1,22 +1,22 @@
-/********************************************************************************
-* Copyright (c) 2024 Contributors to the Eclipse Foundation
-* Copyright (c) 2024 German Aerospace Center (DLR e.V.)
-*
-* See the NOTICE file(s) distributed with this work for additional
-* information regarding copyright ownership.
-*
-* This program and the accompanying materials are made available under the
-* terms of the Apache License, Version 2.0 which is available at
-* https://www.apache.org/licenses/LICENSE-2.0.
-*
-* Unless required by applicable law or agreed to in writing, software
-* distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
-* WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
-* License for the specific language governing permissions and limitations
-* under the License.
-*
-* SPDX-License-Identifier: Apache-2.0
-********************************************************************************/
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
 
 
 from blockchain.provchainmodules.filehandler import FileHandler
@@ -25,9 +25,9 @@ from blockchain.logger.processlogger import ProcessLogger
 
 
 class User:
-    def __init__(self, name) -> None:
+    def __init__(self, name, pipeline=None) -> None:
         self.name = name
-        self.file_handler = FileHandler()
+        self.file_handler = FileHandler(pipeline)
         self.prov_data = ProvCollector()
         self.logger = ProcessLogger("User")
         
@@ -36,13 +36,13 @@ class User:
     def create_file(self, filename: str) -> None:
         self.prov_data.filename = filename
         self.prov_data.action = "File created."
-        self.logger.log_info(f"User {self.name} created file {filename}.")
+        self.logger.log_info("User %s created file %s.", self.name, filename)
         self.file_handler.create_txt(filename, self.prov_data)
         
     
     def modify_file(self, filename, message):
         self.prov_data.filename = filename
         self.prov_data.action = "File modified."
-        self.logger.log_info(f"User {self.name} modified file {filename} and added text {message}.")
+        self.logger.log_info("User %s modified file %s and added text %s.", self.name, filename, message)
         self.file_handler.modify_txt(filename, message, self.prov_data)
         
\ No newline at end of file
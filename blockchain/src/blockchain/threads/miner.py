@@ -1,95 +1,340 @@
-/********************************************************************************
-* Copyright (c) 2024 Contributors to the Eclipse Foundation
-* Copyright (c) 2024 German Aerospace Center (DLR e.V.)
-*
-* See the NOTICE file(s) distributed with this work for additional
-* information regarding copyright ownership.
-*
-* This program and the accompanying materials are made available under the
-* terms of the Apache License, Version 2.0 which is available at
-* https://www.apache.org/licenses/LICENSE-2.0.
-*
-* Unless required by applicable law or agreed to in writing, software
-* distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
-* WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
-* License for the specific language governing permissions and limitations
-* under the License.
-*
-* SPDX-License-Identifier: Apache-2.0
-********************************************************************************/
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
 
 
+import time
 from threading import Thread
 from blockchain.logic.blockchain import Blockchain
+from blockchain.logic.pendingtransactions import PendingTransaction
 from blockchain.logic.dependencymanager import DependencyManager
 from blockchain.modules.block import Block
+from blockchain.modules.blockheader import BlockHeader
 from blockchain.utils.sha3helper import SHA3Helper
 from blockchain.logger.processlogger import ProcessLogger
+from blockchain.logger.metrics import MetricsRegistry
+from blockchain.threads.miningpool import MiningPool
+from blockchain.threads.miningpolicy import MiningPolicy
+from blockchain.utils.miningkernel import MiningKernel
 
 
 class Miner(Thread):
-    def __init__(self):
+    """
+    The miner builds blocks out of the pending transactions and solves the cryptographic
+    puzzle for them. With more than one worker the nonce search is done in parallel by a
+    pool of worker processes instead of the miner thread itself.
+
+    The nonce search runs in slices. Between two slices the block template is rebuilt
+    when the refresh interval has passed, enough transactions arrived, a transaction
+    arrived while the template still had room, or a refresh was requested. The search
+    continues at the reached nonce with the new header prefix. An exhausted nonce space
+    rolls the timestamp of the header instead of giving up the block.
+
+    Before a new block is started the miner sleeps until the mining policy allows it, so an
+    idle node does not mine empty blocks. New transactions and stop_mining() wake it up.
+
+    Attributes:
+        workers (int): Number of processes used for the nonce search. 1 mines in this thread
+            unless pooled is set.
+        pooled (bool): Search with a mining pool even with one worker, so the miners of several
+            chains in one process do not share its GIL.
+        template_refresh_interval (float): Seconds after which the block template is rebuilt.
+        template_refresh_transactions (int): Number of newly arrived transactions after which
+            the block template is rebuilt.
+        policy (MiningPolicy): Decides when a new block is started.
+        blockchain (Blockchain): The blockchain the blocks are mined for, by default the one
+            of the DependencyManager.
+        pending_transactions (PendingTransaction): The mempool the blocks are built from, by
+            default the one of the DependencyManager.
+    """
+    CHECK_INTERVAL = 1024   #* nonces searched between two checks for a canceled block
+    POOL_CHECK_INTERVAL = 256 * 1024    #* nonces per worker searched by the pool between two checks
+    TEMPLATE_REFRESH_INTERVAL = 5.0
+    TEMPLATE_REFRESH_TRANSACTIONS = 500
+    MIN_TEMPLATE_AGE = 0.5      #* seconds a template is kept at least before arriving transactions rebuild it
+    ATTEMPT_BUCKETS = tuple(float(4 ** exponent) for exponent in range(3, 16))
+    INTERVAL_BUCKETS = (1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+    def __init__(self, workers: int = 1, template_refresh_interval: float = TEMPLATE_REFRESH_INTERVAL,
+                 template_refresh_transactions: int = TEMPLATE_REFRESH_TRANSACTIONS, policy: MiningPolicy = None,
+                 blockchain: Blockchain = None, pending_transactions: PendingTransaction = None,
+                 metrics: MetricsRegistry = None):
         super().__init__()
         self.logger = ProcessLogger("Miner")
         self.listeners = []
         self.mining = True
         self.cancel_block = False
+        self.refresh_requested = False
         self.block = None
+        self.workers = workers
+        self.pooled = False
+        self.mining_pool = None
+        self.template_refresh_interval = template_refresh_interval
+        self.template_refresh_transactions = template_refresh_transactions
+        self.template_built = 0.0
+        self.template_added_count = 0
+        self.policy = policy if policy is not None else MiningPolicy()
+        self.last_block_time = time.monotonic()
+        self.blockchain = blockchain
+        self.pending_transactions = pending_transactions
+
+        metrics = metrics if metrics is not None else MetricsRegistry.get_default()
+        self.hashes = metrics.counter("miner_hashes_total", "Number of block header hashes computed.")
+        self.hash_rate = metrics.gauge("miner_hash_rate", "Hashes per second of the last nonce search.")
+        self.attempts_per_block = metrics.histogram("miner_attempts_per_block", "Nonces tried until a block was found.",
+                                                    Miner.ATTEMPT_BUCKETS)
+        self.block_interval = metrics.histogram("miner_block_interval_seconds", "Time between the timestamps of consecutive blocks.",
+                                                Miner.INTERVAL_BUCKETS)
+        self.new_block_duration = metrics.histogram("miner_get_new_block_seconds", "Time spent in get_new_block_for_mining.")
+        self.template_refreshes = metrics.counter("miner_template_refreshes_total", "Number of block templates rebuilt during a nonce search.")
+        self.idle_seconds = metrics.counter("miner_idle_seconds_total", "Time the miner slept waiting for transactions.")
 
     def run(self):
         self.logger.log_info("Miner started!")
 
-        while self.is_mining():
-            self.block = self.get_new_block_for_mining()
+        try:
+            while self.wait_for_work():
+                self.update_mining_pool()
+                start = time.perf_counter()
+                self.block = self.get_new_block_for_mining()
+                self.new_block_duration.observe(time.perf_counter() - start)
+
+                found = self.mine_block()
+
+                if self.cancel_block or not found:
+                    self.block = None
+                    self.cancel_block = False
+                    if self.mining_pool is not None:
+                        self.mining_pool.reset_cancel()
+                elif not self.block_mined(self.block):
+                    self.block = None
+        finally:
+            if self.mining_pool is not None:
+                self.mining_pool.close()
+                self.mining_pool = None
+
+    def get_blockchain(self) -> Blockchain:
+        return self.blockchain if self.blockchain is not None else DependencyManager.get_blockchain()
 
-            while not self.cancel_block and self.does_not_fulfill_difficulty(self.block.get_block_hash()):
-                try:
-                    self.block.increment_nonce()
-                except ArithmeticError as e:
-                    self.logger.log_info(f"Restarting mining. {e}")
-                    self.restart_mining()
+    def get_pending_transactions(self) -> PendingTransaction:
+        return self.pending_transactions if self.pending_transactions is not None else DependencyManager.get_pending_transactions()
 
-            if self.cancel_block:
-                self.block = None
-                self.cancel_block = False
+    def set_workers(self, workers: int, pooled: bool = None) -> None:
+        """
+        Change the number of processes used for the nonce search and, if given, whether a
+        single worker searches in a mining pool. It takes effect when the next block is started.
+        """
+        if workers < 1:
+            raise ValueError("The miner needs at least one worker!")
+        self.workers = workers
+        if pooled is not None:
+            self.pooled = pooled
+
+    def update_mining_pool(self) -> None:
+        """
+        Start, resize or stop the mining pool to match the number of workers.
+        """
+        wanted_workers = self.workers if self.workers > 1 or self.pooled else 0
+        pool_workers = self.mining_pool.workers if self.mining_pool is not None else 0
+        if pool_workers == wanted_workers:
+            return
+
+        if self.mining_pool is not None:
+            self.mining_pool.close()
+            self.mining_pool = None
+        if wanted_workers > 0:
+            self.mining_pool = MiningPool(wanted_workers)
+
+    def mine_block(self) -> bool:
+        """
+        Search the nonce for the current block, in this thread or with the mining pool.
+        Returns False if the search was canceled or mining was stopped.
+        """
+        start = self.block.block_header.nonce
+        attempts = 0
+        search_start = time.perf_counter()
+        kernel = None
+
+        while not self.cancel_block and self.is_mining():
+            if self.is_template_stale():
+                self.refresh_block_template(start)
+                kernel = None
+
+            block_header = self.block.block_header
+            if start > BlockHeader.MAX_NONCE:
+                block_header.roll_timestamp(int(time.time() * 1000))
+                start = block_header.nonce
+                kernel = None
+                self.logger.log_info("Nonce space exhausted, rolled the timestamp.")
+
+            if self.mining_pool is None:
+                if kernel is None:
+                    kernel = MiningKernel(block_header, block_header.get_target())
+                stop = min(start + self.CHECK_INTERVAL, BlockHeader.MAX_NONCE + 1)
+                nonce = kernel.search(start, stop)
             else:
-                self.block_mined(self.block)
-            
-        
+                stop = min(start + self.workers * self.POOL_CHECK_INTERVAL, BlockHeader.MAX_NONCE + 1)
+                block_header.nonce = start
+                nonce = self.mining_pool.search(block_header, block_header.get_target(), stop)
+
+            if nonce is not None:
+                block_header.nonce = nonce
+                #* the pool workers search interleaved slices, so about every nonce up to the found one was tried
+                self.record_search(attempts + nonce - start + 1, time.perf_counter() - search_start, True)
+                return self.mining_pool is None or block_header.fulfills_target()
+
+            attempts += stop - start
+            start = stop
+
+        self.record_search(attempts, time.perf_counter() - search_start, False)
+        return False
+
+    def wait_for_work(self) -> bool:
+        """
+        Sleep until the policy allows the next block, i.e. enough transactions are pending or
+        the maximum block interval expired. Returns False if mining was stopped.
+        """
+        pending_transactions = self.get_pending_transactions()
+        idle_start = time.monotonic()
+
+        while True:
+            #* read before the check, a stop_mining() right after it still ends the wait
+            wake_ups = pending_transactions.get_wake_ups()
+            if not self.is_mining():
+                break
+
+            since_last_block = time.monotonic() - self.last_block_time
+            required = self.policy.get_required_transactions(since_last_block)
+            if pending_transactions.get_pending_transaction_len() >= required:
+                break
+
+            #* once the interval expired only an arriving transaction can start the block
+            timeout = self.policy.max_block_interval - since_last_block
+            pending_transactions.wait_for_transactions(required, timeout if timeout > 0 else None, wake_ups)
+
+        idle = time.monotonic() - idle_start
+        if idle > 0:
+            self.idle_seconds.inc(idle)
+        return self.is_mining()
+
+    def is_template_stale(self) -> bool:
+        """
+        Check if the block template should be rebuilt: a refresh was requested, the refresh
+        interval has passed or transactions arrived that may belong into the block. Arriving
+        transactions only rebuild templates older than MIN_TEMPLATE_AGE, so a steady stream
+        of transactions does not rebuild the template between every slice.
+        """
+        age = time.monotonic() - self.template_built
+        if self.refresh_requested or age >= self.template_refresh_interval:
+            return True
+        if age < self.MIN_TEMPLATE_AGE:
+            return False
+
+        arrived = self.get_pending_transactions().get_added_count() - self.template_added_count
+        if arrived >= self.template_refresh_transactions:
+            return True
+
+        #* a template that did not fill the block takes every new transaction
+        return arrived > 0 and len(self.block.transactions) < self.get_pending_transactions().max_block_transactions
+
+    def refresh_block_template(self, nonce: int) -> None:
+        """
+        Rebuild the block template from the current pending transactions and continue the
+        nonce search at the given nonce.
+        """
+        self.refresh_requested = False
+        self.block = self.get_new_block_for_mining()
+        self.block.block_header.nonce = min(nonce, BlockHeader.MAX_NONCE + 1)
+        self.template_refreshes.inc()
+        self.logger.log_debug("Refreshed the block template with %d transaction(s).", len(self.block.transactions))
+
+    def record_search(self, attempts: int, seconds: float, found: bool) -> None:
+        """
+        Update the hash metrics after a nonce search.
+        """
+        self.hashes.inc(attempts)
+        if seconds > 0:
+            self.hash_rate.set(attempts / seconds)
+        if found:
+            self.attempts_per_block.observe(attempts)
 
     def get_new_block_for_mining(self):
-        pending_transactions = DependencyManager.get_pending_transactions()
-        blockchain = DependencyManager.get_blockchain()
+        pending_transactions = self.get_pending_transactions()
+        blockchain = self.get_blockchain()
+        #* read before the transactions are selected, so no arrival between both is missed
+        self.template_added_count = pending_transactions.get_added_count()
+        self.template_built = time.monotonic()
         transactions = pending_transactions.get_transactions_for_the_next_block()
 
-        return Block(transactions, blockchain.get_previous_hash())
+        return Block(transactions, blockchain.get_previous_hash(), blockchain.get_next_bits())
 
     def does_not_fulfill_difficulty(self, digest):
-        blockchain = DependencyManager.get_blockchain()
+        blockchain = self.get_blockchain()
         
         return not blockchain.fulfills_difficulty(digest)
 
     def restart_mining(self):
-        pending_transactions = DependencyManager.get_pending_transactions()
-        transactions = pending_transactions.get_transactions_for_the_next_block()
+        """
+        Request a rebuild of the block template. The nonce search picks it up between two
+        slices and continues with the new template.
+        """
+        self.refresh_requested = True
+
+    def notify_new_tip(self) -> None:
+        """
+        A block of another source, e.g. a peer, extended the chain. The block template is
+        rebuilt on top of it and the block interval of the policy starts again.
+        """
+        self.last_block_time = time.monotonic()
+        self.restart_mining()
 
-        self.block.transactions(transactions)
+    def block_mined(self, block: Block) -> bool:
+        """
+        Add a mined block to the chain and notify the listeners. Returns False if the block
+        was dropped because another block, e.g. one received from a peer, extended the
+        chain in the meantime.
+        """
+        blockchain = self.get_blockchain()
+        if not blockchain.add_block(block):
+            self.logger.log_info("Dropping mined block, the chain has a new tip.")
+            return False
 
-    def block_mined(self, block: Block):
+        #* the genesis block has a fixed timestamp, so the first interval is not measured
+        previous_hash = bytes(block.block_header.previous_hash)
+        if previous_hash != blockchain[0].get_block_hash():
+            previous_block = blockchain.get_block(previous_hash)
+            self.block_interval.observe(max(block.block_header.timestamp - previous_block.block_header.timestamp, 0) / 1000)
 
         if block.transactions:
             for transaction in block.transactions:
-                transaction[1].block_id = block.get_block_hash()
-                self.logger.log_info(
-                    f"{transaction[1].get_tx_id_as_string()}; {SHA3Helper.digest_to_hex(transaction[1].block_id)}"
+                transaction.block_id = block.get_block_hash()
+                self.logger.log_sampled(
+                    "%s; %s", transaction.get_tx_id_as_string(), SHA3Helper.digest_to_hex(transaction.block_id)
                 )
 
-        DependencyManager.get_blockchain().add_block(block)
-        #DependencyManager.get_pending_transactions().clear_pending_transactions(block) #TODO: Look if really obsolete because priortyQueue.get() already deletes itemes from queue
+        self.last_block_time = time.monotonic()
+        self.get_pending_transactions().clear_pending_transactions(block)
         self.logger.log_info("Block mined!")
         
         for listener in self.listeners:
             listener.notify_new_block(block)
+        return True
 
     def is_mining(self):
         return self.mining
@@ -100,6 +345,7 @@ class Miner(Thread):
     def stop_mining(self):
         self.logger.log_info("Stopping mining.")
         self.mining = False
+        self.get_pending_transactions().wake_up()
 
     def set_cancel_block(self, cancel_block: bool):
         self.logger.log_info("Canceling block.")
@@ -107,6 +353,8 @@ class Miner(Thread):
 
     def set_cancel_block(self):
         self.cancel_block = True
+        if self.mining_pool is not None:
+            self.mining_pool.cancel()
         
     def register_listener(self, listener):
         self.listeners.append(listener)
@@ -0,0 +1,58 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+class MiningPolicy:
+    """
+    MiningPolicy decides when the miner starts a new block. The miner sleeps until enough
+    transactions are pending or the maximum block interval since the last block expired.
+    After the interval every pending transaction is mined; without pending transactions an
+    empty heartbeat block is only mined if heartbeat blocks are enabled, otherwise the miner
+    keeps sleeping until the next transaction arrives.
+
+    Attributes:
+        min_transactions (int): Number of pending transactions that starts a block right away.
+        max_block_interval (float): Seconds after the last block after which a block is started
+            with fewer pending transactions, or as heartbeat block.
+        heartbeat_blocks (bool): Mine empty blocks when the maximum block interval expired
+            without pending transactions, e.g. to show the node is alive.
+    """
+    MIN_TRANSACTIONS = 1
+    MAX_BLOCK_INTERVAL = 60.0
+
+    def __init__(self, min_transactions: int = MIN_TRANSACTIONS, max_block_interval: float = MAX_BLOCK_INTERVAL,
+                 heartbeat_blocks: bool = False) -> None:
+        if min_transactions < 1:
+            raise ValueError("A block needs at least one transaction to be started early!")
+        if max_block_interval < 0:
+            raise ValueError("The maximum block interval can not be negative!")
+
+        self.min_transactions = min_transactions
+        self.max_block_interval = max_block_interval
+        self.heartbeat_blocks = heartbeat_blocks
+
+    def get_required_transactions(self, seconds_since_last_block: float) -> int:
+        """
+        Get the number of pending transactions needed to start a block at the given time
+        since the last block. 0 starts an empty heartbeat block.
+        """
+        if seconds_since_last_block < self.max_block_interval:
+            return self.min_transactions
+        return 0 if self.heartbeat_blocks else 1
@@ -0,0 +1,151 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import queue
+import threading
+import multiprocessing
+
+from blockchain.modules.blockheader import BlockHeader
+from blockchain.utils.miningkernel import MiningKernel
+from blockchain.logger.processlogger import ProcessLogger
+
+
+_stop_event = None  #* set in every worker process by _init_worker()
+
+
+def _init_worker(stop_event) -> None:
+    global _stop_event
+    _stop_event = stop_event
+
+
+def _search_nonce_range(block_header: BlockHeader, start: int, stop: int, stride: int, difficulty: int, check_interval: int):
+    """
+    Search the nonces start, start + stride, start + 2 * stride, ... below stop of the block
+    header until one fulfills the difficulty or another worker has set the stop event. Runs
+    inside a worker process.
+    """
+    kernel = MiningKernel(block_header, difficulty)
+    chunk = check_interval * stride
+
+    for chunk_start in range(start, stop, chunk):
+        if _stop_event.is_set():
+            return None
+
+        nonce = kernel.search(chunk_start, min(chunk_start + chunk, stop), stride)
+        if nonce is not None:
+            return nonce
+
+    return None
+
+
+class MiningPool:
+    """
+    MiningPool spreads the nonce search of a block header over a pool of worker processes.
+    Every worker gets an interleaved slice of the nonce space; the first worker that finds
+    a nonce fulfilling the difficulty sets a shared stop event which cancels the others.
+    A cancel() also stops a search that has not started yet, so a cancel issued while the
+    next block is assembled is not lost. Exceptions raised in a worker are logged and count
+    as no nonce found by that worker.
+
+    Attributes:
+        workers (int): Number of worker processes.
+        check_interval (int): Number of attempts between two checks of the stop event.
+    """
+    CHECK_INTERVAL = 1024
+
+    def __init__(self, workers: int, check_interval: int = CHECK_INTERVAL) -> None:
+        if workers < 1:
+            raise ValueError("The mining pool needs at least one worker!")
+
+        self.workers = workers
+        self.check_interval = check_interval
+        self.logger = ProcessLogger("MiningPool")
+        self.__stop_event = multiprocessing.Event()
+        self.__cancel_lock = threading.Lock()
+        self.__canceled = False
+        self.__pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(self.__stop_event,))
+
+    def search(self, block_header: BlockHeader, difficulty: int, stop: int = BlockHeader.MAX_NONCE + 1):
+        """
+        Search a nonce from the current nonce of the block header up to, but not including,
+        stop which fulfills the difficulty. Returns the nonce or None if the search was
+        canceled or no nonce in the range fulfills the difficulty.
+        """
+        with self.__cancel_lock:
+            if self.__canceled:
+                self.__canceled = False
+                self.__stop_event.clear()
+                return None
+
+        results = queue.SimpleQueue()
+        start = block_header.nonce
+        stop = min(stop, BlockHeader.MAX_NONCE + 1)
+
+        for worker_id in range(self.workers):
+            self.__pool.apply_async(
+                _search_nonce_range,
+                (block_header, start + worker_id, stop, self.workers, difficulty, self.check_interval),
+                callback=results.put,
+                error_callback=lambda error: self.__worker_failed(error, results)
+            )
+
+        nonce = None
+        for _ in range(self.workers):
+            result = results.get()
+            if result is not None and nonce is None:
+                nonce = result
+                self.__stop_event.set()
+
+        #* a cancel issued during the search is consumed by it
+        with self.__cancel_lock:
+            self.__canceled = False
+            self.__stop_event.clear()
+
+        return nonce
+
+    def __worker_failed(self, error: BaseException, results: queue.SimpleQueue) -> None:
+        self.logger.log_error("Nonce search worker failed: %r", error, exc_info=error)
+        results.put(None)
+
+    def cancel(self) -> None:
+        """
+        Cancel the running search, or the next one if no search is running. All workers
+        return at their next stop event check.
+        """
+        with self.__cancel_lock:
+            self.__canceled = True
+            self.__stop_event.set()
+
+    def reset_cancel(self) -> None:
+        """
+        Drop a cancel that no search has consumed yet.
+        """
+        with self.__cancel_lock:
+            self.__canceled = False
+            self.__stop_event.clear()
+
+    def close(self) -> None:
+        """
+        Stop all worker processes.
+        """
+        self.__stop_event.set()
+        self.__pool.terminate()
+        self.__pool.join()
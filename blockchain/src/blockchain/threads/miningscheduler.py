@@ -0,0 +1,76 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import multiprocessing
+
+
+class MiningScheduler:
+    """
+    MiningScheduler shares the cores of the process among the miners of several chains. Every
+    chain gets a number of nonce search workers proportional to its mining priority, at least
+    one. The cores left after rounding down go to the chains with the largest remainders, so
+    the workers add up to the number of cores as long as there are not more chains than cores.
+    A single miner with one worker searches in its own thread. Otherwise every miner uses a
+    mining pool, so the nonce searches of several chains do not share the GIL of the process.
+
+    Attributes:
+        cores (int): Number of cores shared by the miners.
+    """
+    def __init__(self, cores: int = None) -> None:
+        self.cores = cores if cores is not None else multiprocessing.cpu_count()
+
+        if self.cores < 1:
+            raise ValueError("The mining scheduler needs at least one core!")
+
+    def allocate(self, priorities: dict) -> dict:
+        """
+        Get the number of workers for every network_id of the given {network_id: priority}.
+        """
+        total = sum(priorities.values())
+        if not priorities or total <= 0:
+            return dict()
+
+        shares = {network_id: self.cores * priority / total for network_id, priority in priorities.items()}
+        workers = {network_id: max(1, int(share)) for network_id, share in shares.items()}
+
+        #* ties are broken by the higher priority, then by the lower network_id
+        remaining = self.cores - sum(workers.values())
+        by_remainder = sorted(shares, key=lambda network_id: (int(shares[network_id]) - shares[network_id],
+                                                              -priorities[network_id], network_id))
+        for network_id in by_remainder[:max(remaining, 0)]:
+            workers[network_id] += 1
+
+        return workers
+
+    def rebalance(self, registry) -> dict:
+        """
+        Assign the workers to the miners of all chains of the registry. Running miners
+        apply the change when they start their next block.
+        """
+        workers = self.allocate(registry.get_priorities())
+        pooled = len(workers) > 1
+
+        for network_id, count in workers.items():
+            miner = registry.get_miner(network_id)
+            if miner is not None:
+                miner.set_workers(count, pooled)
+
+        return workers
@@ -0,0 +1,155 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import struct
+
+
+U8 = struct.Struct(">B")
+U32 = struct.Struct(">I")
+U64 = struct.Struct(">Q")
+I64 = struct.Struct(">q")
+F64 = struct.Struct(">d")
+
+#* type tags of the values written by BinaryWriter.write_value()
+TAG_NONE = 0
+TAG_BYTES = 1
+TAG_STRING = 2
+
+
+class BinaryWriter:
+    """
+    BinaryWriter builds the compact binary encoding used for storing, sending and hashing
+    blocks and transactions. All integers are big-endian with a fixed width, byte strings
+    are prefixed with their length, so the same object always gives the same bytes.
+    """
+    def __init__(self) -> None:
+        self.__buffer = bytearray()
+
+    def write_u8(self, value: int) -> "BinaryWriter":
+        self.__buffer += U8.pack(value)
+        return self
+
+    def write_u32(self, value: int) -> "BinaryWriter":
+        self.__buffer += U32.pack(value)
+        return self
+
+    def write_u64(self, value: int) -> "BinaryWriter":
+        self.__buffer += U64.pack(value)
+        return self
+
+    def write_i64(self, value: int) -> "BinaryWriter":
+        self.__buffer += I64.pack(value)
+        return self
+
+    def write_f64(self, value: float) -> "BinaryWriter":
+        self.__buffer += F64.pack(value)
+        return self
+
+    def write_raw(self, value: bytes) -> "BinaryWriter":
+        """
+        Write bytes of a fixed, known length without length prefix.
+        """
+        self.__buffer += value
+        return self
+
+    def write_bytes(self, value: bytes) -> "BinaryWriter":
+        self.__buffer += U32.pack(len(value))
+        self.__buffer += value
+        return self
+
+    def write_value(self, value) -> "BinaryWriter":
+        """
+        Write None, bytes or a string together with a type tag.
+        """
+        if value is None:
+            return self.write_u8(TAG_NONE)
+        if isinstance(value, str):
+            return self.write_u8(TAG_STRING).write_bytes(value.encode('utf-8'))
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return self.write_u8(TAG_BYTES).write_bytes(value)
+
+        raise TypeError(f"Values of type {type(value).__name__} can not be encoded!")
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.__buffer)
+
+
+class BinaryReader:
+    """
+    BinaryReader decodes the binary encoding written by BinaryWriter. It works on a
+    memoryview of the data, so nested records are sliced instead of copied. Reading past
+    the end of the data raises a ValueError.
+    """
+    def __init__(self, data) -> None:
+        self.__data = memoryview(data)
+        self.__offset = 0
+
+    def __unpack(self, layout: struct.Struct):
+        if self.__offset + layout.size > len(self.__data):
+            raise ValueError("Unexpected end of the encoded data!")
+
+        value = layout.unpack_from(self.__data, self.__offset)[0]
+        self.__offset += layout.size
+        return value
+
+    def read_u8(self) -> int:
+        return self.__unpack(U8)
+
+    def read_u32(self) -> int:
+        return self.__unpack(U32)
+
+    def read_u64(self) -> int:
+        return self.__unpack(U64)
+
+    def read_i64(self) -> int:
+        return self.__unpack(I64)
+
+    def read_f64(self) -> float:
+        return self.__unpack(F64)
+
+    def read_raw(self, length: int) -> memoryview:
+        """
+        Read bytes of a fixed, known length. Returns a slice of the underlying data.
+        """
+        if self.__offset + length > len(self.__data):
+            raise ValueError("Unexpected end of the encoded data!")
+
+        value = self.__data[self.__offset:self.__offset + length]
+        self.__offset += length
+        return value
+
+    def read_bytes(self) -> memoryview:
+        return self.read_raw(self.read_u32())
+
+    def read_value(self):
+        tag = self.read_u8()
+
+        if tag == TAG_NONE:
+            return None
+        if tag == TAG_STRING:
+            return str(self.read_bytes(), 'utf-8')
+        if tag == TAG_BYTES:
+            return bytes(self.read_bytes())
+
+        raise ValueError(f"Unknown value tag {tag}!")
+
+    def at_end(self) -> bool:
+        return self.__offset == len(self.__data)
@@ -0,0 +1,64 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+class CompactTarget:
+    """
+    CompactTarget converts a target, i.e. the highest block hash accepted, to the compact
+    32 bit form stored in the block header and back. The highest byte is the length of the
+    target in bytes, the lower three bytes are its most significant bytes (the mantissa).
+    The highest bit of the mantissa is kept clear. Converting a target to the compact form
+    rounds it down to its three most significant bytes, so targets are always compared
+    after decoding them.
+    """
+    MANTISSA_MASK = 0x007fffff
+
+    @staticmethod
+    def encode(target: int) -> int:
+        """
+        Get the compact form of a target.
+        """
+        if target < 0:
+            raise ValueError("The target can not be negative!")
+
+        size = (target.bit_length() + 7) // 8
+        if size <= 3:
+            mantissa = target << (8 * (3 - size))
+        else:
+            mantissa = target >> (8 * (size - 3))
+
+        #* a set highest bit would be read as sign, so the mantissa moves one byte down
+        if mantissa & 0x00800000:
+            mantissa >>= 8
+            size += 1
+
+        return (size << 24) | mantissa
+
+    @staticmethod
+    def decode(bits: int) -> int:
+        """
+        Get the target of a compact form.
+        """
+        size = bits >> 24
+        mantissa = bits & CompactTarget.MANTISSA_MASK
+
+        if size <= 3:
+            return mantissa >> (8 * (3 - size))
+        return mantissa << (8 * (size - 3))
@@ -0,0 +1,106 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    LRUCache is a size-bounded cache that evicts the least recently used entry when it is
+    full. On a miss the value is requested from the loader (e.g. the transaction index and
+    the chain) and cached if it is found. Hits, misses and evictions are counted, so the
+    cache size can be chosen against the lookup latency. The cache is thread safe.
+
+    Attributes:
+        max_size (int): Maximum number of cached entries.
+        hits (int): Number of lookups answered by the cache.
+        misses (int): Number of lookups not answered by the cache.
+        evictions (int): Number of entries dropped because the cache was full.
+    """
+    def __init__(self, max_size: int, loader=None) -> None:
+        if max_size <= 0:
+            raise ValueError("The cache size has to be positive!")
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.__loader = loader
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self.__entries
+
+    def get(self, key, default=None):
+        """
+        Get the value for the key. A miss falls back to the loader, if there is one.
+        """
+        with self.__lock:
+            value = self.__entries.get(key)
+            if value is not None:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        if self.__loader is None:
+            return default
+
+        value = self.__loader(key)
+        if value is None:
+            return default
+
+        self.put(key, value)
+        return value
+
+    def put(self, key, value) -> None:
+        """
+        Add or update an entry and evict the least recently used entries beyond the maximum size.
+        """
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def keys(self) -> list:
+        """
+        Get the cached keys, least recently used first.
+        """
+        with self.__lock:
+            return list(self.__entries)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+
+    def get_stats(self) -> dict:
+        return dict(size=len(self.__entries), max_size=self.max_size,
+                    hits=self.hits, misses=self.misses, evictions=self.evictions)
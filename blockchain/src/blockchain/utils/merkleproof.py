@@ -0,0 +1,95 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+from blockchain.modules.blockheader import BlockHeader
+from blockchain.modules.transaction import Transaction
+from blockchain.utils.binarycodec import BinaryWriter, BinaryReader
+from blockchain.utils.merkletree import MerkleTree
+from blockchain.utils.sha3helper import SHA3Helper
+
+
+class MerkleProof:
+    """
+    MerkleProof proves that a transaction is part of a block. It carries the serialized
+    transaction and the sibling hashes on the path of its tx_id to the merkle root, so it
+    can be checked against the block header alone. Size and verification cost grow with
+    the logarithm of the number of transactions in the block.
+
+    Attributes:
+        transaction (bytes): The binary encoding of the transaction, it holds the prov_hash.
+        path (list): Tuples (sibling, sibling_is_left) from the leaf up to the root.
+    """
+    FORMAT_VERSION = 1
+    HASH_SIZE = 32
+
+    def __init__(self, transaction: bytes, path: list) -> None:
+        self.transaction = bytes(transaction)
+        self.path = path
+
+    def get_transaction(self) -> Transaction:
+        return Transaction.from_bytes(self.transaction)
+
+    def get_tx_id(self) -> bytes:
+        return SHA3Helper.hash_bytes(self.transaction)
+
+    def compute_root(self) -> bytes:
+        """
+        Hash the tx_id up along the path to the merkle root.
+        """
+        node = MerkleTree.hash_leaf(self.get_tx_id())
+
+        for sibling, sibling_is_left in self.path:
+            node = MerkleTree.hash_node(sibling, node) if sibling_is_left else MerkleTree.hash_node(node, sibling)
+
+        return node
+
+    def verify(self, block_header: BlockHeader) -> bool:
+        """
+        Check that the transaction is anchored in the block with the given header.
+        """
+        return self.compute_root() == block_header.transaction_list_hash
+
+    def to_bytes(self) -> bytes:
+        writer = (BinaryWriter()
+                  .write_u8(MerkleProof.FORMAT_VERSION)
+                  .write_bytes(self.transaction)
+                  .write_u8(len(self.path)))
+
+        for sibling, sibling_is_left in self.path:
+            writer.write_u8(int(sibling_is_left)).write_raw(sibling)
+
+        return writer.to_bytes()
+
+    @staticmethod
+    def from_bytes(data) -> "MerkleProof":
+        reader = BinaryReader(data)
+
+        version = reader.read_u8()
+        if version != MerkleProof.FORMAT_VERSION:
+            raise ValueError(f"Unsupported merkle proof format version {version}!")
+
+        transaction = reader.read_bytes()
+        path = list()
+        for _ in range(reader.read_u8()):
+            sibling_is_left = bool(reader.read_u8())
+            path.append((bytes(reader.read_raw(MerkleProof.HASH_SIZE)), sibling_is_left))
+
+        return MerkleProof(transaction, path)
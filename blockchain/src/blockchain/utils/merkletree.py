@@ -0,0 +1,110 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import hashlib
+
+
+class MerkleTree:
+    """
+    MerkleTree builds the merkle root over the tx_ids of a block. All levels of the tree are
+    cached, so appending a leaf only rehashes the path from the new leaf to the root, which
+    is O(log n). Leaves and inner nodes are hashed with different prefixes, so a leaf can
+    not be passed off as an inner node. A node without a right sibling is moved up to the
+    next level unchanged.
+
+    Attributes:
+        __levels (list): The hashes of each level, from the leaves up to the root.
+    """
+    LEAF_PREFIX = b"\x00"
+    NODE_PREFIX = b"\x01"
+    EMPTY_ROOT = hashlib.sha256(b"").digest()
+
+    def __init__(self, leaves=()) -> None:
+        self.__levels = [list()]
+        for leaf in leaves:
+            self.append(leaf)
+
+    def __len__(self) -> int:
+        return len(self.__levels[0])
+
+    @staticmethod
+    def hash_leaf(data: bytes) -> bytes:
+        return hashlib.sha256(MerkleTree.LEAF_PREFIX + data).digest()
+
+    @staticmethod
+    def hash_node(left: bytes, right: bytes) -> bytes:
+        return hashlib.sha256(MerkleTree.NODE_PREFIX + left + right).digest()
+
+    def append(self, data: bytes) -> None:
+        """
+        Append a leaf and update the hashes on its path to the root.
+        """
+        self.__levels[0].append(MerkleTree.hash_leaf(data))
+        index = len(self.__levels[0]) - 1
+        level = 0
+
+        while len(self.__levels[level]) > 1:
+            nodes = self.__levels[level]
+            parent_index = index // 2
+            left = 2 * parent_index
+
+            if left + 1 < len(nodes):
+                parent = MerkleTree.hash_node(nodes[left], nodes[left + 1])
+            else:
+                parent = nodes[left]
+
+            if level + 1 == len(self.__levels):
+                self.__levels.append(list())
+            parents = self.__levels[level + 1]
+
+            if parent_index < len(parents):
+                parents[parent_index] = parent
+            else:
+                parents.append(parent)
+
+            index = parent_index
+            level += 1
+
+    def get_proof(self, index: int) -> list:
+        """
+        Get the sibling hashes on the path from the leaf at index to the root. Every entry
+        is a tuple (sibling, sibling_is_left); levels where the node has no sibling are left out.
+        """
+        if not 0 <= index < len(self):
+            raise IndexError("The leaf index is out of range!")
+
+        path = list()
+        for nodes in self.__levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(nodes):
+                path.append((nodes[sibling], sibling < index))
+            index //= 2
+
+        return path
+
+    def get_root(self) -> bytes:
+        """
+        Get the merkle root, the hash of an empty input for a tree without leaves.
+        """
+        if not self.__levels[0]:
+            return MerkleTree.EMPTY_ROOT
+
+        return self.__levels[-1][0]
@@ -0,0 +1,71 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import hashlib
+
+from blockchain.modules.blockheader import BlockHeader
+
+
+class MiningKernel:
+    """
+    MiningKernel hashes nonce candidates of one block header. The constant prefix of the
+    header is hashed once, every attempt only copies this midstate and appends the packed
+    nonce. The digest is compared with the difficulty as 32 big-endian bytes, which gives
+    the same result as Blockchain.fulfills_difficulty() without converting to an integer.
+
+    Attributes:
+        block_header (BlockHeader): The header whose nonce is searched.
+        difficulty (int): The highest hash value accepted by the blockchain.
+    """
+    def __init__(self, block_header: BlockHeader, difficulty: int) -> None:
+        self.__midstate = hashlib.sha256(block_header.get_prefix_bytes())
+        self.__target = min(difficulty, 2 ** 256 - 1).to_bytes(32, byteorder='big')
+
+    def digest(self, nonce: int) -> bytes:
+        """
+        Get the header hash for the given nonce.
+        """
+        hash_obj = self.__midstate.copy()
+        hash_obj.update(BlockHeader.NONCE_LAYOUT.pack(nonce))
+        return hash_obj.digest()
+
+    def fulfills_difficulty(self, nonce: int) -> bool:
+        """
+        Check if the header hash for the given nonce fulfills the difficulty.
+        """
+        return self.digest(nonce) <= self.__target
+
+    def search(self, start: int, stop: int, stride: int = 1):
+        """
+        Search the nonces in range(start, stop, stride). Returns the first nonce fulfilling
+        the difficulty or None.
+        """
+        midstate = self.__midstate
+        target = self.__target
+        pack = BlockHeader.NONCE_LAYOUT.pack
+
+        for nonce in range(start, stop, stride):
+            hash_obj = midstate.copy()
+            hash_obj.update(pack(nonce))
+            if hash_obj.digest() <= target:
+                return nonce
+
+        return None
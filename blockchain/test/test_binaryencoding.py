@@ -0,0 +1,127 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import pickle
+
+import pytest
+
+from blockchain import Block, BlockHeader, GenesisBlock, Transaction
+from blockchain import BinaryReader, BinaryWriter
+
+def create_block():
+    transactions = [
+        Transaction(b"sender", "Receiver", 1.1, i, fee, 0.1, "ab" * 32)
+        for i, fee in enumerate([3, 1.5, 0])
+    ]
+    block = Block(transactions, GenesisBlock.ZERO_HASH_IN)
+    block.block_header.nonce = 4711
+    return block
+
+def test_transaction_round_trip_keeps_tx_id():
+    transaction = Transaction("Alice", b"\x00\x01", 2.5, 7, 42, 0.1, None)
+
+    decoded = Transaction.from_bytes(transaction.to_bytes())
+
+    assert decoded.to_bytes() == transaction.to_bytes()
+    assert decoded.tx_id == transaction.tx_id
+    assert (decoded.sender, decoded.receiver, decoded.prov_hash) == ("Alice", b"\x00\x01", None)
+
+def test_tx_id_does_not_depend_on_block_id():
+    transaction = Transaction(b"sender", b"receiver", 1.0, 1, 1, 0.1, None)
+    tx_id = transaction.get_tx_id_as_string()
+
+    transaction.block_id = b"\x01" * 32
+
+    assert transaction.get_tx_id_as_string() == tx_id
+
+def test_transaction_is_immutable_and_memoized():
+    transaction = Transaction(b"sender", b"receiver", 1.0, 1, 1, 0.1, "prov")
+
+    with pytest.raises(AttributeError):
+        transaction.prov_hash = "other"
+    with pytest.raises(AttributeError):
+        transaction.amount = 2.0
+
+    assert transaction.get_tx_id_as_string() is transaction.get_tx_id_as_string()
+    assert transaction.get_size() == len(transaction.to_bytes())
+    assert transaction == pickle.loads(pickle.dumps(transaction))
+    assert len({transaction, Transaction.from_bytes(transaction.to_bytes())}) == 1
+
+def test_block_round_trip_from_memoryview():
+    block = create_block()
+    data = block.to_bytes()
+
+    decoded = Block.from_bytes(memoryview(data))
+
+    assert decoded.to_bytes() == data
+    assert decoded.get_block_hash() == block.get_block_hash()
+    assert [t.tx_id for t in decoded.transactions] == [t.tx_id for t in block.transactions]
+    assert all(t.block_id == block.get_block_hash() for t in decoded.transactions)
+
+def test_header_encoding_is_the_hashed_layout():
+    block_header = create_block().block_header
+
+    data = block_header.to_bytes()
+
+    assert len(data) == BlockHeader.SIZE
+    assert BlockHeader.from_bytes(data).as_hash() == block_header.as_hash()
+
+def test_encoding_is_smaller_than_pickle():
+    block = create_block()
+
+    assert len(block.to_bytes()) < len(pickle.dumps(block, protocol=pickle.HIGHEST_PROTOCOL))
+
+def test_unknown_version_and_trailing_data_are_rejected():
+    data = create_block().to_bytes()
+
+    with pytest.raises(ValueError):
+        Block.from_bytes(b"\x09" + data[1:])
+    with pytest.raises(ValueError):
+        Block.from_bytes(data + b"\x00")
+
+def test_short_buffers_raise_value_errors():
+    data = BinaryWriter().write_u8(1).write_u32(2).write_u64(3).to_bytes()
+
+    for read, length in ((BinaryReader.read_u8, 0), (BinaryReader.read_u32, 3), (BinaryReader.read_u64, 7),
+                         (BinaryReader.read_i64, 7), (BinaryReader.read_f64, 5)):
+        with pytest.raises(ValueError):
+            read(BinaryReader(data[:length]))
+
+    reader = BinaryReader(data)
+    assert (reader.read_u8(), reader.read_u32(), reader.read_u64()) == (1, 2, 3)
+    with pytest.raises(ValueError):
+        reader.read_u8()
+    with pytest.raises(ValueError):
+        Block.from_bytes(create_block().to_bytes()[:1 + BlockHeader.SIZE + 2])
+
+def test_slotted_objects_pickle_without_instance_dict():
+    block = create_block()
+    transaction = block.transactions[0]
+    transaction.block_id = block.get_block_hash()
+
+    restored = pickle.loads(pickle.dumps(transaction))
+
+    assert not hasattr(transaction, "__dict__")
+    assert not hasattr(block, "__dict__")
+    assert not hasattr(block.block_header, "__dict__")
+    assert restored.tx_id == transaction.tx_id
+    assert restored.block_id == transaction.block_id
+    assert pickle.loads(pickle.dumps(block.block_header)).to_bytes() == block.block_header.to_bytes()
@@ -0,0 +1,68 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import os
+
+from blockchain import Block, Chain
+from blockchain import BlockStore, Persistence
+
+def test_blocks_are_read_back_in_height_order(tmp_path):
+    block_store = BlockStore(str(tmp_path), segment_size=64)
+    payloads = [f"block {i}".encode() * (i + 1) for i in range(20)]
+
+    heights = [block_store.append(payload) for payload in payloads]
+
+    assert heights == list(range(20))
+    assert bytes(block_store.read(7)) == payloads[7]
+    assert [bytes(data) for data in block_store.scan()] == payloads
+    assert len([f for f in os.listdir(tmp_path) if f.endswith(".seg")]) > 1
+
+def test_store_is_reopened_and_recovers_unindexed_records(tmp_path):
+    block_store = BlockStore(str(tmp_path), segment_size=1024)
+    for i in range(5):
+        block_store.append(bytes([i]) * 10)
+    block_store.close()
+
+    #* simulate a crash: the last index entry is lost and a record is only half written
+    with open(os.path.join(tmp_path, BlockStore.INDEX_FILE), 'r+b') as file:
+        file.truncate(4 * BlockStore.INDEX_ENTRY.size + 3)
+    with open(block_store.get_segment_path(0), 'ab') as file:
+        file.write(BlockStore.RECORD_HEADER.pack(100) + b"torn")
+
+    reopened = BlockStore(str(tmp_path), segment_size=1024)
+
+    assert len(reopened) == 5
+    assert reopened.append(b"next") == 5
+    assert [bytes(data) for data in reopened.scan(4)] == [bytes([4]) * 10, b"next"]
+
+def test_persistence_appends_only_new_blocks(tmp_path):
+    persistence = Persistence(str(tmp_path / "chains"))
+    chain = Chain(1)
+    chain.add(Block(list(), chain.get_last_block().get_block_hash()))
+    persistence.write_chain(chain)
+    chain.add(Block(list(), chain.get_last_block().get_block_hash()))
+    persistence.write_chain(chain)
+    persistence.close()
+
+    read_chain = Persistence(str(tmp_path / "chains")).read_chain(1)
+
+    assert read_chain.get_size() == 3
+    assert [block.get_block_hash() for block in read_chain.chain] == [block.get_block_hash() for block in chain.chain]
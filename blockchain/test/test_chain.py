@@ -0,0 +1,73 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import pytest
+
+from blockchain import Block, Chain, Transaction
+
+def create_chain(length):
+    chain = Chain(1)
+    for _ in range(length - 1):
+        chain.add(Block(list(), chain.get_last_block().get_block_hash()))
+    return chain
+
+def test_view_shares_blocks_instead_of_copying():
+    chain = create_chain(5)
+
+    view = chain.chain
+
+    assert len(view) == 5
+    assert view[0] is chain.get_block(0)
+    assert view[-1] is chain.get_last_block()
+    assert list(view) == [chain.get_block(i) for i in range(5)]
+
+def test_view_is_a_snapshot_of_the_heights():
+    chain = create_chain(3)
+    view = chain.chain
+
+    chain.add(Block(list(), chain.get_last_block().get_block_hash()))
+
+    assert len(view) == 3
+    assert len(chain.chain) == 4
+
+def test_view_slicing_and_lazy_iteration():
+    chain = create_chain(10)
+
+    assert [block for block in chain.chain[2:8:2]] == [chain.get_block(i) for i in (2, 4, 6)]
+    assert len(chain.chain[7:]) == 3
+    assert list(chain.iter_blocks(8)) == [chain.get_block(8), chain.get_block(9)]
+
+def test_committed_blocks_are_read_only():
+    chain = create_chain(2)
+    block = chain.chain[1]
+    block_hash = block.get_block_hash()
+
+    with pytest.raises(AttributeError):
+        block.block_header.nonce = 5
+    with pytest.raises(AttributeError):
+        block.increment_nonce()
+    with pytest.raises(AttributeError):
+        block.add_transaction(Transaction(b"sender", b"receiver", 1.0, 1, 1.0, 1.0, None))
+    with pytest.raises(AttributeError):
+        block.transactions.append(None)
+
+    assert block.get_block_hash() == block_hash
+    assert chain.chain[0].is_frozen()
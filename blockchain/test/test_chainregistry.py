@@ -0,0 +1,109 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+import time
+
+import pytest
+
+from blockchain import Transaction, ChainRegistry, MiningScheduler, MiningPolicy
+
+def test_cores_are_shared_by_priority():
+    scheduler = MiningScheduler(cores=8)
+
+    assert scheduler.allocate({1: 3, 2: 1}) == {1: 6, 2: 2}
+    assert scheduler.allocate({1: 1, 2: 1, 3: 1}) == {1: 3, 2: 3, 3: 2}
+
+def test_every_chain_gets_a_worker():
+    scheduler = MiningScheduler(cores=2)
+
+    assert scheduler.allocate({1: 10, 2: 1, 3: 1}) == {1: 1, 2: 1, 3: 1}
+
+def test_chains_are_independent():
+    registry = ChainRegistry(MiningScheduler(cores=4))
+    first = registry.create_chain(1)
+    second = registry.create_chain(2, priority=3)
+
+    first.pending_transactions.add_pending_transactions(Transaction(b"sender", b"receiver", 1.0, 1, 1.0, 1.0, None))
+
+    assert registry.get_network_ids() == [1, 2]
+    assert registry.get_blockchain(2).chain.network_id == 2
+    assert registry.get_pending_transactions(2).get_pending_transaction_len() == 0
+    assert registry.get_miner(1).workers == 1
+    assert registry.get_miner(2).workers == 3
+    with pytest.raises(ValueError):
+        registry.create_chain(1)
+
+def test_removing_a_chain_rebalances_the_cores():
+    registry = ChainRegistry(MiningScheduler(cores=4))
+    registry.create_chain(1)
+    registry.create_chain(2)
+
+    registry.remove(2)
+
+    assert 2 not in registry
+    assert registry.get_miner(1).workers == 4
+    with pytest.raises(KeyError):
+        registry.get(2)
+
+def test_single_workers_of_several_chains_are_pooled():
+    registry = ChainRegistry(MiningScheduler(cores=2))
+    registry.create_chain(1)
+    assert not registry.get_miner(1).pooled
+
+    registry.create_chain(2)
+    registry.create_chain(3)
+    assert all(registry.get_miner(n).workers == 1 and registry.get_miner(n).pooled for n in (1, 2, 3))
+
+    registry.remove(2)
+    registry.remove(3)
+    assert not registry.get_miner(1).pooled
+
+def test_chains_report_labeled_metrics():
+    registry = ChainRegistry(MiningScheduler(cores=2))
+    first = registry.create_chain(1)
+    registry.create_chain(2)
+    first.pending_transactions.add_pending_transactions(Transaction(b"sender", b"receiver", 1.0, 1, 1.0, 1.0, None))
+
+    text = registry.to_prometheus()
+
+    assert text.count("# TYPE mempool_depth gauge") == 1
+    assert 'mempool_depth{network_id="1"} 1' in text
+    assert 'mempool_depth{network_id="2"} 0' in text
+
+def test_chains_are_mined_in_one_process():
+    registry = ChainRegistry(MiningScheduler(cores=2))
+    for network_id in (1, 2):
+        context = registry.create_chain(network_id, policy=MiningPolicy(max_block_interval=60.0))
+        context.blockchain.difficulty = 2 ** 252
+        context.pending_transactions.add_pending_transactions(
+            Transaction(b"sender", b"receiver", 1.0, network_id, 1.0, 1.0, None))
+
+    registry.start_mining()
+    try:
+        deadline = time.monotonic() + 10.0
+        while time.monotonic() < deadline and any(len(registry.get_blockchain(n)) < 2 for n in (1, 2)):
+            time.sleep(0.01)
+    finally:
+        registry.stop_mining()
+
+    for network_id in (1, 2):
+        blockchain = registry.get_blockchain(network_id)
+        assert len(blockchain) == 2
+        assert blockchain[1].transactions[0].nonce == network_id
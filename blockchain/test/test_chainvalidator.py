@@ -0,0 +1,165 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+import time
+
+import pytest
+
+from blockchain import Block, BlockHeader, Blockchain, Transaction, Persistence
+from blockchain import ChainValidator, ChainValidationError, DifficultyAdjuster
+
+EASY_DIFFICULTY = 2 ** 255
+
+def mine(block):
+    while not block.block_header.fulfills_target():
+        block.increment_nonce()
+    return block
+
+def build_payloads(count, difficulty_adjuster=None, interval=1000):
+    blockchain = Blockchain(difficulty_adjuster=difficulty_adjuster)
+    blockchain.difficulty = EASY_DIFFICULTY
+    for nonce in range(count):
+        block = Block(list(), blockchain.get_previous_hash(), blockchain.get_next_bits())
+        block.add_transaction(Transaction(b"sender", b"receiver", 1.0, nonce, 1.0, 2.0, None))
+        block.block_header.timestamp = blockchain.get_latest_block().block_header.timestamp + interval
+        blockchain.add_block(mine(block))
+    return [block.to_bytes() for block in blockchain]
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_valid_chain_passes(workers):
+    validator = ChainValidator(EASY_DIFFICULTY, workers=workers, batch_size=3)
+
+    assert validator.find_first_invalid(build_payloads(10)) is None
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_broken_link_reports_height(workers):
+    payloads = build_payloads(10)
+    del payloads[6]
+    validator = ChainValidator(EASY_DIFFICULTY, workers=workers, batch_size=2)
+
+    height, reason = validator.find_first_invalid(payloads)
+    assert height == 6
+    assert "previous hash" in reason
+
+def test_tampered_body_reports_height():
+    payloads = build_payloads(10)
+    block = Block.from_bytes(payloads[4])
+    block.transactions.append(block.transactions[0])
+    payloads[4] = block.to_bytes()
+    validator = ChainValidator(EASY_DIFFICULTY, workers=2, batch_size=3)
+
+    with pytest.raises(ChainValidationError) as error:
+        validator.validate(payloads)
+    assert error.value.height == 4
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_truncated_body_reports_height(workers):
+    payloads = build_payloads(5)
+    payloads[3] = payloads[3][:1 + BlockHeader.SIZE + 2]
+    validator = ChainValidator(EASY_DIFFICULTY, workers=workers, batch_size=2)
+
+    height, reason = validator.find_first_invalid(payloads)
+    assert height == 3
+    assert "can not be decoded" in reason
+
+def test_read_chain_reports_corrupt_stored_body(tmp_path):
+    payloads = build_payloads(4)
+    persistence = Persistence(str(tmp_path / "chains"))
+    block_store = persistence.get_block_store(1)
+    for height, payload in enumerate(payloads):
+        #* a length prefix of a transaction that points behind the end of the block
+        block_store.append(payload[:-1] if height == 2 else payload)
+    block_store.flush()
+
+    with pytest.raises(ChainValidationError) as error:
+        persistence.read_chain(1, verify=True, validator=ChainValidator(EASY_DIFFICULTY, workers=1))
+    assert error.value.height == 2
+
+def test_difficulty_exempts_genesis_block():
+    validator = ChainValidator(0, workers=1)
+
+    assert validator.find_first_invalid(build_payloads(2))[0] == 1
+
+def test_read_chain_verifies(tmp_path):
+    blockchain = Blockchain()
+    blockchain.difficulty = EASY_DIFFICULTY
+    blockchain.add_block(mine(Block(list(), blockchain.get_previous_hash(), blockchain.get_next_bits())))
+    persistence = Persistence(str(tmp_path / "chains"))
+    persistence.write_chain(blockchain.chain)
+
+    chain = persistence.read_chain(blockchain.chain.network_id, verify=True, validator=ChainValidator(EASY_DIFFICULTY, workers=1))
+    assert chain.get_size() == 2
+    with pytest.raises(ValueError):
+        persistence.read_chain(blockchain.chain.network_id, verify=True, validator=ChainValidator(0, workers=1))
+
+def test_target_above_difficulty_is_rejected():
+    validator = ChainValidator(EASY_DIFFICULTY // 2, workers=1)
+
+    height, reason = validator.find_first_invalid(build_payloads(3))
+    assert height == 1
+    assert "above the difficulty" in reason
+
+def test_retargeted_chain_passes():
+    #* the blocks are 4 times slower than the block interval, so the target rises every block
+    difficulty_adjuster = DifficultyAdjuster(target_block_interval=0.25, window=4, initial_target=EASY_DIFFICULTY // 64)
+    payloads = build_payloads(8, difficulty_adjuster)
+    targets = [Block.from_bytes(payload).block_header.get_target() for payload in payloads[1:]]
+
+    assert targets == sorted(targets) and targets[0] < targets[-1]
+    assert ChainValidator(workers=1, difficulty_adjuster=difficulty_adjuster).find_first_invalid(payloads) is None
+
+def test_wrong_retargeted_bits_are_rejected():
+    difficulty_adjuster = DifficultyAdjuster(target_block_interval=0.25, window=4, initial_target=EASY_DIFFICULTY // 64)
+    payloads = build_payloads(6, difficulty_adjuster)
+    block = Block.from_bytes(payloads[5])
+    block.block_header.bits = block.block_header.bits + 1
+    payloads[5] = mine(block).to_bytes()
+
+    height, reason = ChainValidator(workers=1, difficulty_adjuster=difficulty_adjuster).find_first_invalid(payloads)
+    assert height == 5
+    assert "retargeted" in reason
+
+@pytest.mark.parametrize("timestamp", [lambda previous: previous - 2000, lambda previous: int(time.time() * 1000) + 10 ** 6])
+def test_out_of_range_timestamp_is_rejected(timestamp):
+    difficulty_adjuster = DifficultyAdjuster(target_block_interval=0.25, window=4, initial_target=EASY_DIFFICULTY // 64)
+    payloads = build_payloads(6, difficulty_adjuster)
+    block = Block.from_bytes(payloads[5])
+    block.block_header.timestamp = timestamp(Block.from_bytes(payloads[4]).block_header.timestamp)
+    payloads[5] = mine(block).to_bytes()
+
+    height, reason = ChainValidator(workers=1, difficulty_adjuster=difficulty_adjuster).find_first_invalid(payloads)
+    assert height == 5
+    assert "timestamp" in reason
+
+def test_read_chain_verifies_retargeted_chain(tmp_path):
+    difficulty_adjuster = DifficultyAdjuster(target_block_interval=0.25, window=4, initial_target=EASY_DIFFICULTY // 64)
+    blockchain = Blockchain(difficulty_adjuster=difficulty_adjuster)
+    for _ in range(4):
+        block = Block(list(), blockchain.get_previous_hash(), blockchain.get_next_bits())
+        block.block_header.timestamp = blockchain.get_latest_block().block_header.timestamp + 1000
+        blockchain.add_block(mine(block))
+    assert blockchain.get_latest_block().block_header.get_target() > Blockchain.DIFFICULTY
+
+    persistence = Persistence(str(tmp_path / "chains"), difficulty_adjuster=difficulty_adjuster)
+    persistence.write_chain(blockchain.chain)
+
+    assert persistence.read_chain(blockchain.network_id, verify=True).get_size() == 5
+    with pytest.raises(ChainValidationError, match="above the difficulty"):
+        Persistence(str(tmp_path / "chains")).read_chain(blockchain.network_id, verify=True)
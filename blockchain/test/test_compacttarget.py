@@ -0,0 +1,41 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+import pytest
+
+from blockchain import Blockchain, BlockHeader, CompactTarget
+
+@pytest.mark.parametrize("target", [0, 1, 0x7f, 0x80, 0xffff, 0x123456789, 2 ** 255, 2 ** 256 - 1])
+def test_decoded_target_is_rounded_down(target):
+    decoded = CompactTarget.decode(CompactTarget.encode(target))
+
+    assert decoded <= target
+    assert target - decoded < max(1, target >> 15)
+
+def test_encoding_is_stable():
+    bits = CompactTarget.encode(0x123456789)
+
+    assert CompactTarget.encode(CompactTarget.decode(bits)) == bits
+
+def test_mantissa_sign_bit_is_kept_clear():
+    assert CompactTarget.encode(0x80) == 0x02008000
+
+def test_default_bits_encode_default_difficulty():
+    assert BlockHeader.DEFAULT_BITS == CompactTarget.encode(Blockchain.DIFFICULTY)
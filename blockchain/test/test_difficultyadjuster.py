@@ -0,0 +1,95 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+from blockchain import Block, Blockchain, BlockHeader, DifficultyAdjuster, CompactTarget
+
+INITIAL_TARGET = 2 ** 240
+
+def build_headers(count, interval, bits=None):
+    bits = bits if bits is not None else CompactTarget.encode(INITIAL_TARGET)
+    return [BlockHeader(index * interval, bytes(32), bytes(32), bits) for index in range(count)]
+
+def test_first_block_carries_initial_target():
+    difficulty_adjuster = DifficultyAdjuster(initial_target=INITIAL_TARGET)
+
+    assert difficulty_adjuster.get_next_target([]) == INITIAL_TARGET
+
+def test_on_time_blocks_keep_target():
+    difficulty_adjuster = DifficultyAdjuster(target_block_interval=10.0)
+
+    assert difficulty_adjuster.get_next_target(build_headers(10, 10000)) == INITIAL_TARGET
+
+def test_fast_blocks_lower_target():
+    difficulty_adjuster = DifficultyAdjuster(target_block_interval=10.0, damping=1)
+
+    #* blocks twice as fast halve the target
+    assert difficulty_adjuster.get_next_target(build_headers(10, 5000)) == INITIAL_TARGET // 2
+
+def test_slow_blocks_raise_target_damped():
+    difficulty_adjuster = DifficultyAdjuster(target_block_interval=10.0, damping=4)
+
+    #* blocks twice as slow raise the target by a quarter of the deviation
+    assert difficulty_adjuster.get_next_target(build_headers(10, 20000)) == INITIAL_TARGET * 5 // 4
+
+def test_adjustment_is_clamped():
+    difficulty_adjuster = DifficultyAdjuster(target_block_interval=10.0, damping=1, max_adjustment=4)
+
+    assert difficulty_adjuster.get_next_target(build_headers(10, 0)) == INITIAL_TARGET // 4
+    assert difficulty_adjuster.get_next_target(build_headers(10, 10 ** 6)) == INITIAL_TARGET * 4
+
+def test_target_is_capped():
+    difficulty_adjuster = DifficultyAdjuster(target_block_interval=1.0, damping=1, max_target=INITIAL_TARGET)
+
+    assert difficulty_adjuster.get_next_target(build_headers(5, 4000)) == INITIAL_TARGET
+
+def test_only_window_is_used():
+    difficulty_adjuster = DifficultyAdjuster(target_block_interval=10.0, window=4)
+    headers = build_headers(10, 10000)
+    for header in headers[:5]:
+        header.timestamp = 0
+
+    assert difficulty_adjuster.get_next_target(headers) == INITIAL_TARGET
+
+def test_blockchain_retargets_next_block():
+    blockchain = Blockchain(difficulty_adjuster=DifficultyAdjuster(target_block_interval=10.0, damping=1,
+                                                                   initial_target=INITIAL_TARGET))
+    assert blockchain.difficulty == INITIAL_TARGET
+
+    genesis_timestamp = blockchain.get_latest_block().block_header.timestamp
+    for height in range(1, 4):
+        block = Block(list(), blockchain.get_previous_hash(), blockchain.get_next_bits())
+        #* the genesis timestamp is not part of the window
+        block.block_header.timestamp = genesis_timestamp + 10 ** 9 + height * 5000
+        blockchain.add_block(block)
+
+    assert blockchain.get_latest_block().block_header.get_target() == INITIAL_TARGET // 2
+    assert blockchain.difficulty == INITIAL_TARGET // 4
+
+def test_timestamp_before_median_or_in_future_is_invalid():
+    difficulty_adjuster = DifficultyAdjuster()
+    headers = build_headers(20, 1000)
+    now = headers[-1].timestamp
+
+    #* the median of the latest 11 headers is the timestamp of header 14
+    assert difficulty_adjuster.is_valid_timestamp(headers, BlockHeader(14000, bytes(32), bytes(32)), now)
+    assert not difficulty_adjuster.is_valid_timestamp(headers, BlockHeader(13999, bytes(32), bytes(32)), now)
+    assert difficulty_adjuster.is_valid_timestamp(headers, BlockHeader(now + 120000, bytes(32), bytes(32)), now)
+    assert not difficulty_adjuster.is_valid_timestamp(headers, BlockHeader(now + 120001, bytes(32), bytes(32)), now)
+    assert difficulty_adjuster.is_valid_timestamp([], BlockHeader(0, bytes(32), bytes(32)), now)
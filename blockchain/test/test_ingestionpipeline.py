@@ -0,0 +1,91 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+import time
+
+from blockchain import Block, GenesisBlock, PendingTransaction, IngestionPipeline
+
+class ProvData:
+    def __init__(self, sender_name, prov_hash):
+        self.sender_name = sender_name
+        self.prov_hash = prov_hash
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_pipeline_batches_events_into_mempool():
+    pending = PendingTransaction()
+    pipeline = IngestionPipeline(pending, batch_size=8)
+    pipeline.start()
+
+    for i in range(20):
+        assert pipeline.submit(ProvData(f"user-{i}", bytes([i]) * 32))
+    pipeline.stop()
+
+    assert pipeline.ingested + pipeline.rejected == 20
+    assert pending.get_pending_transaction_len() == pipeline.ingested
+
+def test_submit_copies_event_fields():
+    pending = PendingTransaction()
+    pipeline = IngestionPipeline(pending)
+    prov_data = ProvData("alice", b"\x01" * 32)
+
+    pipeline.submit(prov_data)
+    prov_data.sender_name = "bob"
+    pipeline.start()
+    pipeline.stop()
+
+    assert pending.list_pending_transactions()[0].sender == "alice"
+
+def test_full_mempool_applies_backpressure():
+    pending = PendingTransaction(max_pending_transactions=2)
+    pipeline = IngestionPipeline(pending, max_queue_size=2, batch_size=1)
+    pipeline.start()
+
+    accepted = [pipeline.submit(ProvData(f"user-{i}", bytes([i]) * 32), block=False) for i in range(10)]
+
+    assert not all(accepted)
+    assert wait_until(lambda: pending.get_pending_transaction_len() == 2)
+    assert pending.is_full()
+
+    pending.max_pending_transactions = 100
+    pending.clear_pending_transactions(Block(pending.list_pending_transactions(), GenesisBlock.ZERO_HASH_IN))
+    pipeline.stop()
+
+    assert pipeline.ingested == sum(accepted)
+
+def test_stop_with_full_mempool_drops_queued_events():
+    pending = PendingTransaction(max_pending_transactions=2)
+    pipeline = IngestionPipeline(pending, max_queue_size=4, batch_size=1)
+    pipeline.start()
+
+    accepted = [pipeline.submit(ProvData(f"user-{i}", bytes([i]) * 32), block=False) for i in range(6)]
+    assert wait_until(lambda: pending.is_full())
+
+    start = time.monotonic()
+    pipeline.stop()
+
+    assert not pipeline.is_alive()
+    assert time.monotonic() - start < 2.0
+    assert pipeline.ingested + pipeline.dropped == sum(accepted)
+    assert pipeline.get_queue_size() == 0
@@ -0,0 +1,72 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+from blockchain import Block, Blockchain, Transaction
+from blockchain import LRUCache
+
+def test_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.get_stats() == dict(size=2, max_size=2, hits=1, misses=1, evictions=1)
+
+def test_cache_loads_misses():
+    cache = LRUCache(1, loader=lambda key: key * 2 if key > 0 else None)
+
+    assert cache.get(2) == 4
+    assert cache.get(2) == 4
+    assert cache.get(-1) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_blockchain_falls_back_after_eviction():
+    blockchain = Blockchain(block_cache_size=1, transaction_cache_size=1)
+    transactions = list()
+    for nonce in range(3):
+        block = Block(list(), blockchain.get_previous_hash())
+        transaction = Transaction(b"sender", b"receiver", 1.0, nonce, 1.0, 2.0, None)
+        block.add_transaction(transaction)
+        transaction.block_id = block.get_block_hash()
+        blockchain.add_block(block)
+        transactions.append(transaction)
+
+    assert blockchain.get_transaction(transactions[0].tx_id) is transactions[0]
+    proof, block_header = blockchain.get_inclusion_proof(transactions[1].tx_id)
+    assert proof.verify(block_header)
+    assert blockchain.get_cache_stats()["transactions"]["evictions"] >= 2
+
+def test_blockchain_finds_evicted_blocks_by_hash():
+    blockchain = Blockchain(block_cache_size=1)
+    blocks = list()
+    for _ in range(3):
+        block = Block(list(), blockchain.get_previous_hash())
+        blockchain.add_block(block)
+        blocks.append(block)
+
+    assert blockchain.get_block(blocks[0].get_block_hash()) is blocks[0]
+    assert blockchain.get_block(b"\x00" * 32) is None
+    block = Block(list(), blockchain.get_previous_hash())
+    blockchain.add_block(block)
+    assert blockchain.get_block(blocks[1].get_block_hash()) is blocks[1]
+    assert blockchain.get_block(block.get_block_hash()) is block
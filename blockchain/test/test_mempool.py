@@ -0,0 +1,73 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+from blockchain import Transaction
+from blockchain import Mempool
+
+def create_transaction(i):
+    return Transaction(f"testSender{i}".encode(), f"testReceiver{i}".encode(), i * 1.1, i, i, 10.0, None)
+
+def test_peek_returns_priority_order_without_removing():
+    mempool = Mempool()
+    transactions = [create_transaction(i) for i in range(20)]
+    for priority, transaction in zip([7, 3, 9, 1, 5] * 4, transactions):
+        mempool.add(priority, transaction)
+
+    first = mempool.peek(6)
+
+    assert [t.nonce for t in first] == [3, 8, 13, 18, 1, 6]
+    assert mempool.peek(6) == first
+    assert len(mempool) == 20
+
+def test_duplicate_transactions_are_rejected():
+    mempool = Mempool()
+    transaction = create_transaction(1)
+
+    assert mempool.add(1, transaction)
+    assert not mempool.add(1, transaction)
+    assert len(mempool) == 1
+
+def test_removed_transactions_are_skipped():
+    mempool = Mempool()
+    transactions = [create_transaction(i) for i in range(100)]
+    for transaction in transactions:
+        mempool.add(transaction.transaction_fee_base_price, transaction)
+
+    for transaction in transactions[:90:3]:
+        assert mempool.remove(transaction.tx_id)
+    assert not mempool.remove(transactions[0].tx_id)
+
+    expected = [t for i, t in enumerate(transactions) if i >= 90 or i % 3 != 0]
+    assert list(mempool.iter_ordered()) == expected
+    assert len(mempool) == len(expected)
+    assert transactions[0].tx_id not in mempool
+    assert mempool.get(transactions[1].tx_id) is transactions[1]
+
+def test_add_many_keeps_priority_order():
+    mempool = Mempool()
+    transactions = [create_transaction(i) for i in range(30)]
+    mempool.add(-100, transactions[0])
+
+    added = mempool.add_many([(-i, t) for i, t in enumerate(transactions)])
+    added += mempool.add_many([(0.5, transactions[29])])
+
+    assert added == 29
+    assert [t.nonce for t in mempool.peek(3)] == [0, 29, 28]
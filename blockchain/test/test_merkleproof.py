@@ -0,0 +1,53 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+from blockchain import Block, BlockHeader, GenesisBlock, Transaction
+from blockchain import MerkleProof
+
+def create_block(count):
+    transactions = [Transaction(b"sender", b"receiver", 1.0, i, 1, 0.1, f"{i:064x}") for i in range(count)]
+    return Block(transactions, GenesisBlock.ZERO_HASH_IN)
+
+def test_every_transaction_is_proven_against_the_header():
+    for count in (1, 2, 7, 16, 33):
+        block = create_block(count)
+        block_header = BlockHeader.from_bytes(block.block_header.to_bytes())
+
+        for transaction in block.transactions:
+            proof = MerkleProof.from_bytes(block.get_inclusion_proof(transaction.tx_id).to_bytes())
+
+            assert proof.verify(block_header)
+            assert proof.get_tx_id() == transaction.tx_id
+            assert proof.get_transaction().prov_hash == transaction.prov_hash
+            assert len(proof.path) <= count.bit_length()
+
+def test_proof_fails_for_other_block_or_modified_transaction():
+    block = create_block(8)
+    transaction = block.transactions[3]
+    proof = block.get_inclusion_proof(transaction.tx_id)
+
+    assert not proof.verify(create_block(9).block_header)
+
+    forged = Transaction(b"sender", b"receiver", 1.0, 3, 1, 0.1, "ff" * 32)
+    assert not MerkleProof(forged.to_bytes(), proof.path).verify(block.block_header)
+
+def test_unknown_transaction_has_no_proof():
+    assert create_block(4).get_inclusion_proof(b"\x00" * 32) is None
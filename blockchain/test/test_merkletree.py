@@ -0,0 +1,57 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import hashlib
+
+from blockchain import Block, GenesisBlock, Transaction
+from blockchain import MerkleTree
+
+def build_root(nodes):
+    if len(nodes) == 1:
+        return nodes[0]
+    parents = [MerkleTree.hash_node(nodes[i], nodes[i + 1]) if i + 1 < len(nodes) else nodes[i]
+               for i in range(0, len(nodes), 2)]
+    return build_root(parents)
+
+def test_incremental_root_matches_full_rebuild():
+    leaves = [hashlib.sha256(bytes([i])).digest() for i in range(37)]
+    merkle_tree = MerkleTree()
+
+    for count, leaf in enumerate(leaves, start=1):
+        merkle_tree.append(leaf)
+        assert merkle_tree.get_root() == build_root([MerkleTree.hash_leaf(l) for l in leaves[:count]])
+
+    assert len(merkle_tree) == 37
+
+def test_empty_tree_has_fixed_root():
+    assert MerkleTree().get_root() == MerkleTree.EMPTY_ROOT
+    assert Block(list(), GenesisBlock.ZERO_HASH_IN).block_header.transaction_list_hash == MerkleTree.EMPTY_ROOT
+
+def test_add_transaction_updates_block_header():
+    transactions = [Transaction(b"sender", b"receiver", 1.0, i, 1, 0.1, None) for i in range(5)]
+    block = Block(transactions[:3], GenesisBlock.ZERO_HASH_IN)
+
+    for transaction in transactions[3:]:
+        block.add_transaction(transaction)
+
+    expected = Block(list(transactions), GenesisBlock.ZERO_HASH_IN)
+    assert block.block_header.transaction_list_hash == expected.block_header.transaction_list_hash
+    assert Block.from_bytes(block.to_bytes()).transaction_hash() == block.transaction_hash()
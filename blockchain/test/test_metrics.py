@@ -0,0 +1,91 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+import urllib.request
+
+from blockchain import Block, Blockchain, Transaction, PendingTransaction, DependencyManager, Miner
+from blockchain import MetricsRegistry, MetricsServer
+
+def test_registry_shares_metrics_by_name():
+    registry = MetricsRegistry()
+    counter = registry.counter("events_total", "Events.")
+    counter.inc(2)
+    registry.counter("events_total", "Events.").inc()
+    histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value)
+
+    assert registry.get_values()["events_total"] == 3
+    assert histogram.get_value()["buckets"] == {0.1: 1, 1.0: 2, float("inf"): 3}
+
+def test_prometheus_text_format():
+    registry = MetricsRegistry()
+    registry.gauge("depth", "Depth.", function=lambda: 7)
+    registry.histogram("latency_seconds", "Latency.", buckets=(0.5,)).observe(0.25)
+
+    text = registry.to_prometheus()
+
+    assert "# TYPE depth gauge\ndepth 7\n" in text
+    assert 'latency_seconds_bucket{le="0.5"} 1' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 1' in text
+    assert "latency_seconds_count 1" in text
+
+def test_server_exports_metrics_on_localhost():
+    registry = MetricsRegistry()
+    registry.counter("scraped_total", "Scrapes.").inc()
+    server = MetricsServer(registry, port=0)
+    server.start()
+    try:
+        host, port = server.server_address
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics") as response:
+            text = response.read().decode("utf-8")
+    finally:
+        server.stop()
+
+    assert "scraped_total 1" in text
+
+def test_node_components_are_instrumented():
+    registry = MetricsRegistry.get_default()
+    pending = PendingTransaction()
+    pending.add_pending_transactions_bulk(
+        Transaction(b"sender", b"receiver", 1.0, i, 1.0, 0.1, None) for i in range(4))
+    blockchain = Blockchain()
+    blockchain.difficulty = 2 ** 255
+    #* the interval to the genesis block is not measured
+    blockchain.add_block(Block(list(), blockchain.get_previous_hash()))
+    DependencyManager.inject_pending_transaction(pending)
+    DependencyManager.inject_blockchain(blockchain)
+    added = registry.get("blockchain_add_block_seconds").get_value()["count"] if registry.get("blockchain_add_block_seconds") else 0
+
+    try:
+        miner = Miner()
+        miner.block = miner.get_new_block_for_mining()
+        assert miner.mine_block()
+        miner.block_mined(miner.block)
+        values = registry.get_values()
+    finally:
+        DependencyManager.inject_pending_transaction(None)
+        DependencyManager.inject_blockchain(None)
+
+    assert values["mempool_depth"] == 0
+    assert values["blockchain_add_block_seconds"]["count"] == added + 1
+    assert values["miner_attempts_per_block"]["count"] >= 1
+    assert values["miner_hashes_total"] >= 1
+    assert values["miner_block_interval_seconds"]["count"] >= 1
@@ -0,0 +1,151 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+import time
+import threading
+
+from blockchain import Block, Blockchain, BlockHeader, Transaction, PendingTransaction, DependencyManager, Miner, MiningKernel
+from blockchain import MiningPolicy
+
+EASY_DIFFICULTY = 2 ** 255
+
+def create_transaction(nonce, fee=1.0):
+    return Transaction(b"sender", b"receiver", 1.0, nonce, fee, 1.0, None)
+
+def setup_dependencies():
+    pending = PendingTransaction()
+    blockchain = Blockchain()
+    blockchain.difficulty = EASY_DIFFICULTY
+    DependencyManager.inject_pending_transaction(pending)
+    DependencyManager.inject_blockchain(blockchain)
+    return pending, blockchain
+
+def teardown_dependencies():
+    DependencyManager.inject_pending_transaction(None)
+    DependencyManager.inject_blockchain(None)
+
+def test_exhausted_nonce_rolls_timestamp():
+    block_header = BlockHeader(1000, bytes(32), bytes(32))
+    block_header.nonce = BlockHeader.MAX_NONCE
+
+    block_header.increment_nonce()
+
+    assert block_header.timestamp == 1001
+    assert block_header.nonce == 0
+
+def test_restart_mining_refreshes_template():
+    pending, _ = setup_dependencies()
+    try:
+        pending.add_pending_transactions(create_transaction(1))
+        miner = Miner()
+        miner.block = miner.get_new_block_for_mining()
+        assert not miner.is_template_stale()
+
+        pending.add_pending_transactions(create_transaction(2, fee=5.0))
+        miner.restart_mining()
+        assert miner.is_template_stale()
+
+        miner.refresh_block_template(4096)
+    finally:
+        teardown_dependencies()
+
+    assert not miner.refresh_requested
+    assert miner.block.block_header.nonce == 4096
+    assert [transaction.nonce for transaction in miner.block.transactions] == [2, 1]
+
+def test_arriving_transactions_make_template_stale():
+    pending, _ = setup_dependencies()
+    try:
+        miner = Miner(template_refresh_transactions=2)
+        miner.block = miner.get_new_block_for_mining()
+        pending.add_pending_transactions(create_transaction(1))
+        #* younger templates are kept
+        assert not miner.is_template_stale()
+
+        miner.template_built -= Miner.MIN_TEMPLATE_AGE
+        assert miner.is_template_stale()
+
+        pending.max_block_transactions = 0
+        assert not miner.is_template_stale()
+        pending.add_pending_transactions(create_transaction(2))
+        assert miner.is_template_stale()
+    finally:
+        teardown_dependencies()
+
+def test_mining_continues_after_nonce_space_is_exhausted():
+    _, blockchain = setup_dependencies()
+    blockchain.difficulty = 2 ** 244
+    try:
+        miner = Miner()
+        #* find a template for which none of the last nonces fulfills the target
+        while True:
+            miner.block = miner.get_new_block_for_mining()
+            block_header = miner.block.block_header
+            block_header.timestamp = int(time.time() * 1000) - 10 ** 6
+            kernel = MiningKernel(block_header, block_header.get_target())
+            if kernel.search(BlockHeader.MAX_NONCE - 10, BlockHeader.MAX_NONCE + 1) is None:
+                break
+        timestamp = block_header.timestamp
+        block_header.nonce = BlockHeader.MAX_NONCE - 10
+
+        assert miner.mine_block()
+    finally:
+        teardown_dependencies()
+
+    assert block_header.timestamp > timestamp
+    assert block_header.fulfills_target()
+
+def test_idle_miner_sleeps_until_transactions_arrive():
+    pending, _ = setup_dependencies()
+    try:
+        miner = Miner(policy=MiningPolicy(max_block_interval=0.05))
+        timer = threading.Timer(0.2, pending.add_pending_transactions, (create_transaction(1),))
+        timer.start()
+        start = time.monotonic()
+
+        #* the interval expires first, but without heartbeat blocks only a transaction starts a block
+        assert miner.wait_for_work()
+        assert time.monotonic() - start >= 0.15
+        assert pending.get_pending_transaction_len() == 1
+        timer.join()
+    finally:
+        teardown_dependencies()
+
+def test_heartbeat_block_after_max_block_interval():
+    pending, _ = setup_dependencies()
+    try:
+        miner = Miner(policy=MiningPolicy(max_block_interval=0.05, heartbeat_blocks=True))
+
+        assert miner.wait_for_work()
+        assert pending.get_pending_transaction_len() == 0
+    finally:
+        teardown_dependencies()
+
+def test_stop_mining_wakes_idle_miner():
+    setup_dependencies()
+    try:
+        miner = Miner(policy=MiningPolicy(max_block_interval=60.0))
+        timer = threading.Timer(0.05, miner.stop_mining)
+        timer.start()
+
+        assert not miner.wait_for_work()
+        timer.join()
+    finally:
+        teardown_dependencies()
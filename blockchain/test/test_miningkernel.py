@@ -0,0 +1,49 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+from blockchain import Block, GenesisBlock, Blockchain
+from blockchain import MiningKernel
+
+def test_kernel_digest_matches_header_hash():
+    block = Block(list(), GenesisBlock.ZERO_HASH_IN)
+    kernel = MiningKernel(block.block_header, 2 ** 255)
+
+    for nonce in (1, 2, 12345):
+        block.block_header.nonce = nonce
+        assert kernel.digest(nonce) == block.get_block_hash()
+
+def test_kernel_agrees_with_blockchain_difficulty_check():
+    blockchain = Blockchain()
+    block = Block(list(), GenesisBlock.ZERO_HASH_IN)
+    kernel = MiningKernel(block.block_header, blockchain.difficulty)
+
+    for nonce in range(1, 200):
+        assert kernel.fulfills_difficulty(nonce) == blockchain.fulfills_difficulty(kernel.digest(nonce))
+
+def test_kernel_search_returns_first_fulfilling_nonce():
+    block = Block(list(), GenesisBlock.ZERO_HASH_IN)
+    kernel = MiningKernel(block.block_header, 2 ** 252)
+
+    nonce = kernel.search(1, 100000)
+
+    assert nonce is not None
+    assert all(not kernel.fulfills_difficulty(n) for n in range(1, nonce))
+    assert kernel.fulfills_difficulty(nonce)
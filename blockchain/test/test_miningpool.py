@@ -0,0 +1,81 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import logging
+
+from blockchain import Block, GenesisBlock
+from blockchain import MiningPool
+
+EASY_DIFFICULTY = 2 ** 250
+
+def test_pool_finds_nonce_fulfilling_difficulty():
+    block = Block(list(), GenesisBlock.ZERO_HASH_IN)
+    pool = MiningPool(2)
+    try:
+        nonce = pool.search(block.block_header, EASY_DIFFICULTY)
+    finally:
+        pool.close()
+
+    assert nonce is not None
+    block.block_header.nonce = nonce
+    assert int.from_bytes(block.get_block_hash(), byteorder='big') <= EASY_DIFFICULTY
+
+def test_pool_returns_none_when_nonce_space_is_exhausted():
+    block = Block(list(), GenesisBlock.ZERO_HASH_IN)
+    block.block_header.nonce = block.block_header.MAX_NONCE - 10
+    pool = MiningPool(2)
+    try:
+        nonce = pool.search(block.block_header, 0)
+    finally:
+        pool.close()
+
+    assert nonce is None
+
+def test_pool_search_stops_at_given_nonce():
+    block = Block(list(), GenesisBlock.ZERO_HASH_IN)
+    pool = MiningPool(2)
+    try:
+        nonce = pool.search(block.block_header, 2 ** 256, stop=block.block_header.nonce + 1)
+        assert nonce == block.block_header.nonce
+        assert pool.search(block.block_header, 0, stop=block.block_header.nonce + 100) is None
+    finally:
+        pool.close()
+
+def test_pool_cancel_before_search_is_not_lost():
+    block = Block(list(), GenesisBlock.ZERO_HASH_IN)
+    pool = MiningPool(2)
+    try:
+        pool.cancel()
+        assert pool.search(block.block_header, 2 ** 256) is None
+        assert pool.search(block.block_header, 2 ** 256, stop=block.block_header.nonce + 1) == block.block_header.nonce
+    finally:
+        pool.close()
+
+def test_pool_logs_failing_workers(caplog):
+    block = Block(list(), GenesisBlock.ZERO_HASH_IN)
+    pool = MiningPool(2)
+    try:
+        with caplog.at_level(logging.ERROR):
+            assert pool.search(block.block_header, "not a difficulty") is None
+    finally:
+        pool.close()
+
+    assert "Nonce search worker failed" in caplog.text
@@ -0,0 +1,249 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+import asyncio
+import time
+
+from blockchain import Block, Blockchain, Transaction, PendingTransaction, Message, Peer, NetworkNode
+from blockchain import DifficultyAdjuster, MetricsRegistry, Persistence, PersistenceWriter
+from blockchain.network.message import INV, INV_TX, INV_BLOCK
+
+EASY_DIFFICULTY = 2 ** 255
+
+def create_transaction(nonce):
+    return Transaction(b"sender", b"receiver", 1.0, nonce, 1.0, 1.0, None)
+
+def create_node(peers=(), metrics=None, difficulty_adjuster=None):
+    blockchain = Blockchain(difficulty_adjuster=difficulty_adjuster)
+    blockchain.difficulty = EASY_DIFFICULTY
+    return NetworkNode(blockchain, PendingTransaction(), port=0, peers=peers, reconnect_interval=0.05, metrics=metrics)
+
+def mine_block(node):
+    blockchain = node.blockchain
+    block = Block(node.pending_transactions.get_transactions_for_the_next_block(), blockchain.get_previous_hash(),
+                  blockchain.get_next_bits())
+    while not block.block_header.fulfills_target():
+        block.increment_nonce()
+    blockchain.add_block(block)
+    node.pending_transactions.clear_pending_transactions(block)
+    node.notify_new_block(block)
+    return block
+
+async def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("The condition was not met in time!")
+        await asyncio.sleep(0.01)
+
+async def start_line(count):
+    #* every node connects to the previous one: 0 <- 1 <- 2 ...
+    nodes = list()
+    for _ in range(count):
+        node = create_node([("127.0.0.1", nodes[-1].port)] if nodes else [])
+        await node.start()
+        nodes.append(node)
+    await wait_for(lambda: all(len(node.get_peer_addresses()) == (1 if index in (0, count - 1) else 2)
+                               for index, node in enumerate(nodes)))
+    return nodes
+
+def test_message_round_trip():
+    items = [(INV_TX, b"\x01" * 32), (INV_BLOCK, b"\x02" * 32)]
+    transaction = create_transaction(1)
+
+    async def read(data):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await Message.read_from(reader)
+
+    message = asyncio.run(read(Message.inventory(INV, items).to_bytes()))
+    assert message.message_type == INV
+    assert message.get_inventory() == items
+
+    message = asyncio.run(read(Message.transaction(transaction).to_bytes()))
+    assert message.get_transaction() == transaction
+
+    message = asyncio.run(read(Message.hello(7, 3, b"\x03" * 32, 5000).to_bytes()))
+    assert message.get_hello() == (7, 3, b"\x03" * 32, 5000)
+
+def test_send_queue_is_bounded():
+    async def fill():
+        peer = Peer(None, None, True, send_queue_size=2)
+        results = [peer.send(Message(INV)) for _ in range(3)]
+        return peer, results
+
+    peer, results = asyncio.run(fill())
+
+    assert results == [True, True, False]
+    assert peer.dropped == 1
+
+def test_transactions_and_blocks_are_gossiped():
+    async def scenario():
+        nodes = await start_line(3)
+        try:
+            transaction = create_transaction(1)
+            assert nodes[0].submit_transaction(transaction)
+            await wait_for(lambda: nodes[2].pending_transactions.get_pending_transaction(transaction.tx_id) is not None)
+
+            block = mine_block(nodes[0])
+            await wait_for(lambda: len(nodes[2].blockchain) == 2)
+
+            assert nodes[2].blockchain.get_latest_block().get_block_hash() == block.get_block_hash()
+            await wait_for(lambda: nodes[2].pending_transactions.get_pending_transaction_len() == 0)
+        finally:
+            for node in nodes:
+                await node.stop()
+
+    asyncio.run(scenario())
+
+def test_block_of_peer_is_persisted(tmp_path):
+    async def scenario():
+        nodes = await start_line(2)
+        persistence = Persistence(str(tmp_path / "chains"))
+        writer = PersistenceWriter(nodes[1].blockchain, persistence, durability_interval=0)
+        writer.start()
+        try:
+            block = mine_block(nodes[0])
+            store = persistence.get_block_store(nodes[1].blockchain.chain.network_id)
+            await wait_for(lambda: len(store) == 2)
+
+            assert Block.from_bytes(store.read(1)).get_block_hash() == block.get_block_hash()
+        finally:
+            writer.stop()
+            for node in nodes:
+                await node.stop()
+
+    asyncio.run(scenario())
+
+def test_nodes_report_to_their_own_registry():
+    async def scenario():
+        registries = [MetricsRegistry(), MetricsRegistry()]
+        first = create_node(metrics=registries[0])
+        await first.start()
+        second = create_node([("127.0.0.1", first.port)], metrics=registries[1])
+        await second.start()
+        try:
+            await wait_for(lambda: all(registry.get_values()["network_peers"] == 1 for registry in registries))
+        finally:
+            await first.stop()
+            await second.stop()
+
+    asyncio.run(scenario())
+
+def test_new_node_catches_up():
+    async def scenario():
+        first = create_node()
+        await first.start()
+        late = None
+        try:
+            for nonce in range(3):
+                first.pending_transactions.add_pending_transactions(create_transaction(nonce))
+                mine_block(first)
+
+            late = create_node([("127.0.0.1", first.port)])
+            await late.start()
+            await wait_for(lambda: len(late.blockchain) == 4)
+
+            assert [block.get_block_hash() for block in late.blockchain] == [block.get_block_hash() for block in first.blockchain]
+        finally:
+            await first.stop()
+            if late is not None:
+                await late.stop()
+
+    asyncio.run(scenario())
+
+def test_invalid_block_is_rejected():
+    async def scenario():
+        nodes = await start_line(2)
+        try:
+            block = Block(list(), nodes[0].blockchain.get_previous_hash(), nodes[0].blockchain.get_next_bits())
+            #* a target the receiving node does not expect
+            block.block_header.bits = block.block_header.bits - 1
+            nodes[0].blockchain.add_block(block)
+            nodes[0].notify_new_block(block)
+            await asyncio.sleep(0.3)
+
+            assert len(nodes[1].blockchain) == 1
+        finally:
+            for node in nodes:
+                await node.stop()
+
+    asyncio.run(scenario())
+
+def test_block_from_the_future_is_rejected():
+    async def scenario():
+        difficulty_adjuster = DifficultyAdjuster(initial_target=EASY_DIFFICULTY)
+        first = create_node(difficulty_adjuster=difficulty_adjuster)
+        await first.start()
+        second = create_node([("127.0.0.1", first.port)], difficulty_adjuster=difficulty_adjuster)
+        await second.start()
+        try:
+            await wait_for(lambda: len(second.get_peer_addresses()) == 1)
+            block = Block(list(), first.blockchain.get_previous_hash(), first.blockchain.get_next_bits())
+            block.block_header.timestamp = int(time.time() * 1000) + 10 ** 6
+            while not block.block_header.fulfills_target():
+                block.increment_nonce()
+            first.blockchain.add_block(block)
+            first.notify_new_block(block)
+            await asyncio.sleep(0.3)
+
+            assert len(second.blockchain) == 1
+        finally:
+            await first.stop()
+            await second.stop()
+
+    asyncio.run(scenario())
+
+def test_competing_block_is_not_appended():
+    node = create_node()
+    blockchain = node.blockchain
+    parent = blockchain.get_previous_hash()
+    first = Block(list(), parent, blockchain.get_next_bits())
+    second = Block([create_transaction(1)], parent, blockchain.get_next_bits())
+
+    assert blockchain.add_block(first)
+    assert not blockchain.add_block(second)
+    assert len(blockchain) == 2
+    assert blockchain.get_previous_hash() == first.get_block_hash()
+
+def test_hosts_file_is_read(tmp_path):
+    hosts = tmp_path / "hosts.txt"
+    hosts.write_text("# comment\n\nlocalhost:5000\nlocalhost:5001\n")
+
+    assert NetworkNode.read_hosts(str(hosts)) == [("localhost", 5000), ("localhost", 5001)]
+
+def test_mutual_connections_are_pooled():
+    async def scenario():
+        first = create_node()
+        await first.start()
+        second = create_node([("127.0.0.1", first.port)])
+        await second.start()
+        try:
+            first.connect("127.0.0.1", second.port)
+            await asyncio.sleep(0.5)
+
+            assert len(first.get_peer_addresses()) == 1
+            assert len(second.get_peer_addresses()) == 1
+        finally:
+            await first.stop()
+            await second.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,122 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import threading
+import time
+
+from blockchain import Transaction
+from blockchain import PendingTransaction
+
+def create_transaction(i, fee, fee_limit=10.0):
+    return Transaction(f"testSender{i}".encode(), f"testReceiver{i}".encode(), i * 1.1, i, fee, fee_limit, None)
+
+def test_block_is_filled_up_to_transaction_count():
+    pending_transactions = PendingTransaction(max_block_transactions=10)
+    for i in range(25):
+        pending_transactions.add_pending_transactions(create_transaction(i, i))
+
+    next_transactions = pending_transactions.get_transactions_for_the_next_block()
+
+    assert [transaction.nonce for transaction in next_transactions] == list(range(24, 14, -1))
+    assert pending_transactions.get_pending_transaction_len() == 25
+
+def test_block_respects_size_and_fee_limit():
+    transactions = [create_transaction(i, 100 - i, fee_limit=i % 3) for i in range(30)]
+    size = transactions[0].get_size()
+    pending_transactions = PendingTransaction(max_block_size=size * 20, max_block_fee_limit=8.0)
+    for transaction in transactions:
+        pending_transactions.add_pending_transactions(transaction)
+
+    next_transactions = pending_transactions.get_transactions_for_the_next_block()
+
+    assert sum(t.get_size() for t in next_transactions) <= size * 20
+    assert sum(t.transaction_fee_limit for t in next_transactions) <= 8.0
+    assert next_transactions[0] is transactions[0]
+    assert len(next_transactions) < len(transactions)
+
+def test_transactions_beyond_block_limits_are_rejected():
+    size = create_transaction(0, 1).get_size()
+    pending_transactions = PendingTransaction(max_block_size=size, max_block_fee_limit=5.0)
+
+    assert not pending_transactions.add_pending_transactions(create_transaction(1, 1, fee_limit=6.0))
+    assert not pending_transactions.add_pending_transactions(create_transaction(10, 1, fee_limit=1.0))
+    assert pending_transactions.add_pending_transactions(create_transaction(2, 1, fee_limit=5.0))
+
+    added = pending_transactions.add_pending_transactions_bulk(
+        [create_transaction(3, 1, fee_limit=6.0), create_transaction(11, 1, fee_limit=1.0), create_transaction(4, 1, fee_limit=1.0)])
+    assert added == 1
+    assert pending_transactions.get_pending_transaction_len() == 2
+
+def test_included_transactions_are_cleared():
+    pending_transactions = PendingTransaction()
+    for i in range(5):
+        pending_transactions.add_pending_transactions(create_transaction(i, i))
+
+    pending_transactions.clear_transactions_from_block(pending_transactions.get_transactions_for_the_next_block()[:3])
+
+    assert pending_transactions.get_pending_transaction_len() == 2
+
+def test_bulk_submission_deduplicates_and_validates():
+    pending_transactions = PendingTransaction()
+    pending_transactions.add_pending_transactions(create_transaction(0, 0))
+    transactions = [create_transaction(i, i) for i in range(10)]
+
+    added = pending_transactions.add_pending_transactions_bulk(t for t in transactions + transactions[:3] + [None])
+
+    assert added == 9
+    assert pending_transactions.get_pending_transaction_len() == 10
+    assert pending_transactions.get_transactions_for_the_next_block()[0] is transactions[9]
+
+def test_bulk_submission_respects_mempool_size():
+    pending_transactions = PendingTransaction(max_pending_transactions=5)
+    pending_transactions.add_pending_transactions(create_transaction(0, 0))
+
+    added = pending_transactions.add_pending_transactions_bulk(create_transaction(i, i) for i in range(10))
+
+    assert added == 4
+    assert pending_transactions.is_full()
+
+def test_waiting_for_transactions_is_woken_by_arrival():
+    pending_transactions = PendingTransaction()
+    timer = threading.Timer(0.05, pending_transactions.add_pending_transactions, (create_transaction(1, 1.0),))
+    timer.start()
+
+    assert pending_transactions.wait_for_transactions(1, timeout=5.0)
+    timer.join()
+
+def test_waiting_for_transactions_times_out_or_is_woken_up():
+    pending_transactions = PendingTransaction()
+
+    assert not pending_transactions.wait_for_transactions(1, timeout=0.01)
+
+    timer = threading.Timer(0.05, pending_transactions.wake_up)
+    timer.start()
+    assert not pending_transactions.wait_for_transactions(1, timeout=5.0)
+    timer.join()
+
+def test_wake_up_before_the_wait_is_not_lost():
+    pending_transactions = PendingTransaction()
+    wake_ups = pending_transactions.get_wake_ups()
+    pending_transactions.wake_up()
+
+    start = time.monotonic()
+    assert not pending_transactions.wait_for_transactions(1, None, wake_ups)
+    assert time.monotonic() - start < 1.0
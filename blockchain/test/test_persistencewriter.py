@@ -0,0 +1,84 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+
+import time
+
+from blockchain import Block, Blockchain, MetricsRegistry
+from blockchain import Persistence, PersistenceWriter
+
+def add_block(blockchain):
+    block = Block(list(), blockchain.get_previous_hash())
+    blockchain.add_block(block)
+    return block
+
+def test_writer_persists_only_new_blocks(tmp_path):
+    blockchain = Blockchain()
+    persistence = Persistence(str(tmp_path / "chains"))
+    writer = PersistenceWriter(blockchain, persistence, durability_interval=0)
+    writer.start()
+
+    for _ in range(3):
+        writer.notify_new_block(add_block(blockchain))
+    writer.stop()
+
+    assert writer.persisted_height == 3
+    assert writer.synced_height == 3
+    assert len(persistence.get_block_store(blockchain.chain.network_id)) == 4
+
+def test_writer_resumes_at_last_persisted_height(tmp_path):
+    blockchain = Blockchain()
+    persistence = Persistence(str(tmp_path / "chains"))
+    persistence.write_chain(blockchain.chain)
+    add_block(blockchain)
+
+    writer = PersistenceWriter(blockchain, persistence)
+
+    assert writer.persisted_height == 0
+    assert writer.write_new_blocks() == 1
+    assert writer.persisted_height == 1
+
+def test_idle_writer_does_not_spin(tmp_path):
+    blockchain = Blockchain()
+    persistence = Persistence(str(tmp_path / "chains"))
+    writer = PersistenceWriter(blockchain, persistence, durability_interval=0)
+    writer.start()
+
+    try:
+        start = time.process_time()
+        time.sleep(0.3)
+        assert time.process_time() - start < 0.1
+
+        writer.notify_new_block(add_block(blockchain))
+    finally:
+        writer.stop()
+
+    assert writer.synced_height == 1
+
+def test_writer_reports_to_given_registry(tmp_path):
+    blockchain = Blockchain()
+    persistence = Persistence(str(tmp_path / "chains"))
+    metrics = MetricsRegistry()
+    writer = PersistenceWriter(blockchain, persistence, metrics=metrics)
+    add_block(blockchain)
+
+    assert metrics.get_values()["persistence_lag_blocks"] == 2
+    writer.write_new_blocks()
+    assert metrics.get_values()["persistence_lag_blocks"] == 0
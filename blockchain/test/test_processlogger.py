@@ -0,0 +1,68 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+import logging
+import logging.handlers
+
+from blockchain import ProcessLogger
+
+class CountingMessage:
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "message"
+
+def test_handler_is_attached_once():
+    loggers = [ProcessLogger("Repeated") for _ in range(5)]
+
+    assert len(logging.getLogger(ProcessLogger.PARENT_NAME).handlers) == 1
+    assert all(not logger.logger.handlers for logger in loggers)
+
+def test_arguments_are_formatted_lazily():
+    logger = ProcessLogger("Lazy")
+    message = CountingMessage()
+    ProcessLogger.set_level(logging.INFO)
+    try:
+        logger.log_debug("Debug %s", message)
+        assert message.calls == 0
+    finally:
+        ProcessLogger.set_level(logging.DEBUG)
+
+def test_sampled_events(caplog):
+    logger = ProcessLogger("Sampled", sample_every=3)
+
+    with caplog.at_level(logging.INFO):
+        for i in range(7):
+            logger.log_sampled("Event %d", i)
+
+    assert [record.getMessage() for record in caplog.records if record.name.endswith("Sampled")] == ["Event 0", "Event 3", "Event 6"]
+
+def test_async_logging_uses_queue_handler():
+    parent = logging.getLogger(ProcessLogger.PARENT_NAME)
+    ProcessLogger.enable_async_logging()
+    try:
+        assert [type(handler) for handler in parent.handlers] == [logging.handlers.QueueHandler]
+        ProcessLogger("Async").log_info("Written by the listener thread")
+    finally:
+        ProcessLogger.disable_async_logging()
+
+    assert [type(handler) for handler in parent.handlers] == [logging.StreamHandler]
@@ -0,0 +1,109 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+from blockchain import Block, Blockchain, Transaction, Persistence, PersistenceWriter
+from blockchain import PendingTransaction, TransactionIndex, SnapshotManager
+
+def add_block(blockchain, nonce):
+    block = Block(list(), blockchain.get_previous_hash())
+    transaction = Transaction(b"sender", b"receiver", 1.0, nonce, 1.0, 2.0, f"prov-{nonce}")
+    block.add_transaction(transaction)
+    transaction.block_id = block.get_block_hash()
+    blockchain.add_block(block)
+    return transaction
+
+def test_restore_replays_only_blocks_behind_snapshot(tmp_path):
+    blockchain = Blockchain()
+    pending = PendingTransaction()
+    pending.add_pending_transactions(Transaction(b"sender", b"receiver", 1.0, 100, 1.0, 2.0, None))
+    persistence = Persistence(str(tmp_path / "chains"))
+    snapshots = SnapshotManager(str(tmp_path / "snapshots"), interval=3)
+    writer = PersistenceWriter(blockchain, persistence, snapshot_manager=snapshots, pending_transactions=pending)
+
+    for nonce in range(3):
+        add_block(blockchain, nonce)
+    writer.write_snapshot()
+    mined = add_block(blockchain, 3)
+    pending.add_pending_transactions(mined)
+    writer.write_new_blocks()
+    persistence.close()
+
+    persistence = Persistence(str(tmp_path / "chains"))
+    restored_pending = PendingTransaction()
+    restored = snapshots.restore(persistence, blockchain.chain.network_id, restored_pending)
+
+    assert snapshots.get_latest_height() == 3
+    assert len(restored) == 5
+    assert restored.get_transaction_count() == 4
+    assert restored.get_latest_block().get_block_hash() == blockchain.get_latest_block().get_block_hash()
+    assert restored.get_transaction(mined.tx_id).tx_id == mined.tx_id
+    assert restored_pending.get_pending_transaction_len() == 1
+
+def test_blocks_behind_restored_chain_are_released_once_persisted(tmp_path):
+    blockchain = Blockchain()
+    persistence = Persistence(str(tmp_path / "chains"))
+    add_block(blockchain, 0)
+    persistence.write_chain(blockchain.chain)
+    persistence.close()
+
+    persistence = Persistence(str(tmp_path / "chains"))
+    restored = SnapshotManager(str(tmp_path / "snapshots")).restore(persistence, blockchain.chain.network_id)
+    writer = PersistenceWriter(restored, persistence)
+    add_block(restored, 1)
+    block = restored.get_latest_block()
+    assert restored[2] is block
+
+    writer.write_new_blocks()
+    assert restored[2] is not block
+    assert restored[2].get_block_hash() == block.get_block_hash()
+    add_block(restored, 2)
+    assert len(restored) == 4
+
+def test_restore_with_index_warms_caches(tmp_path):
+    blockchain = Blockchain()
+    persistence = Persistence(str(tmp_path / "chains"))
+    snapshots = SnapshotManager(str(tmp_path / "snapshots"))
+    writer = PersistenceWriter(blockchain, persistence, snapshot_manager=snapshots)
+    transactions = [add_block(blockchain, nonce) for nonce in range(4)]
+    writer.write_snapshot()
+    persistence.close()
+
+    persistence = Persistence(str(tmp_path / "chains"))
+    index = TransactionIndex(str(tmp_path / "index.db"))
+    restored = snapshots.restore(persistence, blockchain.chain.network_id, transaction_index=index)
+
+    assert index.get_indexed_height() == 4
+    assert restored.get_cache_stats()["transactions"]["size"] == 4
+    proof, block_header = restored.get_inclusion_proof(transactions[1].tx_id)
+    assert proof.verify(block_header)
+
+def test_snapshot_of_another_chain_is_ignored(tmp_path):
+    blockchain = Blockchain()
+    persistence = Persistence(str(tmp_path / "chains"))
+    snapshots = SnapshotManager(str(tmp_path / "snapshots"))
+    add_block(blockchain, 0)
+    snapshots.write_snapshot(snapshots.take_snapshot(blockchain))
+
+    other = Blockchain()
+    add_block(other, 1)
+    persistence.write_chain(other.chain)
+
+    assert snapshots.load_latest(persistence, other.chain.network_id) is None
+    assert snapshots.restore(persistence, other.chain.network_id).get_transaction_count() == 1
@@ -0,0 +1,90 @@
+# ********************************************************************************
+# Copyright (c) 2024 Contributors to the Eclipse Foundation
+# Copyright (c) 2024 German Aerospace Center (DLR e.V.)
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License, Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+# ********************************************************************************
+
+from blockchain import Block, Blockchain, Transaction
+from blockchain import TransactionIndex
+
+def add_block(blockchain, prov_hashes):
+    block = Block(list(), blockchain.get_previous_hash())
+    for nonce, prov_hash in enumerate(prov_hashes):
+        block.add_transaction(Transaction(b"sender", b"receiver", 1.0, nonce, 1.0, 2.0, prov_hash))
+    blockchain.add_block(block)
+    return block
+
+def test_index_serves_lookups(tmp_path):
+    blockchain = Blockchain(TransactionIndex(str(tmp_path / "index.db")))
+    add_block(blockchain, ["a", "b"])
+    block = add_block(blockchain, ["c", "a"])
+    transaction = block.transactions[1]
+
+    assert blockchain.transaction_index.get_transaction_location(transaction.tx_id) == (2, 1)
+    assert blockchain.transaction_index.get_block_height(block.get_block_hash()) == 2
+    assert blockchain.get_transaction(transaction.tx_id) is transaction
+    assert len(blockchain.get_transactions_by_prov_hash("a")) == 2
+    assert blockchain.get_transactions_by_prov_hash("unknown") == []
+
+    proof, block_header = blockchain.get_inclusion_proof(transaction.tx_id)
+    assert proof.verify(block_header)
+
+def test_index_catches_up_on_startup(tmp_path):
+    path = str(tmp_path / "index.db")
+    blockchain = Blockchain(TransactionIndex(path))
+    add_block(blockchain, ["a"])
+    blockchain.transaction_index.close()
+    blockchain.transaction_index = None
+
+    add_block(blockchain, ["b"])
+    index = TransactionIndex(path)
+    assert index.get_indexed_height() == 1
+    assert index.catch_up(blockchain) == 1
+    assert index.get_indexed_height() == 2
+    assert len(index.get_tx_ids_by_prov_hash("b")) == 1
+
+def test_reopened_index_is_kept_until_the_chain_is_attached(tmp_path):
+    path = str(tmp_path / "index.db")
+    blockchain = Blockchain(TransactionIndex(path))
+    for prov_hash in ["a", "b", "c"]:
+        add_block(blockchain, [prov_hash])
+    blockchain.transaction_index.close()
+
+    restored = Blockchain(TransactionIndex(path))
+    assert restored.transaction_index.get_indexed_height() == 3
+
+    index = restored.transaction_index
+    restored.chain = blockchain.chain
+    assert index.get_indexed_height() == 3
+    assert len(restored.get_transactions_by_prov_hash("b")) == 1
+
+    reopened = Blockchain(TransactionIndex(path), chain=blockchain.chain)
+    assert reopened.transaction_index.get_indexed_height() == 3
+    assert reopened.transaction_count == 3
+
+def test_index_of_another_chain_is_rebuilt(tmp_path):
+    path = str(tmp_path / "index.db")
+    blockchain = Blockchain(TransactionIndex(path))
+    add_block(blockchain, ["a"])
+    blockchain.transaction_index.close()
+
+    other = Blockchain()
+    add_block(other, ["b"])
+    index = TransactionIndex(path)
+
+    assert index.catch_up(other) == 2
+    assert index.get_tx_ids_by_prov_hash("a") == []